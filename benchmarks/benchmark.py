@@ -3,24 +3,50 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import gc
+import getopt
+import json
+import math
+import platform
+import random
+import string
 import time
+import tracemalloc
 from bstree import bstree
 from hashset import hashset
 import config
+import set_factory
+import stats_collectors
 
-def benchmark_insert(data_structure, words, name):
-    start = time.time()
-    for word in words:
-        data_structure.insert(word)
-    end = time.time()
-    return end - start
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+DEFAULT_RESULTS_FILE = os.path.join(os.path.dirname(__file__), 'results.json')
 
-def benchmark_find(data_structure, words, name):
-    start = time.time()
-    for word in words:
-        data_structure.find(word)
-    end = time.time()
-    return end - start
+# Datasets in the order they are run; synthetic runs once per size
+DATASETS = ['simple', 'collision_tests', 'henry', 'synthetic']
+SYNTHETIC_SIZES = [10 ** 4, 10 ** 5, 10 ** 6]
+SET_TYPES = [
+    ("BSTree", config.SetType.BSTREE),
+    ("AVLTree", config.SetType.AVL_TREE),
+    ("HashSet", config.SetType.HASH),
+    ("CompactHashSet", config.SetType.COMPACT_HASH),
+    ("ConcurrentHashSet", config.SetType.CONCURRENT_HASH),
+]
+OPERATIONS = ['insert', 'find_hit', 'find_miss']
+# Whole-set builds, timed once per trial: insert_many() into a new set (as
+# from_iterable() does), and the trees' balanced from_sorted()
+BUILDS = ['bulk_build', 'from_sorted']
+PERCENTILES = [('p50_ns', 0.50), ('p95_ns', 0.95), ('p99_ns', 0.99)]
+# Per-operation statistics checked against a baseline
+COMPARED = ['p50_ns', 'p95_ns']
+MEMORY_COMPARED = ['retained_bytes', 'peak_bytes']
+# Attributes holding the slot arrays of the hash set types
+TABLE_ATTRIBUTES = ['hash_table', 'hash_codes', 'table']
+
+SEED = 42
+trials = 5
+warmup = 1
+lookups = 10000
+threshold = 0.10
 
 def load_dictionary(filepath):
     words = []
@@ -30,137 +56,468 @@ def load_dictionary(filepath):
                 words.append(word.lower().strip())
     return words
 
-def run_benchmarks():
-    print("=" * 60)
-    print("Data Structure Performance Benchmark")
-    print("=" * 60)
-    
-    # Find a dictionary file
-    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-    dict_files = []
-    
-    for root, dirs, files in os.walk(data_dir):
-        for file in files:
-            if file == 'dict':
-                dict_files.append(os.path.join(root, file))
-    
-    if not dict_files:
-        print("No dictionary files found in data directory!")
-        return
-    
-    # Use the first dictionary file found
-    dict_file = dict_files[0]
-    print("\nLoading dictionary: " + os.path.relpath(dict_file))
-    words = load_dictionary(dict_file)
-    print("Loaded " + str(len(words)) + " words\n")
-    
-    results = {}
-    
-    # Benchmark BSTree
-    print("Benchmarking BSTree...")
+def timing_only():
+    # Settings for the benchmarks that only report times: no verbose output,
+    # and the null stats collector, so the sets count nothing
     config.verbose = 0
-    tree = bstree()
-    insert_time = benchmark_insert(tree, words, "BSTree")
-    find_time = benchmark_find(tree, words[:min(1000, len(words))], "BSTree")
-    
-    # Calculate metrics
-    ops_per_sec = len(words) / insert_time
-    avg_comparisons = tree.number_of_comparisons / tree.number_of_executions
-    
-    results['BSTree'] = {
-        'insert': insert_time,
-        'find': find_time,
-        'size': tree.size(),
-        'comparisons': tree.number_of_comparisons,
-        'executions': tree.number_of_executions,
-        'ops_per_sec': ops_per_sec,
-        'avg_comparisons': avg_comparisons
+    config.stats_collector = "null"
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+def dataset_files(name):
+    # Every dict file of a dataset, in a fixed order
+    if name == 'henry':
+        return [os.path.join(DATA_DIR, 'large', 'henry', 'dict')]
+    directory = os.path.join(DATA_DIR, name)
+    paths = [os.path.join(directory, entry, 'dict') for entry in sorted(os.listdir(directory))]
+    return [path for path in paths if os.path.isfile(path)]
+
+def load_dataset(name):
+    words = []
+    for path in dataset_files(name):
+        words.extend(load_dictionary(path))
+    # A repeated word would only be inserted once
+    return list(dict.fromkeys(words))
+
+def synthetic_words(count, rng):
+    # Distinct random lowercase words of 6 to 12 letters, always the same
+    # ones in the same order for a given seed
+    words = {}
+    while len(words) < count:
+        words["".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12)))] = True
+    return list(words)
+
+def datasets(names, sizes):
+    # (label, words) for each dataset, loaded one at a time
+    for name in names:
+        if name == 'synthetic':
+            for size in sizes:
+                yield name + "_" + str(size), synthetic_words(size, random.Random(SEED))
+        else:
+            yield name, load_dataset(name)
+
+def workloads(words, count, rng):
+    # count dictionary words, and count words that are certainly not in it
+    hits = [rng.choice(words) for _ in range(count)]
+    present = set(words)
+    misses = []
+    while len(misses) < count:
+        word = rng.choice(words) + "qx"
+        if word not in present:
+            misses.append(word)
+    return hits, misses
+
+def time_each(operation, values):
+    # Nanoseconds taken by each call, with the garbage collector off as in timeit
+    clock = time.perf_counter_ns
+    latencies = []
+    append = latencies.append
+    gc.collect()
+    gc.disable()
+    try:
+        for value in values:
+            start = clock()
+            operation(value)
+            append(clock() - start)
+    finally:
+        gc.enable()
+    return latencies
+
+def timer_overhead():
+    # Median nanoseconds between two back-to-back clock reads, included in
+    # every latency measured by time_each()
+    clock = time.perf_counter_ns
+    return median([-(clock() - clock()) for _ in range(10000)])
+
+def trial_summary(latencies):
+    latencies.sort()
+    summary = {name: percentile(latencies, fraction) for name, fraction in PERCENTILES}
+    summary['total_ns'] = sum(latencies)
+    summary['max_ns'] = latencies[-1]
+    return summary
+
+def combine_trials(summaries, count):
+    # The median over the trials of each trial's percentiles, so that one
+    # disturbed trial cannot move the result
+    totals = [summary['total_ns'] for summary in summaries]
+    result = {
+        'count': count,
+        'trials_ns': totals,
+        'mean_ns': median(totals) / float(count),
+        'ops_per_sec': count * 1e9 / median(totals),
+        'max_ns': max(summary['max_ns'] for summary in summaries)
     }
-    print("  Insert time: " + str(round(insert_time, 6)) + "s")
-    print("  Find time (1000 words): " + str(round(find_time, 6)) + "s")
-    print("  Size: " + str(tree.size()))
-    print("  Ops/sec: " + str(int(ops_per_sec)))
-    print("  Avg comparisons: " + str(round(avg_comparisons, 2)))
-    print()
-    
-    # Benchmark HashSet
-    print("Benchmarking HashSet...")
-    config.verbose = 0
-    # Uses init_size from config.py
-    hs = hashset()
-    
-    # Track collisions separately for insert and find
-    insert_time = benchmark_insert(hs, words, "HashSet")
-    collisions_after_insert = hs.number_of_collisions
-    accesses_after_insert = hs.number_of_accesses
-    
-    find_time = benchmark_find(hs, words[:min(1000, len(words))], "HashSet")
-    collisions_after_find = hs.number_of_collisions
-    accesses_after_find = hs.number_of_accesses
-    
-    # Calculate metrics
-    ops_per_sec = len(words) / insert_time
-    load_factor = hs.number_of_values / hs.hash_table_size
-    collisions_insert = collisions_after_insert
-    collisions_find = collisions_after_find - collisions_after_insert
-    avg_collisions_insert = collisions_insert / len(words)
-    find_count = accesses_after_find - accesses_after_insert
-    avg_collisions_find = collisions_find / float(find_count)
-    avg_probe_length = hs.total_probe_length / float(hs.number_of_finds)
-    
-    results['HashSet'] = {
-        'insert': insert_time,
-        'find': find_time,
-        'size': hs.number_of_values,
-        'collisions': hs.number_of_collisions,
-        'rehashes': hs.number_of_rehashes,
-        'accesses': hs.number_of_accesses,
-        'ops_per_sec': ops_per_sec,
-        'load_factor': load_factor,
-        'avg_coll_insert': avg_collisions_insert,
-        'avg_coll_find': avg_collisions_find,
-        'avg_probe_length': avg_probe_length
+    for name, fraction in PERCENTILES:
+        result[name] = median([summary[name] for summary in summaries])
+    return result
+
+def describe(data_structure):
+    # Shape of a finished set: height of a tree, load factor of a hash table
+    shape = {}
+    if hasattr(data_structure, 'height'):
+        shape['height'] = data_structure.height()
+    if hasattr(data_structure, 'hash_table_size'):
+        shape['load_factor'] = data_structure.number_of_values / float(data_structure.hash_table_size)
+        shape['rehashes'] = getattr(data_structure, 'number_of_rehashes', 0)
+    return shape
+
+def time_builds(build, values):
+    # Nanoseconds of each trial of one whole build, with the garbage
+    # collector off. Returns the last set built and the statistics
+    clock = time.perf_counter_ns
+    durations = []
+    for _ in range(trials):
+        built = None
+        gc.collect()
+        gc.disable()
+        try:
+            start = clock()
+            built = build(values)
+            durations.append(clock() - start)
+        finally:
+            gc.enable()
+    return built, {
+        'count': len(values),
+        'trials_ns': durations,
+        'median_ns': median(durations),
+        'ops_per_sec': len(values) * 1e9 / median(durations)
+    }
+
+def bulk_build(values):
+    data_structure = set_factory.initialise_set()
+    data_structure.insert_many(values)
+    return data_structure
+
+def benchmark_set_type(set_type, words, sorted_words, hits, misses):
+    # Times every insert into an empty set, then every hit and miss lookup in
+    # the set built by the last trial, then whole builds of the set
+    config.set_type = set_type
+    for _ in range(warmup):
+        data_structure = set_factory.initialise_set()
+        for word in words[:lookups]:
+            data_structure.insert(word)
+    summaries = []
+    for _ in range(trials):
+        data_structure = set_factory.initialise_set()
+        summaries.append(trial_summary(time_each(data_structure.insert, words)))
+    results = {'insert': combine_trials(summaries, len(words))}
+    for name, values in [('find_hit', hits), ('find_miss', misses)]:
+        find = data_structure.find
+        for _ in range(warmup):
+            for value in values:
+                find(value)
+        summaries = [trial_summary(time_each(find, values)) for _ in range(trials)]
+        results[name] = combine_trials(summaries, len(values))
+    results.update(describe(data_structure))
+
+    data_structure = None
+    data_structure, results['bulk_build'] = time_builds(bulk_build, words)
+    from_sorted = getattr(type(data_structure), 'from_sorted', None)
+    if from_sorted is not None:
+        data_structure = None
+        data_structure, results['from_sorted'] = time_builds(from_sorted, sorted_words)
+        results['from_sorted']['height'] = data_structure.height()
+    return results
+
+def table_slack(data_structure):
+    # Bytes held by empty slots: those a table exactly at max_load_factor
+    # would keep free, and those left over from growing to the next prime
+    # past the doubled size
+    slots = data_structure.hash_table_size
+    values = data_structure.number_of_values
+    slot_bytes = sum(sys.getsizeof(getattr(data_structure, name))
+                     for name in TABLE_ATTRIBUTES if hasattr(data_structure, name)) / float(slots)
+    fullest_slots = min(slots, int(math.ceil(values / config.max_load_factor)))
+    return {
+        'slots': slots,
+        'slot_bytes': slot_bytes,
+        'load_factor_slack_bytes': int((fullest_slots - values) * slot_bytes),
+        'growth_slack_bytes': int((slots - fullest_slots) * slot_bytes)
+    }
+
+def measure_memory(set_type, words):
+    # Retained and peak bytes of a set built one insert at a time. Each word
+    # is inserted as a fresh copy, so a set that keeps the caller's str
+    # objects (the trees) is charged for them like one that copies them
+    config.set_type = set_type
+    gc.collect()
+    tracemalloc.start()
+    data_structure = set_factory.initialise_set()
+    insert = data_structure.insert
+    for word in words:
+        insert(word.encode().decode())
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    # tracemalloc only sees live blocks, so this counts the allocations each
+    # insert leaves behind, not the temporary ones
+    blocks = sum(statistic.count for statistic in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    memory = {
+        'retained_bytes': retained,
+        'peak_bytes': peak,
+        'bytes_per_key': retained / float(len(words)),
+        'peak_bytes_per_key': peak / float(len(words)),
+        'blocks_per_insert': blocks / float(len(words))
     }
-    print("  Insert time: " + str(round(insert_time, 6)) + "s")
-    print("  Find time (1000 words): " + str(round(find_time, 6)) + "s")
-    print("  Size: " + str(hs.number_of_values))
-    print("  Ops/sec: " + str(int(ops_per_sec)))
-    print("  Collisions (insert): " + str(collisions_insert))
-    print("  Collisions (find): " + str(collisions_find))
-    print("  Avg collisions/insert: " + str(round(avg_collisions_insert, 2)))
-    print("  Avg collisions/find: " + str(round(avg_collisions_find, 2)))
-    print("  Avg probe length: " + str(round(avg_probe_length, 2)))
-    print("  Rehashes: " + str(hs.number_of_rehashes))
-    print("  Load factor: " + str(round(load_factor, 2)))
-    print()
-    
-    # Summary
+    if hasattr(data_structure, 'hash_table_size'):
+        memory.update(table_slack(data_structure))
+    return memory
+
+def benchmark_collectors(words, sample):
+    # Find rate of each set type under each stats collector, the same words
+    # looked up in the same order
+    sorted_words = sorted(words)
+    rates = {}
+    for name, make_set in [("HashSet", lambda stats: hashset.from_iterable(words, stats=stats)),
+                           ("BSTree", lambda stats: bstree.from_sorted(sorted_words, stats))]:
+        rates[name] = {}
+        for collector in stats_collectors.COLLECTORS:
+            data_structure = make_set(stats_collectors.new_collector(collector))
+            summaries = [trial_summary(time_each(data_structure.find, sample)) for _ in range(trials)]
+            rates[name][collector] = combine_trials(summaries, len(sample))['ops_per_sec']
+    return rates
+
+def format_operation(name, result):
+    return ("    " + name.ljust(10) + str(int(result['ops_per_sec'])).rjust(10) + " ops/s   p50 "
+            + str(result['p50_ns']) + "ns, p95 " + str(result['p95_ns']) + "ns, p99 "
+            + str(result['p99_ns']) + "ns, max " + str(round(result['max_ns'] / 1e6, 3)) + "ms")
+
+def format_build(name, result):
+    line = ("    " + name.ljust(10) + str(int(result['ops_per_sec'])).rjust(10) + " keys/s  median "
+            + str(round(result['median_ns'] / 1e9, 6)) + "s")
+    if 'height' in result:
+        line += ", height " + str(result['height'])
+    return line
+
+def print_summary(dataset):
+    print("  " + "Structure".ljust(18) + "Insert/s".rjust(10) + "Bulk (s)".rjust(11) + "Sorted (s)".rjust(11)
+          + "Height".rjust(8) + "Hit p50".rjust(9) + "Miss p50".rjust(10) + "Bytes/key".rjust(11))
+    for name, structure in dataset['structures'].items():
+        from_sorted = structure.get('from_sorted')
+        print("  " + name.ljust(18) + str(int(structure['insert']['ops_per_sec'])).rjust(10)
+              + str(round(structure['bulk_build']['median_ns'] / 1e9, 4)).rjust(11)
+              + (str(round(from_sorted['median_ns'] / 1e9, 4)) if from_sorted else "-").rjust(11)
+              + str(structure.get('height', "-")).rjust(8)
+              + (str(structure['find_hit']['p50_ns']) + "ns").rjust(9)
+              + (str(structure['find_miss']['p50_ns']) + "ns").rjust(10)
+              + str(round(structure['memory']['bytes_per_key'], 1)).rjust(11))
+
+def format_memory(memory):
+    line = ("    memory    " + str(round(memory['retained_bytes'] / 1e6, 2)) + " MB retained, "
+            + str(round(memory['peak_bytes'] / 1e6, 2)) + " MB peak, "
+            + str(round(memory['bytes_per_key'], 1)) + " bytes/key, "
+            + str(round(memory['blocks_per_insert'], 2)) + " blocks/insert")
+    if 'slots' in memory:
+        slack = memory['load_factor_slack_bytes'] + memory['growth_slack_bytes']
+        line += ("\n    slack     " + str(round(slack / 1e6, 2)) + " MB in empty slots ("
+                 + str(round(100.0 * slack / memory['retained_bytes'], 1)) + "% of retained: "
+                 + str(round(memory['load_factor_slack_bytes'] / 1e6, 2)) + " MB load factor, "
+                 + str(round(memory['growth_slack_bytes'] / 1e6, 2)) + " MB growth)")
+    return line
+
+def metadata(names, sizes, set_types):
+    return {
+        'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_implementation() + " " + platform.python_version(),
+        'platform': platform.platform(),
+        'datasets': names,
+        'synthetic_sizes': sizes,
+        'set_types': set_types,
+        'trials': trials,
+        'warmup': warmup,
+        'lookups': lookups,
+        'seed': SEED,
+        'timer_overhead_ns': timer_overhead(),
+        'config': {
+            'hash_function': config.hash_function,
+            'probing': config.probing,
+            'init_size': config.init_size,
+            'max_load_factor': config.max_load_factor
+        }
+    }
+
+def run_benchmarks(names=DATASETS, sizes=SYNTHETIC_SIZES, set_types=None):
     print("=" * 60)
-    print("Performance Summary")
+    print("Data Structure Performance Benchmark")
     print("=" * 60)
-    print("\nStructure            Insert (s)      Find (s)        Ops/sec")
-    print("-" * 60)
-    for name, data in results.items():
-        insert_str = str(round(data['insert'], 6))
-        find_str = str(round(data['find'], 6))
-        ops_str = str(int(data['ops_per_sec']))
-        print(name.ljust(20) + " " + insert_str.ljust(15) + " " + find_str.ljust(15) + " " + ops_str)
-    
-    # Calculate speedup
-    bst_insert = results['BSTree']['insert']
-    hash_insert = results['HashSet']['insert']
-    bst_find = results['BSTree']['find']
-    hash_find = results['HashSet']['find']
-    insert_speedup = bst_insert / hash_insert
-    find_speedup = bst_find / hash_find
-    
+
+    set_types = set_types or [name for name, set_type in SET_TYPES]
+    timing_only()
+    results = {'meta': metadata(names, sizes, set_types), 'datasets': {}}
+    print("\n" + str(trials) + " trials after " + str(warmup) + " warmup round(s), "
+          + str(lookups) + " hit and " + str(lookups) + " miss lookups per dataset")
+    print("Timer overhead (included in each latency): " + str(results['meta']['timer_overhead_ns']) + "ns")
+
+    for label, words in datasets(names, sizes):
+        print("\nDataset: " + label + " (" + str(len(words)) + " keys)")
+        hits, misses = workloads(words, lookups, random.Random(SEED))
+        sorted_words = sorted(words)
+        dataset = {'keys': len(words), 'structures': {}}
+        for name, set_type in SET_TYPES:
+            if name not in set_types:
+                continue
+            print("  " + name + ":")
+            structure = benchmark_set_type(set_type, words, sorted_words, hits, misses)
+            for operation in OPERATIONS:
+                print(format_operation(operation, structure[operation]))
+            for build in BUILDS:
+                if build in structure:
+                    print(format_build(build, structure[build]))
+            # Measured apart from the timings, since tracemalloc slows
+            # every allocation down
+            structure['memory'] = measure_memory(set_type, words)
+            print(format_memory(structure['memory']))
+            dataset['structures'][name] = structure
+        results['datasets'][label] = dataset
+        print()
+        print_summary(dataset)
+
+        if label == 'henry':
+            # Cost of the stats collectors on the hottest path
+            print("  Stats collectors (hit lookups):")
+            results['collectors'] = benchmark_collectors(words, hits)
+            for name, rates in results['collectors'].items():
+                print("    " + name + ": " + ", ".join(collector + " " + str(int(rate)) + " ops/s"
+                                                    for collector, rate in rates.items())
+                      + " (null saves " + str(round(100 * (1 - rates["basic"] / rates["null"]), 1))
+                      + "% of basic)")
+
     print("\n" + "=" * 60)
-    print("HashSet vs BSTree:")
-    print("  Insert speedup: " + str(round(insert_speedup, 2)) + "x faster")
-    print("  Find speedup: " + str(round(find_speedup, 2)) + "x faster")
-    print("=" * 60)
-    
     return results
 
+def compare_results(baseline, results):
+    # Prints every compared statistic present in both runs and returns the
+    # number that got slower than the baseline by more than the threshold
+    regressions = 0
+    for key in ['python', 'platform', 'config', 'trials', 'lookups']:
+        if baseline['meta'].get(key) != results['meta'].get(key):
+            sys.stderr.write("Warning: %s differs from the baseline (%s, was %s)\n"
+                             % (key, results['meta'].get(key), baseline['meta'].get(key)))
+    print("Comparison with baseline of " + baseline['meta']['date']
+          + " (regression above +" + str(round(100 * threshold, 1)) + "%)")
+    for label, dataset in results['datasets'].items():
+        if label not in baseline['datasets']:
+            continue
+        print("\nDataset: " + label)
+        for name, structure in dataset['structures'].items():
+            before_structure = baseline['datasets'][label]['structures'].get(name)
+            if before_structure is None:
+                continue
+            # (section, statistic, label, unit) for every statistic compared
+            compared = [(operation, statistic, operation + " " + statistic[:3], "ns")
+                        for operation in OPERATIONS for statistic in COMPARED]
+            compared += [(build, 'median_ns', build, "ns") for build in BUILDS]
+            compared += [('memory', statistic, "memory " + statistic.split("_")[0], "B ")
+                         for statistic in MEMORY_COMPARED]
+            for section, statistic, description, unit in compared:
+                if section not in structure or section not in before_structure:
+                    continue
+                before = before_structure[section][statistic]
+                after = structure[section][statistic]
+                change = (after - before) / float(before) if before else 0.0
+                regressed = change > threshold
+                regressions += regressed
+                print("  " + (name + " " + description).ljust(34)
+                      + str(before).rjust(10) + unit + " -> " + str(after).rjust(10) + unit + "  "
+                      + ("%+.1f%%" % (100 * change)).rjust(8)
+                      + ("  REGRESSION" if regressed else ""))
+    print("\n" + str(regressions) + " regression(s)")
+    return regressions
+
+def usage():
+    sys.stderr.write(
+          "Usage: %s [-D datasets] [-n sizes] [-T set_types] [-r trials] [-w warmup] [-l lookups] [-o results_file] [-C baseline_file] [-x percent] [-h] [results_file]\n" % sys.argv[0])
+    sys.stderr.write("\tD: comma-separated datasets: %s (default all)\n" % ", ".join(DATASETS))
+    sys.stderr.write("\tn: comma-separated synthetic dataset sizes (default %s)\n"
+                     % ",".join(str(size) for size in SYNTHETIC_SIZES))
+    sys.stderr.write("\tT: comma-separated set types: %s (default all)\n"
+                     % ", ".join(name for name, set_type in SET_TYPES))
+    sys.stderr.write("\tr: timed trials per operation (default %d)\n" % trials)
+    sys.stderr.write("\tw: untimed warmup rounds before the trials (default %d)\n" % warmup)
+    sys.stderr.write("\tl: hit and miss lookups per dataset (default %d)\n" % lookups)
+    sys.stderr.write("\to: write the results as JSON to this file (default %s)\n"
+                     % os.path.relpath(DEFAULT_RESULTS_FILE))
+    sys.stderr.write("\tC: compare with the results in this baseline file and exit with\n"
+                     "\t   status 1 if any operation regressed\n")
+    sys.stderr.write("\tx: regression threshold in percent (default %d)\n" % int(100 * threshold))
+    sys.stderr.write("\th: help - output this message\n")
+    sys.stderr.write("\tresults_file: with -C, compare these saved results instead of running\n")
+    exit(1)
+
+def split_list(argument, allowed=None):
+    values = [value for value in argument.split(",") if value]
+    for value in values:
+        if allowed is not None and value not in allowed:
+            sys.stderr.write("Unknown name `%s'\n" % value)
+            usage()
+    return values
+
+def positive_integer(argument, what):
+    if (not argument.isdigit() or int(argument) < 1):
+        sys.stderr.write("The %s must be a positive integer\n" % what)
+        usage()
+    return int(argument)
+
+def main(args):
+    global trials, warmup, lookups, threshold
+    try:
+        opts, other_args = getopt.getopt(args, "D:n:T:r:w:l:o:C:x:h")
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+
+    names = DATASETS
+    sizes = SYNTHETIC_SIZES
+    set_types = None
+    results_file = DEFAULT_RESULTS_FILE
+    baseline_file = None
+    for o, a in opts:
+        if (o == '-D'):
+            names = split_list(a, DATASETS)
+        elif (o == '-n'):
+            sizes = [positive_integer(size, "synthetic dataset size") for size in split_list(a)]
+        elif (o == '-T'):
+            set_types = split_list(a, [name for name, set_type in SET_TYPES])
+        elif (o == '-r'):
+            trials = positive_integer(a, "number of trials")
+        elif (o == '-w'):
+            if (not a.isdigit()):
+                sys.stderr.write("The number of warmup rounds must be a non-negative integer\n")
+                usage()
+            warmup = int(a)
+        elif (o == '-l'):
+            lookups = positive_integer(a, "number of lookups")
+        elif (o == '-o'):
+            results_file = a
+        elif (o == '-C'):
+            baseline_file = a
+        elif (o == '-x'):
+            threshold = float(a) / 100
+        else:
+            usage()
+    if other_args and baseline_file is None:
+        usage()
+
+    if other_args:
+        # Compare two saved runs without benchmarking
+        with open(other_args[0]) as f:
+            results = json.load(f)
+    else:
+        results = run_benchmarks(names, sizes, set_types)
+        with open(results_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        print("Results written to " + os.path.relpath(results_file))
+        print("=" * 60)
+
+    if baseline_file is not None:
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+        if compare_results(baseline, results):
+            exit(1)
+
 if __name__ == "__main__":
-    run_benchmarks()
+    main(sys.argv[1:])
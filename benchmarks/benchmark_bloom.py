@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+import time
+from hashset import hashset
+from bloom_filter import bloom_set
+from benchmark import load_dictionary, timing_only
+import speller
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry')
+
+def time_lookups(words, queries, batch_size=4096):
+    # Seconds to look every query up through find_many, in speller-sized batches
+    start = time.perf_counter()
+    for batch_start in range(0, len(queries), batch_size):
+        words.find_many(queries[batch_start:batch_start + batch_size])
+    return time.perf_counter() - start
+
+def run_bloom_benchmarks(data_dir=DEFAULT_DATA_DIR, queries=100000):
+    print("=" * 60)
+    print("Bloom Filter Front End Benchmark")
+    print("=" * 60)
+
+    dict_file = os.path.join(data_dir, 'dict')
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    timing_only()
+    dictionary = load_dictionary(dict_file)
+    plain = hashset.from_iterable(dictionary)
+    filtered = bloom_set(hashset.from_iterable(dictionary))
+    print("Loaded " + str(len(dictionary)) + " words")
+    print("Filter: " + str(filtered.filter.number_of_bits // 8) + " bytes, "
+          + str(filtered.filter.number_of_hashes) + " hashes\n")
+
+    rng = random.Random(42)
+    with open(os.path.join(data_dir, 'infile')) as text_file:
+        text = [word for line_number, word in speller.tokenize(text_file)]
+    workloads = [
+        ("hits", [rng.choice(dictionary) for _ in range(queries)]),
+        ("misses", [rng.choice(dictionary) + "qx" for _ in range(queries)]),
+        ("text", text),
+    ]
+
+    results = {}
+    for name, workload in workloads:
+        print("Workload: " + name + " (" + str(len(workload)) + " lookups)")
+        plain_time = time_lookups(plain, workload)
+        rejections = filtered.number_of_rejections
+        false_positives = filtered.number_of_false_positives
+        filtered_time = time_lookups(filtered, workload)
+        rejections = filtered.number_of_rejections - rejections
+        false_positives = filtered.number_of_false_positives - false_positives
+        results[name] = {
+            'plain': len(workload) / plain_time,
+            'filtered': len(workload) / filtered_time,
+            'skipped': rejections / float(len(workload))
+        }
+        if rejections + false_positives:
+            results[name]['false_positive_rate'] = false_positives / float(rejections + false_positives)
+        print("  HashSet lookups/sec: " + str(int(results[name]['plain'])))
+        print("  Bloom + HashSet lookups/sec: " + str(int(results[name]['filtered'])))
+        print("  Lookups that skipped the set: " + str(round(100 * results[name]['skipped'], 2)) + "%")
+        if 'false_positive_rate' in results[name]:
+            print("  False-positive rate: " + str(round(100 * results[name]['false_positive_rate'], 2)) + "%")
+        print()
+
+    print("=" * 60)
+    print("Expected false-positive rate: " + str(round(100 * filtered.filter.expected_false_positive_rate(), 2)) + "%")
+    print("=" * 60)
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_bloom_benchmarks(sys.argv[1])
+    else:
+        run_bloom_benchmarks()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+from hashset import hashset
+from bstree import bstree
+from lookup_cache import lookup_cache
+from benchmark import load_dictionary, timing_only
+import speller
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry')
+
+def time_text(words, text):
+    # Seconds to check the text in speller-sized find_many batches
+    start = time.perf_counter()
+    for batch_start in range(0, len(text), speller.CHECK_CHUNK_SIZE):
+        words.find_many(text[batch_start:batch_start + speller.CHECK_CHUNK_SIZE])
+    return time.perf_counter() - start
+
+def run_cache_benchmarks(data_dir=DEFAULT_DATA_DIR, capacities=(256, 1024, 4096, 16384)):
+    print("=" * 60)
+    print("Lookup Cache Benchmark (LRU and CLOCK)")
+    print("=" * 60)
+
+    dict_file = os.path.join(data_dir, 'dict')
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    timing_only()
+    dictionary = load_dictionary(dict_file)
+    with open(os.path.join(data_dir, 'infile')) as text_file:
+        text = [word for line_number, word in speller.tokenize(text_file)]
+    print("Loaded " + str(len(dictionary)) + " words, text of " + str(len(text))
+          + " words (" + str(len(set(text))) + " distinct)\n")
+
+    sets = [
+        ("HashSet", hashset.from_iterable(dictionary)),
+        ("BSTree", bstree.from_sorted(sorted(dictionary))),
+    ]
+    results = {}
+    for name, words in sets:
+        print(name + ":")
+        plain_time = time_text(words, text)
+        results[name] = {'none': len(text) / plain_time}
+        print("  No cache: " + str(int(results[name]['none'])) + " lookups/s")
+        for policy in ["lru", "clock"]:
+            for capacity in capacities:
+                cache = lookup_cache(words, capacity, policy)
+                cache_time = time_text(cache, text)
+                hit_rate = cache.number_of_hits / float(len(text))
+                results[name][policy + str(capacity)] = len(text) / cache_time
+                print("  " + policy.upper() + " " + str(capacity) + ": "
+                      + str(int(len(text) / cache_time)) + " lookups/s, hit rate "
+                      + str(round(100 * hit_rate, 1)) + "%, " + str(cache.number_of_evictions) + " evictions ("
+                      + str(round(plain_time / cache_time, 2)) + "x)")
+        print()
+
+    print("=" * 60)
+    print("Hits include repeats of a word within one batch, which are only looked up once")
+    print("=" * 60)
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_cache_benchmarks(sys.argv[1])
+    else:
+        run_cache_benchmarks()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+import tracemalloc
+from compact_hashset import compact_hashset
+from hashset import hashset
+from benchmark import load_dictionary, timing_only
+import config
+
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+def measure_build(set_class, words):
+    # Returns (set, seconds, retained bytes, peak bytes). The build is timed
+    # on its own, since tracemalloc slows every allocation down
+    start = time.perf_counter()
+    set_class.from_iterable(words)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    built = set_class.from_iterable(words)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, elapsed, retained, peak
+
+def run_compact_benchmarks(dict_file=DEFAULT_DICT_FILE):
+    print("=" * 60)
+    print("Compact Storage Memory Benchmark")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = load_dictionary(dict_file)
+    print("Loaded " + str(len(words)) + " words\n")
+
+    timing_only()
+    config.init_size = 7
+
+    results = {}
+    for name, set_class in [("HashSet (list of objects)", hashset), ("CompactHashSet (arena)", compact_hashset)]:
+        print("Benchmarking " + name + "...")
+        built, build_time, retained, peak = measure_build(set_class, words)
+
+        start = time.perf_counter()
+        for word in words[:10000]:
+            built.find(word)
+        find_time = time.perf_counter() - start
+
+        results[name] = {
+            'build': build_time,
+            'find': find_time,
+            'retained': retained,
+            'peak': peak,
+            'bytes_per_key': retained / float(built.number_of_values)
+        }
+        print("  Build time: " + str(round(build_time, 4)) + "s")
+        print("  Find time (10000 words): " + str(round(find_time, 4)) + "s")
+        print("  Retained memory: " + str(round(retained / 1e6, 2)) + " MB")
+        print("  Peak memory: " + str(round(peak / 1e6, 2)) + " MB")
+        print("  Bytes per key: " + str(round(results[name]['bytes_per_key'], 1)))
+        print()
+        del built
+
+    names = list(results)
+    ratio = results[names[0]]['retained'] / float(results[names[1]]['retained'])
+    print("=" * 60)
+    print("Compact storage uses " + str(round(100.0 / ratio, 1)) + "% of the list-of-objects memory")
+    print("=" * 60)
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_compact_benchmarks(sys.argv[1])
+    else:
+        run_compact_benchmarks()
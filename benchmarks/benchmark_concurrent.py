@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+import threading
+import time
+from hashset import hashset
+from concurrent_hashset import concurrent_hashset
+from benchmark import load_dictionary
+import config
+
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+
+class locked_hashset:
+    # hashset behind one global lock, the simplest way to share it
+    def __init__(self, words):
+        self.words = words
+        self.lock = threading.Lock()
+
+    def find(self, value):
+        with self.lock:
+            return self.words.find(value)
+
+    def insert(self, value):
+        with self.lock:
+            return self.words.insert(value)
+
+
+def make_operations(words, count, write_fraction, rng):
+    # (is_insert, word) pairs; inserts add words that are not yet in the set
+    return [(True, rng.choice(words) + "_" + str(i)) if rng.random() < write_fraction
+            else (False, rng.choice(words)) for i in range(count)]
+
+def worker(words, operations):
+    find = words.find
+    insert = words.insert
+    for is_insert, word in operations:
+        if is_insert:
+            insert(word)
+        else:
+            find(word)
+
+def run_workload(words, operations_per_thread):
+    threads = [threading.Thread(target=worker, args=(words, operations)) for operations in operations_per_thread]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(len(operations) for operations in operations_per_thread) / elapsed
+
+def run_concurrent_benchmarks(dict_file=DEFAULT_DICT_FILE, operations=100000):
+    print("=" * 60)
+    print("Concurrent Hash Set Benchmark (lock-free reads vs global lock)")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = load_dictionary(dict_file)
+    print("Loaded " + str(len(words)) + " words")
+    print(str(operations) + " operations per run, split across the threads\n")
+
+    config.verbose = 0
+    # Compared against concurrent_hashset, which always counts
+    config.stats_collector = "basic"
+    rng = random.Random(42)
+    results = {}
+    for workload, write_fraction in [("read-heavy", 0.05), ("mixed", 0.5)]:
+        print(workload.capitalize() + " workload (" + str(int(write_fraction * 100)) + "% inserts)")
+        results[workload] = {}
+        for threads in [1, 2, 4, 8]:
+            operations_per_thread = [make_operations(words, operations // threads, write_fraction, rng)
+                                     for _ in range(threads)]
+            # Fresh sets each run so both start from the same dictionary
+            concurrent_rate = run_workload(concurrent_hashset.from_iterable(words), operations_per_thread)
+            locked_rate = run_workload(locked_hashset(hashset.from_iterable(words)), operations_per_thread)
+            results[workload][threads] = {'concurrent': concurrent_rate, 'locked': locked_rate}
+            print("  " + str(threads) + " threads: concurrent " + str(int(concurrent_rate))
+                  + " ops/s, global lock " + str(int(locked_rate)) + " ops/s ("
+                  + str(round(concurrent_rate / locked_rate, 2)) + "x)")
+        print()
+
+    print("=" * 60)
+    print("Note: under the CPython GIL threads do not run Python code in")
+    print("parallel; the gain comes from finds never waiting for a lock.")
+    print("=" * 60)
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_concurrent_benchmarks(sys.argv[1])
+    else:
+        run_concurrent_benchmarks()
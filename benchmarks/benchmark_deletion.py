@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+from collections import deque
+import time
+from hashset import hashset
+from benchmark import load_dictionary
+import config
+
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+def churn(hs, live, spare, rounds, rng):
+    # Replace one random live word with a spare word per round, so the set
+    # keeps its size while every slot sees inserts and deletes over time
+    for _ in range(rounds):
+        index = rng.randrange(len(live))
+        hs.remove(live[index])
+        replacement = spare.popleft()
+        spare.append(live[index])
+        hs.insert(replacement)
+        live[index] = replacement
+
+def average_probe_length(hs, words):
+    probes_before = hs.total_probe_length
+    finds_before = hs.number_of_finds
+    for word in words:
+        hs.find(word)
+    return (hs.total_probe_length - probes_before) / float(hs.number_of_finds - finds_before)
+
+def run_deletion_benchmarks(dict_file=DEFAULT_DICT_FILE, live_size=50000, rounds=20000, phases=5):
+    print("=" * 60)
+    print("Deletion Benchmark (insert/delete churn)")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = sorted(set(load_dictionary(dict_file)))
+    print("Loaded " + str(len(words)) + " distinct words")
+    # Keep at least as many spare words as live ones for the churn
+    live_size = min(live_size, len(words) // 2)
+    print(str(live_size) + " live words, " + str(rounds) + " replacements per phase\n")
+
+    config.verbose = 0
+    # The probe and collision counts are part of the results
+    config.stats_collector = "basic"
+    config.init_size = 7
+
+    results = {}
+    for probing_name, deletion in [("linear", "tombstone"), ("linear", "backward_shift"),
+                                   ("double", "tombstone"), ("robin_hood", "backward_shift")]:
+        name = probing_name + "/" + deletion
+        print("Benchmarking " + name + "...")
+        rng = random.Random(42)
+        shuffled = list(words)
+        rng.shuffle(shuffled)
+        live = shuffled[:live_size]
+        spare = deque(shuffled[live_size:])
+        misses = [word[::-1] + "q" for word in live[:5000]]
+
+        hs = hashset.from_iterable(live, probing=probing_name, deletion=deletion)
+        hit_lengths = [average_probe_length(hs, live[:5000])]
+        miss_lengths = [average_probe_length(hs, misses)]
+        start = time.perf_counter()
+        for _ in range(phases):
+            churn(hs, live, spare, rounds, rng)
+            hit_lengths.append(average_probe_length(hs, live[:5000]))
+            miss_lengths.append(average_probe_length(hs, misses))
+        elapsed = time.perf_counter() - start
+
+        results[name] = {
+            'churn_time': elapsed,
+            'hit_probe_lengths': hit_lengths,
+            'miss_probe_lengths': miss_lengths,
+            'tombstones': hs.number_of_tombstones,
+            'rehashes': hs.number_of_rehashes
+        }
+        print("  Churn time: " + str(round(elapsed, 4)) + "s")
+        print("  Avg probe length (hits) by phase: " + " ".join(str(round(x, 2)) for x in hit_lengths))
+        print("  Avg probe length (misses) by phase: " + " ".join(str(round(x, 2)) for x in miss_lengths))
+        print("  Tombstones at end: " + str(hs.number_of_tombstones))
+        print("  Rehashes: " + str(hs.number_of_rehashes))
+        print()
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_deletion_benchmarks(sys.argv[1])
+    else:
+        run_deletion_benchmarks()
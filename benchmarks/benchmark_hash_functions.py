@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+from hashset import hashset
+from benchmark import load_dictionary
+import config
+import hash_functions
+
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+def time_hash_function(function, words):
+    # Average nanoseconds per call over every word
+    start = time.perf_counter_ns()
+    for word in words:
+        function(word)
+    end = time.perf_counter_ns()
+    return (end - start) / len(words)
+
+def bucket_distribution(function, words, table_size):
+    # Quality measure sum(b_j * (b_j + 1) / 2) / expected, where b_j is the number
+    # of words in bucket j; a uniformly random function scores close to 1.0
+    buckets = [0] * table_size
+    for word in words:
+        buckets[function(word) % table_size] += 1
+    n = len(words)
+    expected = (n / (2 * table_size)) * (n + 2 * table_size - 1)
+    quality = sum(b * (b + 1) / 2 for b in buckets) / expected
+    return quality, max(buckets), buckets.count(0) / table_size
+
+def probe_statistics(name, words):
+    # Build a presized hashset with this function and look every word up
+    hs = hashset.from_iterable(words, hash_function=name)
+    for word in words:
+        hs.find(word)
+    return hs.total_probe_length / float(hs.number_of_finds), hs.hash_table_size
+
+def run_hash_benchmarks(dict_file=DEFAULT_DICT_FILE):
+    print("=" * 60)
+    print("Hash Function Benchmark")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = sorted(set(load_dictionary(dict_file)))
+    print("Loaded " + str(len(words)) + " distinct words\n")
+
+    config.verbose = 0
+    # The probe and collision counts are part of the results
+    config.stats_collector = "basic"
+    config.init_size = 7
+
+    results = {}
+    for name, function in hash_functions.HASH_FUNCTIONS.items():
+        print("Benchmarking " + name + "...")
+        ns_per_hash = time_hash_function(function, words)
+        avg_probe_length, table_size = probe_statistics(name, words)
+        quality, max_bucket, empty_fraction = bucket_distribution(function, words, table_size)
+        results[name] = {
+            'ns_per_hash': ns_per_hash,
+            'quality': quality,
+            'max_bucket': max_bucket,
+            'empty_fraction': empty_fraction,
+            'avg_probe_length': avg_probe_length
+        }
+        print("  ns/hash: " + str(round(ns_per_hash, 1)))
+        print("  Distribution quality (1.0 is ideal): " + str(round(quality, 4)))
+        print("  Largest bucket: " + str(max_bucket))
+        print("  Empty buckets: " + str(round(100 * empty_fraction, 2)) + "%")
+        print("  Avg probe length: " + str(round(avg_probe_length, 3)))
+        print()
+
+    print("=" * 60)
+    print("\nFunction     ns/hash    Quality    Avg probe length")
+    print("-" * 60)
+    for name, data in sorted(results.items(), key=lambda item: item[1]['ns_per_hash']):
+        print(name.ljust(12) + " " + str(round(data['ns_per_hash'], 1)).ljust(10) + " "
+              + str(round(data['quality'], 4)).ljust(10) + " " + str(round(data['avg_probe_length'], 3)))
+    print("=" * 60)
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_hash_benchmarks(sys.argv[1])
+    else:
+        run_hash_benchmarks()
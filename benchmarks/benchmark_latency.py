@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+from hashset import hashset
+from benchmark import load_dictionary, percentile, timing_only
+import config
+
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+def online_workload(hs, words):
+    # Grow the set one word at a time, looking up the previous word after
+    # each insert, and record how long every single operation took
+    latencies = []
+    clock = time.perf_counter_ns
+    previous = words[0]
+    for word in words:
+        start = clock()
+        hs.insert(word)
+        middle = clock()
+        hs.find(previous)
+        end = clock()
+        latencies.append(middle - start)
+        latencies.append(end - middle)
+        previous = word
+    return latencies
+
+def run_latency_benchmarks(dict_file=DEFAULT_DICT_FILE):
+    print("=" * 60)
+    print("Resize Latency Benchmark")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = load_dictionary(dict_file)
+    print("Loaded " + str(len(words)) + " words\n")
+
+    timing_only()
+    config.init_size = 7
+
+    results = {}
+    for name, incremental in [("blocking", False), ("incremental", True)]:
+        print("Benchmarking " + name + " resize...")
+        hs = hashset(incremental=incremental)
+        latencies = online_workload(hs, words)
+        total = sum(latencies)
+        latencies.sort()
+        results[name] = {
+            'total': total / 1e9,
+            'p50': percentile(latencies, 0.50),
+            'p99': percentile(latencies, 0.99),
+            'p999': percentile(latencies, 0.999),
+            'max': latencies[-1],
+            'rehashes': hs.number_of_rehashes
+        }
+        print("  Total time: " + str(round(results[name]['total'], 4)) + "s")
+        print("  p50 latency: " + str(results[name]['p50']) + "ns")
+        print("  p99 latency: " + str(results[name]['p99']) + "ns")
+        print("  p99.9 latency: " + str(results[name]['p999']) + "ns")
+        print("  Worst single operation: " + str(round(results[name]['max'] / 1e6, 3)) + "ms")
+        print("  Rehashes: " + str(hs.number_of_rehashes))
+        print()
+
+    print("=" * 60)
+    speedup = results['blocking']['max'] / float(results['incremental']['max'])
+    print("Worst-case latency reduced " + str(round(speedup, 1)) + "x by incremental resizing")
+    print("=" * 60)
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_latency_benchmarks(sys.argv[1])
+    else:
+        run_latency_benchmarks()
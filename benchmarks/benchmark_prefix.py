@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+import time
+from bstree import bstree
+from benchmark import load_dictionary, timing_only
+
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+def full_scan(tree, prefix):
+    # Walk every value in order and keep those with the prefix
+    return [word for word in tree if word.startswith(prefix)]
+
+def pruned(tree, prefix):
+    return list(tree.prefix(prefix))
+
+def time_queries(query, tree, prefixes):
+    # Returns (seconds, total matches) for running query on every prefix
+    matches = 0
+    start = time.perf_counter()
+    for prefix in prefixes:
+        matches += len(query(tree, prefix))
+    return time.perf_counter() - start, matches
+
+def run_prefix_benchmarks(dict_file=DEFAULT_DICT_FILE, queries=20):
+    print("=" * 60)
+    print("Prefix Query Benchmark (pruned vs full scan)")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = load_dictionary(dict_file)
+    print("Loaded " + str(len(words)) + " words\n")
+
+    timing_only()
+    tree = bstree()
+    tree.insert_many(words)
+
+    rng = random.Random(42)
+    sample = rng.sample(words, queries)
+
+    results = {}
+    for length in [1, 2, 3, 5]:
+        prefixes = [word[:length] for word in sample]
+        print("Prefix length " + str(length) + " (" + str(queries) + " queries)...")
+        scan_time, scan_matches = time_queries(full_scan, tree, prefixes)
+        pruned_time, pruned_matches = time_queries(pruned, tree, prefixes)
+        if scan_matches != pruned_matches:
+            print("  Error: pruned query found " + str(pruned_matches) + " words, full scan " + str(scan_matches))
+
+        results[length] = {
+            'scan': scan_time,
+            'pruned': pruned_time,
+            'matches': pruned_matches,
+            'speedup': scan_time / pruned_time
+        }
+        print("  Matches per query: " + str(round(pruned_matches / float(queries), 1)))
+        print("  Full scan: " + str(round(scan_time, 4)) + "s")
+        print("  Pruned prefix(): " + str(round(pruned_time, 6)) + "s")
+        print("  Speedup: " + str(round(results[length]['speedup'], 1)) + "x")
+        print()
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_prefix_benchmarks(sys.argv[1])
+    else:
+        run_prefix_benchmarks()
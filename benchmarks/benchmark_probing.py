@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+from hashset import hashset
+from benchmark import load_dictionary
+import config
+import probing
+
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+def probe_workload(hs, words):
+    # Time a batch of finds and return (seconds, collisions, average probe length)
+    collisions_before = hs.number_of_collisions
+    probes_before = hs.total_probe_length
+    start = time.perf_counter()
+    for word in words:
+        hs.find(word)
+    elapsed = time.perf_counter() - start
+    return (elapsed, hs.number_of_collisions - collisions_before,
+            (hs.total_probe_length - probes_before) / float(len(words)))
+
+def run_probing_benchmarks(dict_file=DEFAULT_DICT_FILE):
+    print("=" * 60)
+    print("Probing Strategy Benchmark")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = load_dictionary(dict_file)
+    word_set = set(words)
+    # Misses: reversed dictionary words that are not words themselves
+    misses = [word[::-1] for word in words if word[::-1] not in word_set]
+    print("Loaded " + str(len(words)) + " words, " + str(len(misses)) + " misses\n")
+
+    config.verbose = 0
+    # The probe and collision counts are part of the results
+    config.stats_collector = "basic"
+    config.init_size = 7
+
+    results = {}
+    for name in probing.PROBING_STRATEGIES:
+        print("Benchmarking " + name + "...")
+        hs = hashset(probing=name)
+        start = time.perf_counter()
+        hs.insert_many(words)
+        insert_time = time.perf_counter() - start
+        insert_collisions = hs.number_of_collisions
+
+        hit_time, hit_collisions, hit_probe_length = probe_workload(hs, words)
+        miss_time, miss_collisions, miss_probe_length = probe_workload(hs, misses)
+
+        results[name] = {
+            'insert': insert_time,
+            'insert_collisions': insert_collisions,
+            'hit': hit_time,
+            'hit_probe_length': hit_probe_length,
+            'miss': miss_time,
+            'miss_probe_length': miss_probe_length,
+            'load_factor': hs.number_of_values / hs.hash_table_size
+        }
+        print("  Insert time: " + str(round(insert_time, 6)) + "s")
+        print("  Collisions (insert): " + str(insert_collisions))
+        print("  Find time (hits): " + str(round(hit_time, 6)) + "s")
+        print("  Avg probe length (hits): " + str(round(hit_probe_length, 3)))
+        print("  Find time (misses): " + str(round(miss_time, 6)) + "s")
+        print("  Avg probe length (misses): " + str(round(miss_probe_length, 3)))
+        print("  Load factor: " + str(round(results[name]['load_factor'], 2)))
+        print()
+
+    print("=" * 60)
+    print("\nStrategy     Insert (s)   Hit probes   Miss probes")
+    print("-" * 60)
+    for name, data in results.items():
+        print(name.ljust(12) + " " + str(round(data['insert'], 4)).ljust(12) + " "
+              + str(round(data['hit_probe_length'], 3)).ljust(12) + " "
+              + str(round(data['miss_probe_length'], 3)))
+    print("=" * 60)
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_probing_benchmarks(sys.argv[1])
+    else:
+        run_probing_benchmarks()
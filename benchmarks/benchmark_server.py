@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import random
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from speller_client import spell_client
+from benchmark import load_dictionary
+from benchmark_latency import percentile
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+DEFAULT_DICT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry', 'dict')
+
+def start_server(dict_file, socket_path):
+    # Run speller_server.py in its own process and wait until it listens
+    server = subprocess.Popen([sys.executable, os.path.join(SRC_DIR, 'speller_server.py'),
+                               '-d', dict_file, '-u', socket_path],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    while not os.path.exists(socket_path):
+        if server.poll() is not None:
+            raise RuntimeError("speller_server.py exited with status " + str(server.returncode))
+        time.sleep(0.05)
+    return server
+
+def client_workload(socket_path, batches, latencies):
+    # Send every batch over one connection, recording each round trip in ns
+    client = spell_client(socket_path)
+    for batch in batches:
+        start = time.perf_counter_ns()
+        client.check_words(batch)
+        latencies.append(time.perf_counter_ns() - start)
+    client.close()
+
+def run_server_benchmarks(dict_file=DEFAULT_DICT_FILE, requests_per_client=200, batch_size=100):
+    print("=" * 60)
+    print("Spellcheck Daemon Benchmark (concurrent clients)")
+    print("=" * 60)
+
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    words = load_dictionary(dict_file)
+    print("Loaded " + str(len(words)) + " words")
+    print(str(requests_per_client) + " requests of " + str(batch_size) + " words per client\n")
+
+    rng = random.Random(42)
+    socket_path = os.path.join(tempfile.mkdtemp(), 'speller.sock')
+    server = start_server(dict_file, socket_path)
+
+    results = {}
+    try:
+        for clients in [1, 4, 16]:
+            print("Benchmarking " + str(clients) + " concurrent clients...")
+            # Half dictionary words, half misspellings
+            batches = [[[word if rng.random() < 0.5 else word[::-1] + "q" for word in rng.sample(words, batch_size)]
+                        for _ in range(requests_per_client)] for _ in range(clients)]
+            latencies = []
+            threads = [threading.Thread(target=client_workload, args=(socket_path, client_batches, latencies))
+                       for client_batches in batches]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            latencies.sort()
+
+            results[clients] = {
+                'requests_per_sec': len(latencies) / elapsed,
+                'p50': percentile(latencies, 0.50),
+                'p95': percentile(latencies, 0.95),
+                'p99': percentile(latencies, 0.99)
+            }
+            print("  Requests/sec: " + str(int(results[clients]['requests_per_sec'])))
+            print("  Round trip p50: " + str(round(results[clients]['p50'] / 1e3, 1)) + "us")
+            print("  Round trip p95: " + str(round(results[clients]['p95'] / 1e3, 1)) + "us")
+            print("  Round trip p99: " + str(round(results[clients]['p99'] / 1e3, 1)) + "us")
+            print()
+
+        stats = spell_client(socket_path).stats()
+        print("=" * 60)
+        print("Server-side latency over " + str(stats['requests']) + " requests: p50 "
+              + str(stats['p50_us']) + "us, p95 " + str(stats['p95_us']) + "us, p99 " + str(stats['p99_us']) + "us")
+        print("=" * 60)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_server_benchmarks(sys.argv[1])
+    else:
+        run_server_benchmarks()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import time
+from hashset import hashset
+from suggest import suggester, edit_distance
+from benchmark import timing_only
+import config
+import speller
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'large', 'henry')
+
+def find_misses(words, text_file_name):
+    # The distinct words of the text that are not in the dictionary set
+    with open(text_file_name) as text_file:
+        text_words = [word for line_number, word in speller.tokenize(text_file)]
+    return list(dict.fromkeys(word for word, found in zip(text_words, words.find_many(text_words)) if not found))
+
+def scan_suggest(dictionary, word, max_distance, count):
+    # Compare word against every dictionary word
+    suggestions = []
+    for candidate in dictionary:
+        distance = edit_distance(word, candidate, max_distance)
+        if distance <= max_distance:
+            suggestions.append((distance, abs(len(candidate) - len(word)), candidate))
+    suggestions.sort()
+    return [candidate for distance, length_difference, candidate in suggestions[:count]]
+
+def run_suggest_benchmarks(data_dir=DEFAULT_DATA_DIR, scan_queries=20):
+    print("=" * 60)
+    print("Suggestion Benchmark (symmetric-delete index vs full scan)")
+    print("=" * 60)
+
+    dict_file = os.path.join(data_dir, 'dict')
+    print("\nLoading dictionary: " + os.path.relpath(dict_file))
+    timing_only()
+    words = hashset.from_iterable(speller.read_dictionary_words(dict_file, True))
+    misses = find_misses(words, os.path.join(data_dir, 'infile'))
+    print("Loaded " + str(words.number_of_values) + " words, " + str(len(misses)) + " distinct misspellings\n")
+
+    print("Building suggestion index...")
+    start = time.perf_counter()
+    index = suggester(words)
+    build_time = time.perf_counter() - start
+    print("  Build time: " + str(round(build_time, 4)) + "s")
+    print("  Index keys: " + str(len(index.index)))
+    print()
+
+    print("Suggesting with the index...")
+    start = time.perf_counter()
+    for word in misses:
+        index.suggest(word)
+    index_time = time.perf_counter() - start
+    index_rate = len(misses) / index_time
+    print("  Time (" + str(len(misses)) + " words): " + str(round(index_time, 4)) + "s")
+    print("  Suggestions/sec: " + str(round(index_rate, 1)))
+    print("  Avg candidates checked: " + str(round(index.number_of_candidates / float(len(misses)), 1)))
+    print()
+
+    print("Suggesting with a full scan...")
+    sample = misses[:scan_queries]
+    start = time.perf_counter()
+    for word in sample:
+        if scan_suggest(index.words, word, index.max_distance, config.suggestion_count) != index.suggest(word):
+            print("  Error: index and full scan disagree on " + word)
+    scan_time = time.perf_counter() - start
+    scan_rate = len(sample) / scan_time
+    print("  Time (" + str(len(sample)) + " words): " + str(round(scan_time, 4)) + "s")
+    print("  Suggestions/sec: " + str(round(scan_rate, 1)))
+    print()
+
+    print("=" * 60)
+    print("Index is " + str(round(index_rate / scan_rate, 1)) + "x faster than a full scan")
+    print("=" * 60)
+
+    return {
+        'build': build_time,
+        'index_rate': index_rate,
+        'scan_rate': scan_rate
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_suggest_benchmarks(sys.argv[1])
+    else:
+        run_suggest_benchmarks()
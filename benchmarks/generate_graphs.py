@@ -4,10 +4,12 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import matplotlib.pyplot as plt
+import json
 import time
 from bstree import bstree
 from hashset import hashset
 import config
+from benchmark import DEFAULT_RESULTS_FILE
 
 def benchmark_varying_sizes():
     """Benchmark data structures with varying input sizes"""
@@ -52,6 +54,54 @@ def benchmark_varying_sizes():
     
     return sizes, bstree_insert_times, hashset_insert_times, bstree_find_times, hashset_find_times
 
+def memory_by_size(results_file):
+    """Read (keys, memory) points per set type from a benchmark.py results file"""
+    with open(results_file) as f:
+        results = json.load(f)
+    series = {}
+    for dataset in results['datasets'].values():
+        for name, structure in dataset['structures'].items():
+            if 'memory' in structure:
+                series.setdefault(name, []).append((dataset['keys'], structure['memory']))
+    for points in series.values():
+        points.sort(key=lambda point: point[0])
+    return series
+
+def generate_memory_graph(output_dir, results_file=DEFAULT_RESULTS_FILE):
+    """Plot retained memory and bytes per key against the number of keys"""
+    if not os.path.exists(results_file):
+        print(f"Skipped memory graph: no {results_file} (run benchmark.py first)")
+        return
+    series = memory_by_size(results_file)
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    for name, points in series.items():
+        keys = [number_of_keys for number_of_keys, memory in points]
+        ax1.plot(keys, [memory['retained_bytes'] / 1e6 for number_of_keys, memory in points],
+                 marker='o', label=name, linewidth=2)
+        ax2.plot(keys, [memory['bytes_per_key'] for number_of_keys, memory in points],
+                 marker='o', label=name, linewidth=2)
+    ax1.set_xscale('log')
+    ax1.set_yscale('log')
+    ax1.set_xlabel('Number of Keys', fontsize=11)
+    ax1.set_ylabel('Retained Memory (MB)', fontsize=11)
+    ax1.set_title('Memory vs Size', fontsize=12, fontweight='bold')
+    ax1.legend(fontsize=9)
+    ax1.grid(True, alpha=0.3)
+
+    ax2.set_xscale('log')
+    ax2.set_xlabel('Number of Keys', fontsize=11)
+    ax2.set_ylabel('Bytes per Key', fontsize=11)
+    ax2.set_title('Bytes per Key (including table slack)', fontsize=12, fontweight='bold')
+    ax2.legend(fontsize=9)
+    ax2.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    memory_path = os.path.join(output_dir, 'memory_vs_size.png')
+    plt.savefig(memory_path, dpi=300)
+    print(f"Saved: {memory_path}")
+    plt.close()
+
 def generate_performance_graphs():
     """Generate performance comparison graphs"""
     print("Generating performance graphs...")
@@ -116,6 +166,8 @@ def generate_performance_graphs():
     plt.savefig(combined_path, dpi=300)
     print(f"Saved: {combined_path}")
     plt.close()
+
+    generate_memory_graph(output_dir)
     
     print(f"\nAll graphs saved to: {output_dir}")
 
@@ -8,16 +8,64 @@ echo "=== Testing BSTree ==="
 cd tests && python3 test_bstree.py
 echo ""
 
+echo "=== Testing AVLTree ==="
+python3 test_avltree.py
+echo ""
+
 echo "=== Testing HashSet ==="
 python3 test_hashset.py
 echo ""
 
+echo "=== Testing CompactHashSet ==="
+python3 test_compact_hashset.py
+echo ""
+
+echo "=== Testing ConcurrentHashSet ==="
+python3 test_concurrent_hashset.py
+echo ""
+
+echo "=== Testing Bloom Filter ==="
+python3 test_bloom_filter.py
+echo ""
+
+echo "=== Testing Lookup Cache ==="
+python3 test_lookup_cache.py
+echo ""
+
+echo "=== Testing Stats Collectors ==="
+python3 test_stats_collectors.py
+echo ""
+
+echo "=== Testing Speller ==="
+python3 test_speller.py
+echo ""
+
+echo "=== Testing Server ==="
+python3 test_server.py
+echo ""
+
+echo "=== Testing Suggestions ==="
+python3 test_suggest.py
+echo ""
+
 echo "=== Running Spell Checker (HashSet) ==="
 cd ../src && python3 speller_hashset.py -d ../data/simple/1/dict ../data/simple/1/infile
 echo ""
 
+echo "=== Running Spell Checker (CompactHashSet) ==="
+python3 speller_compact_hashset.py -d ../data/simple/1/dict ../data/simple/1/infile
+echo ""
+
+echo "=== Running Spell Checker (ConcurrentHashSet) ==="
+python3 speller_concurrent_hashset.py -d ../data/simple/1/dict ../data/simple/1/infile
+echo ""
+
 echo "=== Running Spell Checker (BSTree) ==="
 python3 speller_bstree.py -d ../data/simple/1/dict ../data/simple/1/infile
 echo ""
 
+echo "=== Running Spell Checker (AVLTree) ==="
+python3 speller_avltree.py -d ../data/simple/1/dict ../data/simple/1/infile
+echo ""
+
 echo "All tests completed!"
@@ -0,0 +1,121 @@
+from bstree import bstree, bstree_node
+
+
+class avltree_node(bstree_node):
+    # A tree node that also records the height of its subtree
+    __slots__ = ('height',)
+
+    def __init__(self, value):
+        bstree_node.__init__(self, value)
+        self.height = 1
+
+
+def height_of(node):
+    return node.height if node is not None else 0
+
+
+class avltree(bstree):
+    # Self-balancing (AVL) variant of bstree. After each insert the heights
+    # on the path back to the root are updated, and any node whose subtrees
+    # differ in height by more than one is rotated back into balance, so the
+    # height stays below 1.44 log2(n) even for sorted dictionaries.
+    node_type = avltree_node
+
+    def __init__(self, stats=None):
+        bstree.__init__(self, stats)
+        self.number_of_rotations = 0
+
+    def build_balanced(self, values, start, end):
+        # As in bstree, filling in each node's height on the way back up
+        node = bstree.build_balanced(self, values, start, end)
+        if node is not None:
+            self.update_height(node)
+        return node
+
+    def height(self):
+        return height_of(self.root)
+
+    def update_height(self, node):
+        node.height = 1 + max(height_of(node.left), height_of(node.right))
+
+    def rotate_left(self, node):
+        self.number_of_rotations += 1
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self.update_height(node)
+        self.update_height(pivot)
+        return pivot
+
+    def rotate_right(self, node):
+        self.number_of_rotations += 1
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self.update_height(node)
+        self.update_height(pivot)
+        return pivot
+
+    def rebalance(self, node):
+        # Returns the node that now roots this subtree
+        self.update_height(node)
+        balance = height_of(node.left) - height_of(node.right)
+        if balance > 1:
+            # Left-right case needs the left child rotated first
+            if height_of(node.left.left) < height_of(node.left.right):
+                node.left = self.rotate_left(node.left)
+            return self.rotate_right(node)
+        if balance < -1:
+            # Right-left case needs the right child rotated first
+            if height_of(node.right.right) < height_of(node.right.left):
+                node.right = self.rotate_right(node.right)
+            return self.rotate_left(node)
+        return node
+
+    def insert(self, value):
+        if self.root is None:
+            self.stats.descend(0)
+            self.root = avltree_node(value)
+            self.number_of_values += 1
+            return True
+
+        # Walk down as in bstree, remembering the path for the way back up
+        path = []
+        node = self.root
+        while True:
+            if value == node.value:
+                self.stats.descend(len(path) + 1)
+                return False
+            path.append(node)
+            if value < node.value:
+                if node.left is None:
+                    node.left = avltree_node(value)
+                    break
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = avltree_node(value)
+                    break
+                node = node.right
+        self.number_of_values += 1
+        self.stats.descend(len(path))
+
+        # Restore balance from the new leaf's parent upwards. Once a subtree
+        # keeps its old height, nothing above it can have changed.
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            old_height = node.height
+            subtree = self.rebalance(node)
+            if depth == 0:
+                self.root = subtree
+            elif path[depth - 1].left is node:
+                path[depth - 1].left = subtree
+            else:
+                path[depth - 1].right = subtree
+            if subtree.height == old_height:
+                break
+        return True
+
+    def print_stats(self):
+        bstree.print_stats(self)
+        print("The number of rotations: " + str(self.number_of_rotations))
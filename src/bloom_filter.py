@@ -0,0 +1,179 @@
+import math
+import config
+import hash_functions
+
+
+class bloom_filter:
+    # Bit array answering "definitely absent" or "maybe present". The k bit
+    # positions of a key come from one 64-bit hash: position i is
+    # (h1 + i * h2) mod number_of_bits, with h1 and h2 its low and high halves.
+    def __init__(self, capacity, bits_per_key=None, hash_function=None):
+        bits_per_key = bits_per_key or config.bloom_bits_per_key
+        self.hash_function_name = hash_function or config.bloom_hash_function
+        self.hash_function = hash_functions.get_hash_function(self.hash_function_name)
+        self.capacity = max(capacity, 1)
+        self.number_of_bits = (self.capacity * bits_per_key + 7) // 8 * 8
+        # The false-positive rate is lowest with bits_per_key * ln 2 hashes
+        self.number_of_hashes = max(1, round(bits_per_key * math.log(2)))
+        self.bits = bytearray(self.number_of_bits // 8)
+        self.number_of_keys = 0
+
+    @staticmethod
+    def to_key(value):
+        # Hash str and bytes keys alike, as the sets store either
+        if isinstance(value, str):
+            return value.encode()
+        return value
+
+    def hash(self, value):
+        return self.hash_function(self.to_key(value))
+
+    def positions(self, hash_value):
+        number_of_bits = self.number_of_bits
+        position = (hash_value & 0xFFFFFFFF) % number_of_bits
+        # Odd, so never a multiple of the (even) bit count: the k positions differ
+        step = (hash_value >> 32) | 1
+        for _ in range(self.number_of_hashes):
+            yield position
+            position = (position + step) % number_of_bits
+
+    def add_hash(self, hash_value):
+        bits = self.bits
+        for position in self.positions(hash_value):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.number_of_keys += 1
+
+    def add(self, value):
+        self.add_hash(self.hash(value))
+
+    def contains_hash(self, hash_value):
+        # positions() inlined: this runs for every lookup
+        bits = self.bits
+        number_of_bits = self.number_of_bits
+        position = (hash_value & 0xFFFFFFFF) % number_of_bits
+        step = (hash_value >> 32) | 1
+        for _ in range(self.number_of_hashes):
+            if not (bits[position >> 3] >> (position & 7)) & 1:
+                return False
+            position = (position + step) % number_of_bits
+        return True
+
+    def might_contain(self, value):
+        return self.contains_hash(self.hash(value))
+
+    def hash_many(self, values):
+        return hash_functions.hash_many(self.hash_function, [self.to_key(value) for value in values])
+
+    def expected_false_positive_rate(self):
+        # (1 - e^(-kn/m))^k for the keys added so far
+        k = self.number_of_hashes
+        return (1 - math.exp(-k * self.number_of_keys / self.number_of_bits)) ** k
+
+
+class bloom_set:
+    # Front end for any set: a Bloom filter of its values answers most finds
+    # of absent values without touching the set. Built from the values of
+    # the finished set; values inserted later are added to both, and the
+    # filter is rebuilt twice as large once it holds more keys than it was
+    # sized for. Removing a value leaves its bits set, which only makes
+    # false positives more likely.
+    def __init__(self, inner, bits_per_key=None):
+        self.inner = inner
+        self.bits_per_key = bits_per_key or config.bloom_bits_per_key
+        self.number_of_lookups = 0
+        self.number_of_rejections = 0
+        self.number_of_false_positives = 0
+        self.number_of_rebuilds = 0
+        self.rebuild()
+
+    def rebuild(self, capacity=0):
+        values = list(self.inner)
+        self.filter = bloom_filter(max(capacity, len(values)), self.bits_per_key)
+        for hash_value in self.filter.hash_many(values):
+            self.filter.add_hash(hash_value)
+
+    def insert(self, value):
+        if not self.inner.insert(value):
+            return False
+        if self.filter.number_of_keys >= self.filter.capacity:
+            self.rebuild(2 * self.filter.capacity)
+            self.number_of_rebuilds += 1
+        else:
+            self.filter.add(value)
+        return True
+
+    def insert_many(self, values, expected=None):
+        number_inserted = 0
+        for value in values:
+            if self.insert(value):
+                number_inserted += 1
+        return number_inserted
+
+    def inner_method(self, name):
+        # The inner set's method, for the operations not every set type has
+        method = getattr(self.inner, name, None)
+        if method is None:
+            raise TypeError("%s does not support %s()" % (type(self.inner).__name__, name))
+        return method
+
+    # A removed value's bits stay set; it only costs a false positive
+    def remove(self, value):
+        return self.inner_method('remove')(value)
+
+    def discard(self, value):
+        return self.inner_method('discard')(value)
+
+    def find(self, value):
+        self.number_of_lookups += 1
+        if not self.filter.might_contain(value):
+            self.number_of_rejections += 1
+            return False
+        if self.inner.find(value):
+            return True
+        self.number_of_false_positives += 1
+        return False
+
+    def find_many(self, values):
+        # Filter the batch first, then look the survivors up in one batch
+        values = list(values)
+        self.number_of_lookups += len(values)
+        contains_hash = self.filter.contains_hash
+        maybe = [contains_hash(hash_value) for hash_value in self.filter.hash_many(values)]
+        found = iter(self.inner.find_many([value for value, in_filter in zip(values, maybe) if in_filter]))
+        results = []
+        for in_filter in maybe:
+            if not in_filter:
+                self.number_of_rejections += 1
+                results.append(False)
+            elif next(found):
+                results.append(True)
+            else:
+                self.number_of_false_positives += 1
+                results.append(False)
+        return results
+
+    def __iter__(self):
+        return iter(self.inner)
+
+    def print_set(self):
+        self.inner.print_set()
+
+    def print_stats(self):
+        self.inner.print_stats()
+        print("Bloom filter bits: ", self.filter.number_of_bits)
+        print("Bloom filter hashes: ", self.filter.number_of_hashes)
+        print("Bloom filter rebuilds: ", self.number_of_rebuilds)
+        print("Bloom filter lookups: ", self.number_of_lookups)
+        print("Bloom filter rejections: ", self.number_of_rejections)
+        absent = self.number_of_rejections + self.number_of_false_positives
+        if absent == 0:
+            false_positive_rate = 0
+        else:
+            false_positive_rate = self.number_of_false_positives / absent
+        print("Bloom filter false-positive rate: ", false_positive_rate)
+        print("Bloom filter expected false-positive rate: ", self.filter.expected_false_positive_rate())
+        if self.number_of_lookups == 0:
+            probes_saved = 0
+        else:
+            probes_saved = self.number_of_rejections / self.number_of_lookups
+        print("Fraction of lookups that skipped the set: ", probes_saved)
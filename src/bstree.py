@@ -1,115 +1,202 @@
 import config
+import stats_collectors
+
+
+class bstree_node:
+    # One value of the tree; missing children are None
+    __slots__ = ('value', 'left', 'right')
+
+    def __init__(self, value):
+        self.value = value
+        self.left = None
+        self.right = None
+
 
 class bstree:
-    def __init__(self):
+    # Node class created by from_sorted()
+    node_type = bstree_node
+
+    def __init__(self, stats=None):
         self.verbose = config.verbose
-        self.value = None
-        self.left  = None
-        self.right = None
-        self.height = 0
-        self.number_of_comparisons = 0
+        self.root = None
+        self.number_of_values = 0
+        # Each find or insert reports how many nodes it compared against
+        self.stats = stats or stats_collectors.new_collector()
+
+    # The collector's counters, read like attributes of the tree
+    @property
+    def number_of_comparisons(self):
+        # Nodes compared against, over all find or insert operations
+        return self.stats.number_of_comparisons
+
+    @property
+    def number_of_executions(self):
         # Number of find or insert operations
-        self.number_of_executions = 0
+        return self.stats.number_of_executions
+
+    def merged_counters(self):
+        return self.stats.counters()
+
+    def add_counters(self, changes):
+        self.stats.add_counters(changes)
+
+    @classmethod
+    def from_sorted(cls, values, stats=None):
+        # Build a perfectly balanced tree from values in ascending order in
+        # O(n), without calling insert(). Repeated values are dropped; values
+        # out of order raise ValueError.
+        distinct = []
+        for value in values:
+            if distinct and value <= distinct[-1]:
+                if value == distinct[-1]:
+                    continue
+                raise ValueError("from_sorted() needs values in ascending order")
+            distinct.append(value)
 
+        new_tree = cls(stats)
+        new_tree.root = new_tree.build_balanced(distinct, 0, len(distinct))
+        new_tree.number_of_values = len(distinct)
+        return new_tree
+
+    def build_balanced(self, values, start, end):
+        # Subtree holding values[start:end], rooted at the middle value.
+        # Recursion only goes log2(n) levels deep.
+        if start >= end:
+            return None
+        middle = (start + end) // 2
+        node = self.node_type(values[middle])
+        node.left = self.build_balanced(values, start, middle)
+        node.right = self.build_balanced(values, middle + 1, end)
+        return node
 
-        
     def size(self):
-        if self.tree():
-            if self.left:
-                left_size = self.left.size()
-            else:
-                left_size = 0
-            if self.right:
-                right_size = self.right.size()
-            else:
-                right_size = 0
-            return 1 + left_size + right_size
-        return 0
-        
+        return self.number_of_values
+
     def tree(self):
-        # This counts as a tree if it has a field self.value
-        # it should also have sub-trees self.left and self.right
-        return hasattr(self, 'value')
+        # This counts as a tree once it holds a value
+        return self.root is not None
+
+    def height(self):
+        # Number of nodes on the longest root-to-leaf path, found level by level
+        height = 0
+        level = [self.root] if self.root is not None else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        return height
 
     def insert(self, value):
-        self.number_of_executions += 1
-        self.number_of_comparisons += 1
-        if self.tree() and self.value:
+        if self.root is None:
+            self.stats.descend(0)
+            self.root = bstree_node(value)
+            self.number_of_values += 1
+            return True
+
+        node = self.root
+        depth = 0
+        while True:
+            depth += 1
             # Check for duplicates and disallow insertion as we implement Hash Set
-            if self.value == value:
+            if value == node.value:
+                self.stats.descend(depth)
                 return False
-
             # Insert into left sub-tree
-            if value < self.value:
-                # If you hit a base node
-                if not self.left.tree():
-                    self.left = bstree()
-                    self.left.value = value
-                    self.left.left = bstree()
-                    self.left.right = bstree()
+            if value < node.value:
+                if node.left is None:
+                    node.left = bstree_node(value)
+                    self.number_of_values += 1
+                    self.stats.descend(depth)
                     return True
-                # If you hit a regular node
-                return self.left.insert(value)
+                node = node.left
             # Insert into right sub-tree
             else:
-                # If you hit a base node
-                if not self.right.tree():
-                    self.right = bstree()
-                    self.right.value = value
-                    self.right.left = bstree()
-                    self.right.right = bstree()
+                if node.right is None:
+                    node.right = bstree_node(value)
+                    self.number_of_values += 1
+                    self.stats.descend(depth)
                     return True
-                # If you hit a regular node
-                return self.right.insert(value)
-        else:
-            self.left = bstree()
-            self.right = bstree()
-            self.value = value
-            return True
+                node = node.right
+
+    def insert_many(self, values, expected=None):
+        # expected is accepted for compatibility with hashset; a tree needs no presizing
+        number_inserted = 0
+        for value in values:
+            if self.insert(value):
+                number_inserted += 1
+        return number_inserted
 
     def find(self, value):
+        node = self.root
+        depth = 0
+        while node is not None:
+            depth += 1
+            if value == node.value:
+                self.stats.descend(depth)
+                return True
+            elif value < node.value:
+                node = node.left
+            else:
+                node = node.right
+        self.stats.descend(depth)
+        return False
 
-        self.number_of_executions += 1
-        self.number_of_comparisons += 1
+    def find_many(self, values):
+        # Batch form of find(), returning a list of booleans
+        return [self.find(value) for value in values]
 
-        if self.tree() and self.value:
-            if self.value and self.value == value:
-                return True
-            elif self.value and value < self.value:
-                return self.left.find(value)
-            elif self.value and value > self.value:
-                return self.right.find(value)
+    def __iter__(self):
+        # Every value in ascending order
+        return self.range()
 
-        return False
-                    
-    # You can update this if you want
-    def print_set(self):
-       # We will use preorder traversal to print out tree contents
-       tree_contents = []
-       def preorder_traversal(inner_self):
+    def range(self, lo=None, hi=None):
+        # Values v with lo <= v < hi in ascending order; a bound of None is
+        # open. Left subtrees of nodes below lo are never entered, and the
+        # walk stops at the first value reaching hi.
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                if lo is not None and node.value < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if hi is not None and node.value >= hi:
+                    return
+                yield node.value
+                node = node.right
 
-           if inner_self and inner_self.tree():
-               tree_contents.append(str(inner_self.value))
-               preorder_traversal(inner_self.left)
-               preorder_traversal(inner_self.right)
+    def prefix(self, prefix):
+        # Values starting with prefix in ascending order. They all sort at or
+        # after prefix itself, and end at the first value without it.
+        for value in self.range(prefix):
+            if not value.startswith(prefix):
+                return
+            yield value
 
-       preorder_traversal(self)
-       print("These are the contents: " + " ".join(tree_contents))
+    # You can update this if you want
+    def print_set(self):
+        # We will use preorder traversal to print out tree contents
+        tree_contents = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            tree_contents.append(str(node.value))
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+        print("These are the contents: " + " ".join(tree_contents))
 
     def print_stats(self):
-        def find_height(inner_self):
-            if inner_self and inner_self.tree():
-                return 1 + max(find_height(inner_self.left), find_height(inner_self.right))
+        if self.stats.counting:
+            # Division by zero check
+            if self.number_of_executions == 0:
+                average_comparison_per_execution = 0
             else:
-                return 0
-        height = find_height(self)
-
-        # Division by zero check
-        if self.number_of_executions == 0:
-            average_comparison_per_execution = 0
-        else:
-            average_comparison_per_execution =  self.number_of_comparisons / self.number_of_executions
-        print("The average number of comparisons per execution: " + str(average_comparison_per_execution))
-        print("The height of the tree: " + str(height))
-            
-            
+                average_comparison_per_execution =  self.number_of_comparisons / self.number_of_executions
+            print("The average number of comparisons per execution: " + str(average_comparison_per_execution))
+        print("The height of the tree: " + str(self.height()))
+        self.stats.print_stats()
@@ -0,0 +1,152 @@
+from array import array
+import config
+import hash_functions
+from hashset import hashset
+
+# Table slot that holds no entry
+EMPTY = -1
+
+
+class compact_hashset:
+    # Hash set with no per-value Python objects. Values are appended to one
+    # bytearray arena; entry i is arena[offsets[i]:offsets[i + 1]] with its
+    # 64-bit hash in entry_hashes[i], and the hash table itself is an array
+    # of entry numbers probed linearly. A 235K-word dictionary takes a few
+    # MB instead of the tens of MB a list of separate objects needs.
+    supports_bytes_keys = True
+
+    isPrime = hashset.isPrime
+    nextPrime = hashset.nextPrime
+    to_key = hashset.to_key
+    from_iterable = classmethod(hashset.from_iterable.__func__)
+    reserve = hashset.reserve
+    insert_many = hashset.insert_many
+
+    def __init__(self, hash_function=None):
+        self.verbose = config.verbose
+        self.hash_function_name = hash_function or config.hash_function
+        self.hash_function = hash_functions.get_hash_function(self.hash_function_name)
+        self.hash_table_size = config.init_size
+        if not self.isPrime(self.hash_table_size):
+            self.hash_table_size = self.nextPrime(self.hash_table_size)
+        self.hash_table = array('i', [EMPTY]) * self.hash_table_size
+        self.arena = bytearray()
+        self.offsets = array('Q', [0])
+        self.entry_hashes = array('Q')
+        self.number_of_values = 0
+        self.number_of_collisions = 0
+        self.number_of_rehashes = 0
+        self.number_of_accesses = 0
+        self.total_probe_length = 0
+        self.number_of_finds = 0
+
+    def hash(self, string):
+        return self.hash_function(string)
+
+    def entry(self, entry_number):
+        # The bytes of one stored value
+        return bytes(self.arena[self.offsets[entry_number]:self.offsets[entry_number + 1]])
+
+    def probe(self, hash_value, value):
+        # Slot holding value, or the empty slot where it would go, as
+        # (found, slot, probe length)
+        table = self.hash_table
+        table_size = self.hash_table_size
+        entry_hashes = self.entry_hashes
+        hash_index = hash_value % table_size
+        probe_count = 0
+        while True:
+            entry_number = table[hash_index]
+            if entry_number == EMPTY:
+                return False, hash_index, probe_count + 1
+            # Only slice the arena when the cached hashes already match
+            if entry_hashes[entry_number] == hash_value and self.entry(entry_number) == value:
+                return True, hash_index, probe_count + 1
+            self.number_of_collisions += 1
+            probe_count += 1
+            hash_index = (hash_index + 1) % table_size
+
+    def rehash(self, new_table_size=None):
+        # Only the index array is rebuilt; the arena and entry arrays stay put
+        self.number_of_rehashes += 1
+        if new_table_size is None:
+            new_table_size = self.nextPrime(2 * self.hash_table_size)  # Double table and find next prime
+        self.hash_table_size = new_table_size
+        table = array('i', [EMPTY]) * new_table_size
+        for entry_number, hash_value in enumerate(self.entry_hashes):
+            hash_index = hash_value % new_table_size
+            while table[hash_index] != EMPTY:
+                self.number_of_collisions += 1
+                hash_index = (hash_index + 1) % new_table_size
+            table[hash_index] = entry_number
+        self.hash_table = table
+
+    def insert(self, value):
+        value = self.to_key(value)
+        self.number_of_accesses += 1
+        if self.number_of_values / self.hash_table_size >= config.max_load_factor:
+            self.rehash()
+
+        hash_value = self.hash(value)
+        found, hash_index, probe_length = self.probe(hash_value, value)
+        if found:
+            return False
+        self.hash_table[hash_index] = self.number_of_values
+        self.arena += value
+        self.offsets.append(len(self.arena))
+        self.entry_hashes.append(hash_value)
+        self.number_of_values += 1
+        return True
+
+    def find(self, value):
+        value = self.to_key(value)
+        self.number_of_accesses += 1
+        self.number_of_finds += 1
+        found, hash_index, probe_length = self.probe(self.hash(value), value)
+        self.total_probe_length += probe_length
+        return found
+
+    def find_many(self, values):
+        # Look up a batch of values, hashing them all in one go.
+        # Returns a list of booleans, one per value.
+        to_key = self.to_key
+        values = [to_key(value) for value in values]
+        self.number_of_accesses += len(values)
+        self.number_of_finds += len(values)
+        hash_values = hash_functions.hash_many(self.hash_function, values)
+        probe = self.probe
+        results = []
+        for hash_value, value in zip(hash_values, values):
+            found, hash_index, probe_length = probe(hash_value, value)
+            self.total_probe_length += probe_length
+            results.append(found)
+        return results
+
+    def __iter__(self):
+        # Every stored value, as bytes, in insertion order
+        for entry_number in range(self.number_of_values):
+            yield self.entry(entry_number)
+
+    def print_set(self):
+        print("Compact Hash Set: ")
+        for index in range(self.hash_table_size):
+            entry_number = self.hash_table[index]
+            if entry_number != EMPTY:
+                print(f"{index}: {self.entry(entry_number).decode()}")
+            else:
+                print(f"{index}: None")
+
+    def print_stats(self):
+        print("Number of Collisions: ", self.number_of_collisions)
+        print("Number of Rehashes: ", self.number_of_rehashes)
+        if self.number_of_accesses == 0:
+            number_of_collisions_per_access = 0
+        else:
+            number_of_collisions_per_access = self.number_of_collisions / self.number_of_accesses
+        print("Average number of collisions per access: ", number_of_collisions_per_access)
+        if self.number_of_finds == 0:
+            average_probe_length = 0
+        else:
+            average_probe_length = self.total_probe_length / self.number_of_finds
+        print("Average probe length per find: ", average_probe_length)
+        print("Arena size (bytes): ", len(self.arena))
@@ -0,0 +1,237 @@
+import threading
+import config
+import hash_functions
+from hashset import hashset
+
+
+class thread_counters:
+    # Statistics of one thread, only ever updated by that thread
+    __slots__ = ('number_of_accesses', 'number_of_collisions', 'total_probe_length', 'number_of_finds')
+
+    def __init__(self):
+        self.number_of_accesses = 0
+        self.number_of_collisions = 0
+        self.total_probe_length = 0
+        self.number_of_finds = 0
+
+
+class concurrent_hashset:
+    # Hash set that many threads can share. Each slot of the linearly probed
+    # table is None or a (hash_value, key) tuple, so a slot is always read and
+    # written whole. Finds take no lock: they probe whichever table is
+    # published in self.table. Inserts claim an empty slot under one of
+    # lock_stripes locks, chosen by slot number, so writers only wait for each
+    # other when they hit the same stripe. A resize holds every stripe lock,
+    # fills a new table and publishes it with a single assignment; the old
+    # table is never written again, so readers still probing it stay
+    # consistent. Values cannot be removed. Statistics are counted per thread
+    # and added up when read.
+    supports_bytes_keys = True
+
+    isPrime = hashset.isPrime
+    nextPrime = hashset.nextPrime
+    to_key = hashset.to_key
+    # Bulk loading goes through reserve() -> rehash() -> resize(), which
+    # takes every stripe lock
+    from_iterable = classmethod(hashset.from_iterable.__func__)
+    reserve = hashset.reserve
+    insert_many = hashset.insert_many
+
+    def __init__(self, hash_function=None, stripes=None):
+        self.verbose = config.verbose
+        self.hash_function_name = hash_function or config.hash_function
+        self.hash_function = hash_functions.get_hash_function(self.hash_function_name)
+        table_size = config.init_size
+        if not self.isPrime(table_size):
+            table_size = self.nextPrime(table_size)
+        self.table = [None] * table_size
+        self.number_of_stripes = stripes or config.lock_stripes
+        self.locks = [threading.Lock() for _ in range(self.number_of_stripes)]
+        # Values inserted through each stripe, only changed under its lock
+        self.stripe_values = [0] * self.number_of_stripes
+        # Only changed while every stripe lock is held
+        self.number_of_rehashes = 0
+        self.local = threading.local()
+        self.all_counters = []
+        self.counters_lock = threading.Lock()
+
+    def hash(self, string):
+        return self.hash_function(string)
+
+    def counters(self):
+        # This thread's counters, registered on first use so they can be merged
+        counters = getattr(self.local, 'counters', None)
+        if counters is None:
+            counters = self.local.counters = thread_counters()
+            with self.counters_lock:
+                self.all_counters.append(counters)
+        return counters
+
+    def merged(self, name):
+        with self.counters_lock:
+            return sum(getattr(counters, name) for counters in self.all_counters)
+
+    def merged_counters(self):
+        # Every statistics counter, summed over the threads
+        with self.counters_lock:
+            totals = {name: sum(getattr(counters, name) for counters in self.all_counters)
+                      for name in thread_counters.__slots__}
+        totals['number_of_rehashes'] = self.number_of_rehashes
+        return totals
+
+    def add_counters(self, changes):
+        # Add counts made elsewhere, such as by -j worker processes
+        counters = self.counters()
+        for name, change in changes.items():
+            if name == 'number_of_rehashes':
+                self.number_of_rehashes += change
+            else:
+                setattr(counters, name, getattr(counters, name) + change)
+
+    @property
+    def hash_table_size(self):
+        return len(self.table)
+
+    @property
+    def number_of_values(self):
+        return sum(self.stripe_values)
+
+    @property
+    def number_of_accesses(self):
+        return self.merged('number_of_accesses')
+
+    @property
+    def number_of_collisions(self):
+        return self.merged('number_of_collisions')
+
+    @property
+    def total_probe_length(self):
+        return self.merged('total_probe_length')
+
+    @property
+    def number_of_finds(self):
+        return self.merged('number_of_finds')
+
+    def search(self, table, hash_value, value, counters):
+        # Probe table for value. Returns (found, slot, probe length), where
+        # slot holds value or is the empty slot that ended the search.
+        table_size = len(table)
+        hash_index = hash_value % table_size
+        probe_length = 1
+        while True:
+            slot = table[hash_index]
+            if slot is None:
+                return False, hash_index, probe_length
+            if slot[0] == hash_value and slot[1] == value:
+                return True, hash_index, probe_length
+            counters.number_of_collisions += 1
+            probe_length += 1
+            hash_index = (hash_index + 1) % table_size
+
+    def resize(self, table, new_table_size=None):
+        # Replace table by a larger one, unless another thread already has
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            if table is not self.table or (new_table_size is not None and new_table_size <= len(table)):
+                return
+            if new_table_size is None:
+                new_table_size = self.nextPrime(2 * len(table))  # Double table and find next prime
+            new_table = [None] * new_table_size
+            for slot in table:
+                if slot is not None:
+                    hash_index = slot[0] % new_table_size
+                    while new_table[hash_index] is not None:
+                        hash_index = (hash_index + 1) % new_table_size
+                    new_table[hash_index] = slot
+            self.number_of_rehashes += 1
+            # Publish the new table; readers pick it up on their next operation
+            self.table = new_table
+        finally:
+            for lock in reversed(self.locks):
+                lock.release()
+
+    def insert(self, value):
+        value = self.to_key(value)
+        hash_value = self.hash(value)
+        counters = self.counters()
+        counters.number_of_accesses += 1
+        while True:
+            table = self.table
+            if sum(self.stripe_values) >= config.max_load_factor * len(table):
+                self.resize(table)
+                continue
+            found, hash_index, probe_length = self.search(table, hash_value, value, counters)
+            if found:
+                return False
+            stripe = hash_index % self.number_of_stripes
+            with self.locks[stripe]:
+                # A resize may have published a new table, or another writer
+                # taken the slot (perhaps with this same value): probe again
+                if table is self.table and table[hash_index] is None:
+                    table[hash_index] = (hash_value, value)
+                    self.stripe_values[stripe] += 1
+                    return True
+
+    def rehash(self, new_table_size=None):
+        # Resize whichever table is current; a size another thread has
+        # already grown past is ignored by resize()
+        self.resize(self.table, new_table_size)
+
+    def find(self, value):
+        value = self.to_key(value)
+        counters = self.counters()
+        counters.number_of_accesses += 1
+        counters.number_of_finds += 1
+        found, hash_index, probe_length = self.search(self.table, self.hash(value), value, counters)
+        counters.total_probe_length += probe_length
+        return found
+
+    def find_many(self, values):
+        # Look up a batch of values, hashing them all in one go, against one
+        # table snapshot. Returns a list of booleans, one per value.
+        to_key = self.to_key
+        values = [to_key(value) for value in values]
+        counters = self.counters()
+        counters.number_of_accesses += len(values)
+        counters.number_of_finds += len(values)
+        table = self.table
+        search = self.search
+        results = []
+        for hash_value, value in zip(hash_functions.hash_many(self.hash_function, values), values):
+            found, hash_index, probe_length = search(table, hash_value, value, counters)
+            counters.total_probe_length += probe_length
+            results.append(found)
+        return results
+
+    def __iter__(self):
+        # Every stored key of the current table
+        for slot in self.table:
+            if slot is not None:
+                yield slot[1]
+
+    def print_set(self):
+        print("Concurrent Hash Set: ")
+        for index, slot in enumerate(self.table):
+            if slot is not None:
+                print(f"{index}: {slot[1].decode()}")
+            else:
+                print(f"{index}: None")
+
+    def print_stats(self):
+        print("Number of Collisions: ", self.number_of_collisions)
+        print("Number of Rehashes: ", self.number_of_rehashes)
+        number_of_accesses = self.number_of_accesses
+        if number_of_accesses == 0:
+            number_of_collisions_per_access = 0
+        else:
+            number_of_collisions_per_access = self.number_of_collisions / number_of_accesses
+        print("Average number of collisions per access: ", number_of_collisions_per_access)
+        number_of_finds = self.number_of_finds
+        if number_of_finds == 0:
+            average_probe_length = 0
+        else:
+            average_probe_length = self.total_probe_length / number_of_finds
+        print("Average probe length per find: ", average_probe_length)
+        print("Lock stripes: ", self.number_of_stripes)
+        print("Threads with statistics: ", len(self.all_counters))
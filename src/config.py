@@ -2,10 +2,42 @@ from enum import Enum
 
 class SetType(Enum):
     BSTREE = 2,
-    HASH = 3
+    HASH = 3,
+    COMPACT_HASH = 4,
+    AVL_TREE = 5,
+    CONCURRENT_HASH = 6
 
 set_type = SetType.HASH
 prog_name = "speller_hashset.py"
 DEFAULT_DICT_FILE = "sample-dictionary"
 verbose = 0
 init_size = 7
+max_load_factor = 0.7
+hash_function = "fnv1a"
+probing = "linear"
+incremental_rehash = False
+migration_step = 64
+# "tombstone", "backward_shift", or None for backward_shift where the probing allows it
+deletion = None
+# Number of insert locks of the concurrent hash set
+lock_stripes = 16
+# Spelling suggestions (-S): how many to show, the largest edit distance,
+# and how many leading characters of each word the delete index covers
+suggestion_count = 5
+suggestion_distance = 2
+suggestion_prefix_length = 7
+# Front the dictionary set with a Bloom filter (speller -b)
+bloom_filter = False
+# Bloom filter bits per value; 10 gives about 1% false positives
+bloom_bits_per_key = 10
+# The filter is never saved, so Python's salted hash (fastest) is safe for it
+bloom_hash_function = "builtin"
+# Words whose lookups are cached in front of the dictionary set (speller -L); 0 for none
+lookup_cache_capacity = 0
+# Replacement policy of the lookup cache, lru or clock
+lookup_cache_policy = "lru"
+# Stats collector of hashset and bstree: null, basic or detailed; None picks
+# detailed at -vv and above, otherwise basic (speller -q picks null)
+stats_collector = None
+# multiprocessing start method for -j; None uses fork where the platform has it
+parallel_start_method = None
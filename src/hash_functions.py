@@ -0,0 +1,106 @@
+import config
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# All hash functions return 64-bit values so they fit the hash_codes array
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+FNV_OFFSET_BASIS = 14695981039346656037
+FNV_PRIME = 1099511628211
+
+MURMUR_MULTIPLIER = 0xc6a4a7935bd1e995
+MURMUR_SHIFT = 47
+MURMUR_SEED = 0x9747b28c
+
+
+def fnv1a(string):
+    # FNV-1a, masked at every step so hash_value never grows past 64 bits
+    if isinstance(string, str):
+        string = string.encode()
+    hash_value = FNV_OFFSET_BASIS
+    for byte in string:
+        hash_value = ((hash_value ^ byte) * FNV_PRIME) & HASH_MASK
+    return hash_value
+
+
+def murmur(string):
+    # MurmurHash64A: mixes 8 bytes per step instead of one,
+    # so short words only take a couple of multiplies
+    if isinstance(string, str):
+        string = string.encode()
+    length = len(string)
+    hash_value = (MURMUR_SEED ^ (length * MURMUR_MULTIPLIER)) & HASH_MASK
+
+    block_end = length - (length % 8)
+    for start in range(0, block_end, 8):
+        block = int.from_bytes(string[start:start + 8], 'little')
+        block = (block * MURMUR_MULTIPLIER) & HASH_MASK
+        block ^= block >> MURMUR_SHIFT
+        block = (block * MURMUR_MULTIPLIER) & HASH_MASK
+        hash_value ^= block
+        hash_value = (hash_value * MURMUR_MULTIPLIER) & HASH_MASK
+
+    if block_end < length:
+        hash_value ^= int.from_bytes(string[block_end:], 'little')
+        hash_value = (hash_value * MURMUR_MULTIPLIER) & HASH_MASK
+
+    hash_value ^= hash_value >> MURMUR_SHIFT
+    hash_value = (hash_value * MURMUR_MULTIPLIER) & HASH_MASK
+    hash_value ^= hash_value >> MURMUR_SHIFT
+    return hash_value
+
+
+def builtin(string):
+    # Python's own hash; fastest, but salted per process unless PYTHONHASHSEED is set
+    return hash(string) & HASH_MASK
+
+
+def fnv1a_many(strings):
+    # FNV-1a over a whole batch. With NumPy the words are packed into one
+    # zero-padded byte matrix and hashed a column at a time; uint64
+    # arithmetic wraps exactly like the 64-bit mask.
+    strings = [string.encode() if isinstance(string, str) else string for string in strings]
+    if numpy is None or not strings:
+        return [fnv1a(string) for string in strings]
+
+    lengths = numpy.fromiter(map(len, strings), dtype=numpy.int64, count=len(strings))
+    packed = numpy.frombuffer(b"".join(strings), dtype=numpy.uint8)
+    starts = numpy.cumsum(lengths) - lengths
+    rows = numpy.repeat(numpy.arange(len(strings)), lengths)
+    columns = numpy.arange(packed.size) - numpy.repeat(starts, lengths)
+    matrix = numpy.zeros((len(strings), int(lengths.max())), dtype=numpy.uint8)
+    matrix[rows, columns] = packed
+
+    hash_values = numpy.full(len(strings), FNV_OFFSET_BASIS, dtype=numpy.uint64)
+    prime = numpy.uint64(FNV_PRIME)
+    for column in range(matrix.shape[1]):
+        mixed = (hash_values ^ matrix[:, column]) * prime
+        hash_values = numpy.where(column < lengths, mixed, hash_values)
+    return hash_values.tolist()
+
+
+HASH_FUNCTIONS = {
+    "fnv1a": fnv1a,
+    "murmur": murmur,
+    "builtin": builtin,
+}
+
+
+def get_hash_function(name=None):
+    # Look up a hash function by name, defaulting to config.hash_function
+    if name is None:
+        name = config.hash_function
+    if name not in HASH_FUNCTIONS:
+        raise ValueError("Unknown hash function '%s' (choose from %s)"
+                         % (name, ", ".join(HASH_FUNCTIONS)))
+    return HASH_FUNCTIONS[name]
+
+
+def hash_many(function, strings):
+    # Hash a batch of strings, vectorised where the function supports it
+    if function is fnv1a:
+        return fnv1a_many(strings)
+    return [function(string) for string in strings]
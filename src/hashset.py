@@ -1,19 +1,104 @@
+from array import array
+from itertools import islice
+import mmap
+import os
+import struct
+import sys
+import time
 import config
+import hash_functions
+import probing as probing_strategies
+import stats_collectors
+
+# Snapshot file layout (little-endian):
+#   header, hash function name, probing name,
+#   hash_codes (table size x uint64), value lengths (table size x int64, -1 for
+#   an empty slot), then every value's bytes concatenated in slot order
+SNAPSHOT_MAGIC = b'HSET'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<4sIQQqqHH')
+
+# Marks the slot of a deleted value under tombstone deletion
+TOMBSTONE = object()
+DELETION_MODES = ("tombstone", "backward_shift")
 
 
 class hashset:
-    def __init__(self):
+    # Values are stored as UTF-8 bytes, so callers can insert and find
+    # either str or bytes and a dictionary can be loaded without decoding
+    supports_bytes_keys = True
+
+    def __init__(self, hash_function=None, probing=None, incremental=None, deletion=None, stats=None):
         self.verbose = config.verbose
+        self.hash_function_name = hash_function or config.hash_function
+        self.hash_function = hash_functions.get_hash_function(self.hash_function_name)
+        self.probing_name = probing or config.probing
+        self.probe_index = probing_strategies.get_probing_strategy(self.probing_name)
+        self.robin_hood = self.probing_name in probing_strategies.DISPLACEMENT_ORDERED
+        # Backward-shift deletion only works where a run is contiguous (linear
+        # and Robin Hood probing); other strategies leave tombstones behind
+        self.deletion = deletion or config.deletion
+        if self.deletion is None:
+            self.deletion = "backward_shift" if self.probing_name in ("linear", "robin_hood") else "tombstone"
+        if self.deletion not in DELETION_MODES:
+            raise ValueError("Unknown deletion mode '%s' (choose from %s)"
+                             % (self.deletion, ", ".join(DELETION_MODES)))
+        if self.deletion == "backward_shift" and self.probing_name not in ("linear", "robin_hood"):
+            raise ValueError("backward_shift deletion needs linear or robin_hood probing")
+        if self.deletion == "tombstone" and self.robin_hood:
+            raise ValueError("robin_hood probing needs backward_shift deletion")
         self.hash_table_size = config.init_size
         if not self.isPrime(self.hash_table_size):
             self.hash_table_size = self.nextPrime(self.hash_table_size)
         self.hash_table = [None] * self.hash_table_size
+        # Full hash of the value in each slot, so rehash never re-runs hash()
+        # and probes only compare strings when the hashes already match
+        self.hash_codes = array('Q', [0]) * self.hash_table_size
         self.number_of_values = 0
-        self.number_of_collisions = 0
+        self.number_of_tombstones = 0
+        self.number_of_deletions = 0
+        # Incremental resizing keeps the previous table until every slot has
+        # been migrated, moving migration_step slots per insert or find
+        self.incremental = config.incremental_rehash if incremental is None else incremental
+        self.migration_step = config.migration_step
+        self.old_table = None
+        self.old_codes = None
+        self.migration_index = 0
         self.number_of_rehashes = 0
-        self.number_of_accesses = 0
-        self.total_probe_length = 0
-        self.number_of_finds = 0
+        # Collisions, probe lengths and so on go to a stats collector
+        self.stats = stats or stats_collectors.new_collector()
+        # (size, mtime_ns) of the file a loaded snapshot was built from
+        self.source = None
+
+    @classmethod
+    def from_iterable(cls, values, expected=None, **options):
+        # Build a set in one pass, sizing the table up front
+        new_set = cls(**options)
+        new_set.insert_many(values, expected)
+        return new_set
+
+    # The collector's counters, read like attributes of the set
+    @property
+    def number_of_collisions(self):
+        return self.stats.number_of_collisions
+
+    @property
+    def number_of_accesses(self):
+        return self.stats.number_of_accesses
+
+    @property
+    def total_probe_length(self):
+        return self.stats.total_probe_length
+
+    @property
+    def number_of_finds(self):
+        return self.stats.number_of_finds
+
+    def merged_counters(self):
+        return self.stats.counters()
+
+    def add_counters(self, changes):
+        self.stats.add_counters(changes)
 
     # Helper functions for finding prime numbers
     def isPrime(self, n):
@@ -29,170 +114,571 @@ class hashset:
             n = n + 1
         return n
 
+    def to_key(self, value):
+        # Stored form of a value: str is encoded once here rather than in hash()
+        if isinstance(value, str):
+            return value.encode()
+        return value
+
     def hash(self, string):
+        # Hash function, chosen from hash_functions.HASH_FUNCTIONS (FNV-1a by default)
+        return self.hash_function(string)
+
+    def displacement(self, hash_index, hash_value):
+        # How far the value stored at hash_index sits from its home slot
+        return (hash_index - hash_value) % self.hash_table_size
+
+    def probe_insertion(self, hash_value, value):
+        # Returns True if inserted, False if already present,
+        # or None if the probe sequence ran out of slots
+        if self.robin_hood:
+            return self.robin_hood_insertion(hash_value, value, True)
 
-        # Hash function
-        ''' 
-        golden_ratio = (5 ** 0.5 - 1) / 2
-        hash_value = 0
-        for char in string[:10]:
-            hash_value = hash_value * 31 + ord(char)
-
-
-        fractional_part = (hash_value * golden_ratio) % 1
-        hash_index = fractional_part * self.hash_table_size
-        return round(hash_index)
-        '''
-        
-        hash_value = 14695981039346656037  # FNV offset basis
-        for byte in string.encode():
-             hash_value ^= byte
-             hash_value *= 1099511628211  # FNV prime
-        return hash_value
-        
-
-       
-    def linear_probe(self, hash_index, value):
-
-        original_hash_index = hash_index
         probe_count = 0
+        # First tombstone on the probe sequence, reused once we know the
+        # value is not further along
+        tombstone_index = None
 
         while probe_count < self.hash_table_size:
 
-            hash_index = (original_hash_index + probe_count) % self.hash_table_size         
-            #hash_index = (original_hash_index + int(0.5 * probe_count) + int(0.5 * probe_count * probe_count)) % self.hash_table_size
+            hash_index = self.probe_index(hash_value, probe_count, self.hash_table_size)
             #print(f"Probe {probe_count}: checking index {hash_index}, found {self.hash_table[hash_index]}")
 
             # If we find an empty slot
+            if self.hash_table[hash_index] is None:
+                break
+
+            # If the value already exists return
+            elif self.hash_codes[hash_index] == hash_value and self.hash_table[hash_index] == value:
+                self.stats.collisions(probe_count)
+                return False
+
+            elif self.hash_table[hash_index] is TOMBSTONE and tombstone_index is None:
+                tombstone_index = hash_index
+
+            # Continue the probe; every slot passed is a collision
+            probe_count += 1
+
+        else:
+            if tombstone_index is None:
+                # No free slot on this probe sequence
+                self.stats.collisions(probe_count)
+                return None
+
+        self.stats.collisions(probe_count)
+        if tombstone_index is not None:
+            hash_index = tombstone_index
+            self.number_of_tombstones -= 1
+        self.hash_table[hash_index] = value
+        self.hash_codes[hash_index] = hash_value
+        self.number_of_values += 1
+        return True
+
+    def robin_hood_insertion(self, hash_value, value, check_duplicates):
+        # Linear probing where an entry that is further from home than the
+        # current occupant takes its slot, and the occupant moves on instead
+        probe_count = 0
+        slots_visited = 0
+        displaced = False
+        hash_index = hash_value % self.hash_table_size
+
+        while slots_visited < self.hash_table_size:
+
             if self.hash_table[hash_index] is None:
                 self.hash_table[hash_index] = value
+                self.hash_codes[hash_index] = hash_value
                 self.number_of_values += 1
+                self.stats.collisions(slots_visited)
                 return True
 
-            # If the value already exists return
-            elif self.hash_table[hash_index] == value:
+            # Duplicates can only be met before the first swap
+            if (check_duplicates and not displaced and self.hash_codes[hash_index] == hash_value
+                    and self.hash_table[hash_index] == value):
+                self.stats.collisions(slots_visited)
                 return False
 
+            existing_displacement = self.displacement(hash_index, self.hash_codes[hash_index])
+            if existing_displacement < probe_count:
+                value, self.hash_table[hash_index] = self.hash_table[hash_index], value
+                hash_value, self.hash_codes[hash_index] = self.hash_codes[hash_index], hash_value
+                probe_count = existing_displacement
+                displaced = True
 
-            if self.hash_table[hash_index] is not None:
-                self.number_of_collisions += 1
-
-            # Continue the probe
+            hash_index = (hash_index + 1) % self.hash_table_size
             probe_count += 1
+            slots_visited += 1
 
-        # If nothing is found return
-        return False
+        self.stats.collisions(slots_visited)
+        return None
+
+    def rehash_insertion(self, hash_value, value):
+        # Returns False if the probe sequence ran out of slots
+        if self.robin_hood:
+            return self.robin_hood_insertion(hash_value, value, False) is not None
 
-    def rehash_insertion(self, hash_index, value):
-        original_hash_index = hash_index
         probe_count = 0
 
         # Loop the size of the hash table
         while probe_count < self.hash_table_size:
-            #hash_index = (original_hash_index + int(0.5 * probe_count) + int(0.5 * probe_count * probe_count)) % self.hash_table_size
-            hash_index = (original_hash_index + probe_count) % self.hash_table_size
-            #print(f"Probe {probe_count}: checking index {hash_index}, found {self.hash_table[hash_index]}")
+            hash_index = self.probe_index(hash_value, probe_count, self.hash_table_size)
 
             # If empty slot is found insert
             if self.hash_table[hash_index] is None:
                 self.hash_table[hash_index] = value
+                self.hash_codes[hash_index] = hash_value
                 self.number_of_values += 1
-                return
-
+                self.stats.collisions(probe_count)
+                return True
 
             probe_count += 1
-            # Not sure if this increment below should be here
-            self.number_of_collisions += 1
-
 
+        self.stats.collisions(probe_count)
+        return False
 
-    def rehash(self):
+    def rehash(self, new_table_size=None):
 
         self.number_of_rehashes += 1
-        current_table = self.hash_table
-        new_table_size = self.nextPrime(2 * self.hash_table_size)  # Double table and find next prime
-        self.hash_table_size = new_table_size
-        self.hash_table = [None] * new_table_size
-        self.number_of_values = 0
-        # old_number_of_collisions = self.number_of_collisions
+        start = time.perf_counter()
+        old_table_size = self.hash_table_size
+        # Everything stored, including old-table slots an incremental
+        # resize has not migrated yet, as (table, codes, first slot) triples
+        sources = [(self.hash_table, self.hash_codes, 0)]
+        if self.old_table is not None:
+            sources.append((self.old_table, self.old_codes, self.migration_index))
+            self.old_table = None
+            self.old_codes = None
+        if new_table_size is None:
+            new_table_size = self.nextPrime(2 * self.hash_table_size)  # Double table and find next prime
 
         '''Reinsert values into table'''
-        # Reinsert manually instead of generic
-        for old_value in current_table:
-            if old_value is not None:
-                hash_index = self.hash(old_value)
-                self.rehash_insertion(hash_index, old_value)
-                #self.insert(old_value)
+        # Reinsert manually instead of generic, reusing the cached hashes.
+        # Quadratic probing only reaches about half the slots of a prime-sized
+        # table, so if a value finds no slot, grow again and start over.
+        while True:
+            self.hash_table_size = new_table_size
+            self.hash_table = [None] * new_table_size
+            self.hash_codes = array('Q', [0]) * new_table_size
+            self.number_of_values = 0
+            self.number_of_tombstones = 0
+            if all(self.rehash_insertion(hash_value, old_value)
+                   for table, codes, first in sources
+                   for old_value, hash_value in zip(islice(table, first, None), islice(codes, first, None))
+                   if old_value is not None and old_value is not TOMBSTONE):
+                self.stats.rehash(old_table_size, new_table_size, self.number_of_values,
+                                  time.perf_counter() - start)
+                return
+            new_table_size = self.nextPrime(2 * new_table_size)
 
+    def start_migration(self, new_table_size=None):
+        # Incremental resize: allocate the larger table but leave the values
+        # in the old one, where nothing moves (so its probe sequences stay
+        # valid) until migrate() has copied every slot across
+        self.number_of_rehashes += 1
+        start = time.perf_counter()
+        self.old_table = self.hash_table
+        self.old_codes = self.hash_codes
+        self.migration_index = 0
+        if new_table_size is None:
+            new_table_size = self.nextPrime(2 * self.hash_table_size)
+        self.hash_table_size = new_table_size
+        self.hash_table = [None] * self.hash_table_size
+        self.hash_codes = array('Q', [0]) * self.hash_table_size
+        # Tombstones stay behind in the old table
+        self.number_of_tombstones = 0
+        # Only the allocation; the copying is spread over later operations
+        self.stats.rehash(len(self.old_table), new_table_size, self.number_of_values,
+                          time.perf_counter() - start)
+
+    def migrate(self, number_of_slots):
+        # Copy up to number_of_slots old-table slots into the new table
+        old_table = self.old_table
+        old_codes = self.old_codes
+        end = min(self.migration_index + number_of_slots, len(old_table))
+        for index in range(self.migration_index, end):
+            value = old_table[index]
+            if value is not None and value is not TOMBSTONE:
+                # number_of_values already counts it; rehash_insertion counts it again
+                self.number_of_values -= 1
+                if not self.rehash_insertion(old_codes[index], value):
+                    # The probe sequence ran out of slots: rebuild from both tables
+                    self.number_of_values += 1
+                    self.migration_index = index
+                    self.rehash()
+                    return
+        self.migration_index = end
+        if end == len(old_table):
+            self.old_table = None
+            self.old_codes = None
+
+    def finish_migration(self):
+        if self.old_table is not None:
+            self.migrate(len(self.old_table))
 
     def insert(self, value):
 
-        self.number_of_accesses += 1
-        load_factor = self.number_of_values / self.hash_table_size
+        value = self.to_key(value)
+        self.stats.access(1)
+        if self.old_table is not None:
+            self.migrate(self.migration_step)
+        # Tombstones lengthen probes just like values, so they count towards the load
+        load_factor = (self.number_of_values + self.number_of_tombstones) / self.hash_table_size
 
         '''Rehash and Resize if load factor reached'''
 
 
-        if load_factor >= 0.7:
-            self.rehash()
+        if load_factor >= config.max_load_factor:
+            new_table_size = None
+            if self.number_of_values / self.hash_table_size < config.max_load_factor / 2:
+                # Mostly tombstones: purge them without growing the table
+                new_table_size = self.hash_table_size
+            if self.incremental:
+                self.finish_migration()
+                self.start_migration(new_table_size)
+            else:
+                self.rehash(new_table_size)
 
         #self.print_set()
 
-        hash_index = self.hash(value)
-        result = self.linear_probe(hash_index, value)
+        hash_value = self.hash(value)
+        # Values not yet migrated are still only in the old table
+        if self.old_table is not None and self.locate(hash_value, value, self.old_table, self.old_codes) is not None:
+            return False
+        result = self.probe_insertion(hash_value, value)
+        while result is None:
+            self.rehash()
+            result = self.probe_insertion(hash_value, value)
         return result
 
-
+    def reserve(self, number_of_values):
+        # Grow the table once so that number_of_values fit below the load factor
+        new_table_size = self.nextPrime(int(number_of_values / config.max_load_factor) + 1)
+        if new_table_size > self.hash_table_size:
+            self.rehash(new_table_size)
+
+    def insert_many(self, values, expected=None):
+        # Insert every value, presizing from expected (or len(values) if known).
+        # Returns the number of values that were not already in the set.
+        if expected is None and hasattr(values, '__len__'):
+            expected = len(values)
+        if expected:
+            self.reserve(self.number_of_values + expected)
+
+        number_inserted = 0
+        for value in values:
+            if self.insert(value):
+                number_inserted += 1
+        return number_inserted
 
     def find(self, value):
 
-        self.number_of_accesses += 1
-        self.number_of_finds += 1
+        value = self.to_key(value)
+        self.stats.access(1, 1)
+        if self.old_table is not None:
+            self.migrate(self.migration_step)
+
+        hash_value = self.hash(value)
+        return self.lookup(hash_value, value)
+
+    def find_many(self, values):
+        # Look up a batch of values, hashing them all in one go.
+        # Returns a list of booleans, one per value.
+        to_key = self.to_key
+        values = [to_key(value) for value in values]
+        self.stats.access(len(values), len(values))
+        if self.old_table is not None:
+            self.migrate(self.migration_step * len(values))
+
+        hash_values = hash_functions.hash_many(self.hash_function, values)
+        lookup = self.lookup
+        return [lookup(hash_value, value) for hash_value, value in zip(hash_values, values)]
+
+    def __iter__(self):
+        # Every stored key, including old-table slots not migrated yet
+        for value in self.hash_table:
+            if value is not None and value is not TOMBSTONE:
+                yield value
+        if self.old_table is not None:
+            for value in islice(self.old_table, self.migration_index, None):
+                if value is not None and value is not TOMBSTONE:
+                    yield value
+
+    def discard(self, value):
+        # Remove value if present; returns True if it was removed
+        value = self.to_key(value)
+        self.stats.access(1)
+        if self.old_table is not None:
+            self.migrate(self.migration_step)
+
+        hash_value = self.hash(value)
+        # During an incremental resize a migrated value is in both tables
+        removed_old = self.old_table is not None and self.discard_old(hash_value, value)
+        hash_index = self.locate(hash_value, value)
+        if hash_index is None and not removed_old:
+            return False
+
+        self.number_of_values -= 1
+        self.number_of_deletions += 1
+        if hash_index is None:
+            pass
+        elif self.deletion == "tombstone":
+            self.hash_table[hash_index] = TOMBSTONE
+            self.hash_codes[hash_index] = 0
+            self.number_of_tombstones += 1
+        elif self.robin_hood:
+            self.robin_hood_backward_shift(hash_index)
+        else:
+            self.linear_backward_shift(hash_index)
+        return True
 
-        hash_index = self.hash(value)
+    def remove(self, value):
+        # Like discard(), but a missing value is an error
+        if not self.discard(value):
+            raise KeyError(value)
+
+    def discard_old(self, hash_value, value):
+        # Tombstone value's slot in the old table of an incremental resize,
+        # whatever the deletion mode: a backward shift could move an
+        # unmigrated value behind migration_index. The slot keeps its hash
+        # code, so Robin Hood searches still step past it.
+        hash_index = self.locate(hash_value, value, self.old_table, self.old_codes)
+        if hash_index is None:
+            return False
+        self.old_table[hash_index] = TOMBSTONE
+        return True
 
-        '''Collision handling with linear probing'''
-        original_hash_index = hash_index
+    def locate(self, hash_value, value, table=None, codes=None):
+        # Slot holding value in table (the current table by default), or
+        # None. Unlike search() it records no probes, which only finds count.
+        if table is None:
+            table = self.hash_table
+            codes = self.hash_codes
+        table_size = len(table)
         probe_count = 0
+        while probe_count < table_size:
+            hash_index = self.probe_index(hash_value, probe_count, table_size)
+            if table[hash_index] is None:
+                return None
+            if codes[hash_index] == hash_value and table[hash_index] == value:
+                return hash_index
+            if self.robin_hood and (hash_index - codes[hash_index]) % table_size < probe_count:
+                return None
+            probe_count += 1
+        return None
+
+    def linear_backward_shift(self, hash_index):
+        # Empty hash_index, then walk the rest of the run moving back any
+        # value whose home slot is not between the hole and where it sits,
+        # so no probe sequence ever crosses an empty slot
+        size = self.hash_table_size
+        hole = hash_index
+        next_index = hash_index
+        while True:
+            next_index = (next_index + 1) % size
+            if self.hash_table[next_index] is None:
+                break
+            home = self.hash_codes[next_index] % size
+            if (hole < next_index and hole < home <= next_index) or \
+                    (hole > next_index and (home > hole or home <= next_index)):
+                continue
+            self.hash_table[hole] = self.hash_table[next_index]
+            self.hash_codes[hole] = self.hash_codes[next_index]
+            hole = next_index
+        self.hash_table[hole] = None
+        self.hash_codes[hole] = 0
+
+    def robin_hood_backward_shift(self, hash_index):
+        # Shift the following values back one slot until one is already home
+        size = self.hash_table_size
+        hole = hash_index
+        next_index = (hole + 1) % size
+        while (self.hash_table[next_index] is not None
+               and self.displacement(next_index, self.hash_codes[next_index]) > 0):
+            self.hash_table[hole] = self.hash_table[next_index]
+            self.hash_codes[hole] = self.hash_codes[next_index]
+            hole = next_index
+            next_index = (next_index + 1) % size
+        self.hash_table[hole] = None
+        self.hash_codes[hole] = 0
+
+    def lookup(self, hash_value, value):
+        # During an incremental resize a value may still be in the old table
+        if self.search(self.hash_table, self.hash_codes, hash_value, value):
+            return True
+        if self.old_table is not None:
+            return self.search(self.old_table, self.old_codes, hash_value, value)
+        return False
 
-        while probe_count < self.hash_table_size:
+    def search(self, table, codes, hash_value, value):
 
-            hash_index = (original_hash_index + probe_count) % self.hash_table_size
-            #print(f"Probe {probe_count}: checking index {hash_index}, found {self.hash_table[hash_index]}")
+        '''Collision handling with the configured probing strategy'''
+        table_size = len(table)
+        probe_count = 0
+
+        while probe_count < table_size:
+
+            hash_index = self.probe_index(hash_value, probe_count, table_size)
+            #print(f"Probe {probe_count}: checking index {hash_index}, found {table[hash_index]}")
 
             # stop early if empty slot is found
-            if self.hash_table[hash_index] is None:
-                self.total_probe_length += (probe_count + 1)
+            if table[hash_index] is None:
+                self.stats.probe(probe_count + 1)
                 return False
 
-            if self.hash_table[hash_index] == value:
-                self.total_probe_length += (probe_count + 1)
+            if codes[hash_index] == hash_value and table[hash_index] == value:
+                self.stats.probe(probe_count + 1)
                 return True
 
-            # Count collision when slot is occupied but not a match
-            if self.hash_table[hash_index] is not None:
-                self.number_of_collisions += 1
+            # Under Robin Hood the value would have displaced anything closer
+            # to its home slot, so meeting one ends an unsuccessful search
+            if self.robin_hood and (hash_index - codes[hash_index]) % table_size < probe_count:
+                self.stats.probe(probe_count + 1)
+                return False
 
+            # Slot occupied but not a match: a collision
             probe_count += 1
 
-        self.total_probe_length += (probe_count + 1)
+        self.stats.probe(probe_count + 1)
         return False
 
+    def save(self, path, source=None):
+        # Write the table to path as a snapshot that load() can map back in
+        # without rehashing. source is an optional (size, mtime_ns) pair
+        # describing the file the set was built from.
+        if self.hash_function_name == "builtin":
+            raise ValueError("builtin hash values are salted per process and cannot be saved")
+        self.finish_migration()
+        if self.number_of_tombstones:
+            # Snapshots have no tombstone marker; purge them at the current size
+            self.rehash(self.hash_table_size)
+        source_size, source_mtime = source if source is not None else (-1, -1)
+        hash_function_name = self.hash_function_name.encode()
+        probing_name = self.probing_name.encode()
+
+        lengths = array('q', [-1]) * self.hash_table_size
+        for index, value in enumerate(self.hash_table):
+            if value is not None:
+                lengths[index] = len(value)
+        hash_codes = array('Q', self.hash_codes)
+        if sys.byteorder != 'little':
+            lengths.byteswap()
+            hash_codes.byteswap()
+
+        # Write beside the target and rename, so readers never see a partial file
+        temporary_path = path + ".tmp"
+        with open(temporary_path, 'wb') as snapshot:
+            snapshot.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                                self.hash_table_size, self.number_of_values,
+                                                source_size, source_mtime,
+                                                len(hash_function_name), len(probing_name)))
+            snapshot.write(hash_function_name)
+            snapshot.write(probing_name)
+            snapshot.write(hash_codes.tobytes())
+            snapshot.write(lengths.tobytes())
+            snapshot.write(b"".join(value for value in self.hash_table if value is not None))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        # Rebuild a set from a snapshot written by save(). The file is
+        # memory-mapped and values are sliced out in slot order, so nothing
+        # is rehashed. The saved source is available as the set's source.
+        with open(path, 'rb') as snapshot, \
+                mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < SNAPSHOT_HEADER.size:
+                raise ValueError("'%s' is not a hashset snapshot" % path)
+            (magic, version, table_size, number_of_values, source_size, source_mtime,
+             hash_function_length, probing_length) = SNAPSHOT_HEADER.unpack_from(mapped)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError("'%s' is not a hashset snapshot" % path)
+            if version != SNAPSHOT_VERSION:
+                raise ValueError("'%s' has snapshot version %d, expected %d"
+                                 % (path, version, SNAPSHOT_VERSION))
+
+            position = SNAPSHOT_HEADER.size
+            hash_function_name = mapped[position:position + hash_function_length].decode()
+            position += hash_function_length
+            probing_name = mapped[position:position + probing_length].decode()
+            position += probing_length
+
+            hash_codes = array('Q')
+            hash_codes.frombytes(mapped[position:position + 8 * table_size])
+            position += 8 * table_size
+            lengths = array('q')
+            lengths.frombytes(mapped[position:position + 8 * table_size])
+            position += 8 * table_size
+            if sys.byteorder != 'little':
+                hash_codes.byteswap()
+                lengths.byteswap()
+
+            hash_table = [None] * table_size
+            for index, length in enumerate(lengths):
+                if length >= 0:
+                    hash_table[index] = mapped[position:position + length]
+                    position += length
+            if position != len(mapped):
+                raise ValueError("'%s' is a truncated or corrupt snapshot" % path)
+
+        new_set = cls(hash_function=hash_function_name, probing=probing_name)
+        new_set.hash_table_size = table_size
+        new_set.hash_table = hash_table
+        new_set.hash_codes = hash_codes
+        new_set.number_of_values = number_of_values
+        new_set.source = (source_size, source_mtime) if source_size >= 0 else None
+        return new_set
+
     def print_set(self):
+        self.finish_migration()
         print("Hash Set: ")
         for index in range(self.hash_table_size):
             value = self.hash_table[index]
-            if value is not None:
-                print(f"{index}: {value}")
+            if value is TOMBSTONE:
+                print(f"{index}: <deleted>")
+            elif value is not None:
+                print(f"{index}: {value.decode()}")
             else:
                 print(f"{index}: None")
 
+    def longest_cluster(self):
+        # Longest run of occupied slots (tombstones included), wrapping
+        # around the end of the table
+        occupied = [value is not None for value in self.hash_table]
+        if all(occupied):
+            return len(occupied)
+        # Start just after an empty slot so no run is split by the wrap
+        start = occupied.index(False) + 1
+        longest = run = 0
+        for is_occupied in occupied[start:] + occupied[:start]:
+            run = run + 1 if is_occupied else 0
+            longest = max(longest, run)
+        return longest
+
     def print_stats(self):
-        print("Number of Collisions: ", self.number_of_collisions)
+        print("Probing strategy: ", self.probing_name)
+        if self.stats.counting:
+            print("Number of Collisions: ", self.number_of_collisions)
         print("Number of Rehashes: ", self.number_of_rehashes)
-        if self.number_of_accesses == 0:
-            number_of_collisions_per_access = 0
-        else:
-            number_of_collisions_per_access = self.number_of_collisions / self.number_of_accesses
-        print("Average number of collisions per access: ", number_of_collisions_per_access)
-
+        if self.stats.counting:
+            if self.number_of_accesses == 0:
+                number_of_collisions_per_access = 0
+            else:
+                number_of_collisions_per_access = self.number_of_collisions / self.number_of_accesses
+            print("Average number of collisions per access: ", number_of_collisions_per_access)
+            if self.number_of_finds == 0:
+                average_probe_length = 0
+            else:
+                average_probe_length = self.total_probe_length / self.number_of_finds
+            print("Average probe length per find: ", average_probe_length)
+        if self.number_of_deletions > 0:
+            print("Deletion mode: ", self.deletion)
+            print("Number of Deletions: ", self.number_of_deletions)
+            print("Number of Tombstones: ", self.number_of_tombstones)
+            # Tombstones are probed past like values, so the load probes see
+            # includes them
+            print("Load factor (values only): ", self.number_of_values / self.hash_table_size)
+            print("Load factor (with tombstones): ",
+                  (self.number_of_values + self.number_of_tombstones) / self.hash_table_size)
+        if self.stats.detailed:
+            self.finish_migration()
+            print("Load factor: ", self.number_of_values / self.hash_table_size)
+            print("Longest cluster: ", self.longest_cluster())
+            self.stats.print_stats()
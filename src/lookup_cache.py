@@ -0,0 +1,203 @@
+from collections import OrderedDict
+import config
+
+
+class lru_table:
+    # Least recently used replacement: an OrderedDict kept in use order
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def get(self, value):
+        # The cached result for value, or None
+        found = self.entries.get(value)
+        if found is not None:
+            self.entries.move_to_end(value)
+        return found
+
+    def put(self, value, found):
+        # Cache a result; returns True if another entry was evicted for it
+        self.entries[value] = found
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            return True
+        return False
+
+    def forget(self, value):
+        self.entries.pop(value, None)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class clock_table:
+    # CLOCK replacement, an approximation of LRU: a hit only sets the entry's
+    # reference bit. To make room the hand sweeps the slots, clearing set
+    # bits, and evicts the first entry whose bit was already clear.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = {}
+        self.values = []
+        self.results = []
+        self.referenced = bytearray(capacity)
+        self.hand = 0
+
+    def get(self, value):
+        slot = self.slots.get(value)
+        if slot is None:
+            return None
+        self.referenced[slot] = 1
+        return self.results[slot]
+
+    def put(self, value, found):
+        slot = self.slots.get(value)
+        if slot is not None:
+            self.results[slot] = found
+            self.referenced[slot] = 1
+            return False
+        if len(self.values) < self.capacity:
+            self.slots[value] = len(self.values)
+            self.values.append(value)
+            self.results.append(found)
+            return False
+        referenced = self.referenced
+        while referenced[self.hand]:
+            referenced[self.hand] = 0
+            self.hand = (self.hand + 1) % self.capacity
+        slot = self.hand
+        evicted = self.values[slot]
+        if evicted is not None:
+            del self.slots[evicted]
+        self.slots[value] = slot
+        self.values[slot] = value
+        self.results[slot] = found
+        self.hand = (slot + 1) % self.capacity
+        return evicted is not None
+
+    def forget(self, value):
+        # Leave the slot in place but holding no value, first in line for eviction
+        slot = self.slots.pop(value, None)
+        if slot is not None:
+            self.values[slot] = None
+            self.referenced[slot] = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+
+CACHE_POLICIES = {
+    "lru": lru_table,
+    "clock": clock_table,
+}
+
+
+class lookup_cache:
+    # Front end for any set: remembers the answers of recent finds, so the
+    # common words of a text are hashed and probed (or walked to) once
+    # rather than every time they appear. Both hits and misses of the set
+    # are cached; inserting or removing a value updates its entry.
+    def __init__(self, inner, capacity=None, policy=None):
+        self.inner = inner
+        self.capacity = config.lookup_cache_capacity if capacity is None else capacity
+        self.policy = config.lookup_cache_policy if policy is None else policy
+        if self.capacity < 1:
+            raise ValueError("Cache capacity must be at least 1, not %d" % self.capacity)
+        if self.policy not in CACHE_POLICIES:
+            raise ValueError("Unknown cache policy '%s' (choose from %s)"
+                             % (self.policy, ", ".join(CACHE_POLICIES)))
+        self.table = CACHE_POLICIES[self.policy](self.capacity)
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+        self.number_of_evictions = 0
+
+    @staticmethod
+    def other_form(value):
+        # str and bytes forms of a value are cached separately
+        if isinstance(value, str):
+            return value.encode()
+        return value.decode()
+
+    def forget(self, value):
+        self.table.forget(value)
+        self.table.forget(self.other_form(value))
+
+    def insert(self, value):
+        self.forget(value)
+        return self.inner.insert(value)
+
+    def insert_many(self, values, expected=None):
+        number_inserted = 0
+        for value in values:
+            if self.insert(value):
+                number_inserted += 1
+        return number_inserted
+
+    def inner_method(self, name):
+        # The inner set's method, for the operations not every set type has
+        method = getattr(self.inner, name, None)
+        if method is None:
+            raise TypeError("%s does not support %s()" % (type(self.inner).__name__, name))
+        return method
+
+    def remove(self, value):
+        remove = self.inner_method('remove')
+        self.forget(value)
+        return remove(value)
+
+    def discard(self, value):
+        discard = self.inner_method('discard')
+        self.forget(value)
+        return discard(value)
+
+    def find(self, value):
+        found = self.table.get(value)
+        if found is not None:
+            self.number_of_hits += 1
+            return found
+        self.number_of_misses += 1
+        found = self.inner.find(value)
+        if self.table.put(value, found):
+            self.number_of_evictions += 1
+        return found
+
+    def find_many(self, values):
+        # Answer what the cache can, then look the rest up in one batch. A
+        # value repeated within the batch is only looked up once.
+        values = list(values)
+        results = []
+        pending = {}
+        get = self.table.get
+        for index, value in enumerate(values):
+            found = get(value)
+            if found is None:
+                pending.setdefault(value, []).append(index)
+            results.append(found)
+        self.number_of_misses += len(pending)
+        self.number_of_hits += len(values) - len(pending)
+        if pending:
+            put = self.table.put
+            for value, found in zip(pending, self.inner.find_many(list(pending))):
+                for index in pending[value]:
+                    results[index] = found
+                if put(value, found):
+                    self.number_of_evictions += 1
+        return results
+
+    def __iter__(self):
+        return iter(self.inner)
+
+    def print_set(self):
+        self.inner.print_set()
+
+    def print_stats(self):
+        self.inner.print_stats()
+        print("Lookup cache (%s) capacity: " % self.policy, self.capacity)
+        print("Lookup cache hits: ", self.number_of_hits)
+        print("Lookup cache misses: ", self.number_of_misses)
+        print("Lookup cache evictions: ", self.number_of_evictions)
+        number_of_lookups = self.number_of_hits + self.number_of_misses
+        if number_of_lookups == 0:
+            hit_rate = 0
+        else:
+            hit_rate = self.number_of_hits / number_of_lookups
+        print("Lookup cache hit rate: ", hit_rate)
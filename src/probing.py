@@ -0,0 +1,40 @@
+import config
+
+# Each strategy maps (hash value, probe number, table size) to the slot to try next.
+
+
+def linear(hash_value, probe_count, table_size):
+    return (hash_value + probe_count) % table_size
+
+
+def quadratic(hash_value, probe_count, table_size):
+    # Triangular numbers: 0, 1, 3, 6, ... from the home slot
+    return (hash_value + (probe_count * (probe_count + 1)) // 2) % table_size
+
+
+def double_hashing(hash_value, probe_count, table_size):
+    # Step size from the high half of the hash; never 0, and with a prime
+    # table size every step visits every slot
+    step = 1 + (hash_value >> 32) % max(table_size - 1, 1)
+    return (hash_value + probe_count * step) % table_size
+
+
+PROBING_STRATEGIES = {
+    "linear": linear,
+    "quadratic": quadratic,
+    "double": double_hashing,
+    # Robin Hood probes linearly but keeps each run ordered by displacement
+    "robin_hood": linear,
+}
+
+DISPLACEMENT_ORDERED = {"robin_hood"}
+
+
+def get_probing_strategy(name=None):
+    # Look up a probing strategy by name, defaulting to config.probing
+    if name is None:
+        name = config.probing
+    if name not in PROBING_STRATEGIES:
+        raise ValueError("Unknown probing strategy '%s' (choose from %s)"
+                         % (name, ", ".join(PROBING_STRATEGIES)))
+    return PROBING_STRATEGIES[name]
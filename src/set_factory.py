@@ -1,9 +1,35 @@
+from avltree import avltree
+from bloom_filter import bloom_set
 from bstree import bstree
+from compact_hashset import compact_hashset
+from concurrent_hashset import concurrent_hashset
 from hashset import hashset
+from lookup_cache import lookup_cache
 import config
     
 def initialise_set():
     if (config.set_type == config.SetType.BSTREE):
         return bstree()
+    elif (config.set_type == config.SetType.AVL_TREE):
+        return avltree()
+    elif (config.set_type == config.SetType.COMPACT_HASH):
+        return compact_hashset()
+    elif (config.set_type == config.SetType.CONCURRENT_HASH):
+        return concurrent_hashset()
     else:
         return hashset()
+
+def load_set(path):
+    # Load a snapshot of the configured set type, or None if it has no snapshot format
+    if (config.set_type == config.SetType.HASH):
+        return hashset.load(path)
+    return None
+
+def add_front_ends(words):
+    # Wrap a finished set in the front ends switched on in config
+    if (config.bloom_filter):
+        words = bloom_set(words)
+    # Outermost, so repeated words are answered before any other layer
+    if (config.lookup_cache_capacity > 0):
+        words = lookup_cache(words)
+    return words
@@ -1,8 +1,22 @@
+from collections import deque
+import concurrent.futures
 import getopt
+import glob
+import io
+from itertools import islice
+import mmap
+import multiprocessing
+import os
 import sys
 import config
+import hash_functions
+import probing
+import re
 import set_factory
+import stats_collectors
 import string
+import suggest
+import time
 
 set_type = config.set_type
 prog_name = config.prog_name
@@ -11,84 +25,391 @@ DEFAULT_DICT_FILE = config.DEFAULT_DICT_FILE
 # reading words from a file
 
 WORD_SIZE = 50
-line_count = 0
-first_word_on_line = True
-
-def init_get_next_lower_word():
-    global line_count
-    line_count = 0
-    global first_word_on_line
-    first_word_on_line = True
-
-def get_next_lower_word(source):
-    # reads next word from source.
-    # A word consists of a sequence of alphabetic characters.
-    # Returns the word, or NULL if no further words can be found.
-    # Converts upper-case letters to lower-case.
-    #
-    word = ''
-    done= False
-    word_len= 0;
-    global first_word_on_line
-    global line_count
-    global WORD_SIZE
-    # on seeing a '\n', need to increment line_count at the *next* word,
-    # even if the '\n' terminated *this* word,
-    # so that line-numbers are reported correctly
-    while (not done):
-        ch = source.read(1)
-        if(word_len >= WORD_SIZE):
-            max_word_size = WORD_SIZE - 1
-            sys.stderr.write("Cannot handle words longer than %d characters" % max_word_size)
-            sys.exit(4);
- 
-        if not ch:
-            break
+# Number of text words looked up together through find_many()
+CHECK_CHUNK_SIZE = 4096
+# Largest slice of the text file handed to one worker with -j
+PARALLEL_CHUNK_BYTES = 1 << 22
+# A word is a run of alphabetic characters (letters, but not digits or '_');
+# see word_matches() for the characters it matches that are not alphabetic
+WORD_PATTERN = re.compile(r'[^\W\d_]+')
+# For ASCII files the same words can be found directly in the raw bytes
+ASCII_WORD_PATTERN = re.compile(rb'[A-Za-z]+')
+NON_ASCII_PATTERN = re.compile(rb'[\x80-\xff]')
+
+def word_too_long():
+    max_word_size = WORD_SIZE - 1
+    sys.stderr.write("Cannot handle words longer than %d characters" % max_word_size)
+    sys.exit(4);
 
-        if (ch.isalpha()):
-            # || ch=='-') ?
-            if (first_word_on_line):
-                line_count = line_count + 1
-                first_word_on_line= False
-            word_len = word_len + 1
-            word += ch.lower()
+def word_matches(line):
+    # Generator of (start, word) for each word of line. WORD_PATTERN also
+    # matches the numeric characters that str.isalpha() rejects ('²', '½',
+    # 'Ⅷ'), so the rare match holding one is split around them.
+    for match in WORD_PATTERN.finditer(line):
+        word = match.group()
+        if word.isalpha():
+            yield (match.start(), word)
+            continue
+        run_start = None
+        for offset, character in enumerate(word + " "):
+            if character.isalpha():
+                if run_start is None:
+                    run_start = offset
+            elif run_start is not None:
+                yield (match.start() + run_start, word[run_start:offset])
+                run_start = None
+
+def tokenize(source):
+    # Generator of (line_number, word) pairs from source.
+    # A word consists of a sequence of alphabetic characters and is
+    # converted to lower-case; line numbers start at 1.
+    # The file is read a buffered line at a time and each line is split
+    # with one regular expression call instead of one read per character.
+    find_words = WORD_PATTERN.findall
+    for line_number, line in enumerate(source, 1):
+        # Only non-ASCII lines can hold characters WORD_PATTERN gets wrong
+        if line.isascii():
+            words = find_words(line)
         else:
-            # non-alphabetic
-            if (word_len > 0):
-                # non-alphabetic terminates the word
-                # word[word_len]= 0
-                done= True
-      
-            if (ch == '\n'):
-                # Can't just add one to line count,
-                # since last word on line might be reported
-                if (first_word_on_line): # already seen one '\n'
-                    line_count = line_count + 1
-                first_word_on_line= True
-        
-    if (word_len):
-        return word
-        
+            words = [word for start, word in word_matches(line)]
+        for word in words:
+            if (len(word) >= WORD_SIZE):
+                word_too_long()
+            yield (line_number, word.lower())
+
+def read_words(source):
+    # Generator over every word in source, without line numbers
+    for line_number, word in tokenize(source):
+        yield word
+
+def read_dictionary_words(dict_file_name, bytes_keys):
+    # Generator over the words of a dictionary file. ASCII files are mapped
+    # into memory and scanned as raw bytes, so no text decoding happens and,
+    # when bytes_keys is set, no str objects are built at all.
+    # Other files go through tokenize() so word boundaries stay the same.
+    with open(dict_file_name, 'rb') as dict_file:
+        if os.fstat(dict_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(dict_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if NON_ASCII_PATTERN.search(mapped) is None:
+                for match in ASCII_WORD_PATTERN.finditer(mapped):
+                    if (match.end() - match.start() >= WORD_SIZE):
+                        word_too_long()
+                    word = match.group().lower()
+                    yield word if bytes_keys else word.decode()
+                return
+
+    with open(dict_file_name) as dict_file:
+        yield from read_words(dict_file)
+
+def read_chunks(numbered_words, chunk_size=CHECK_CHUNK_SIZE):
+    # Group (line_number, word) pairs into lists of at most chunk_size.
+    # When a word is too long the words read before it are still given out,
+    # so their misses are reported before the exit, as they were word by word.
+    chunk = []
+    try:
+        for numbered_word in numbered_words:
+            chunk.append(numbered_word)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    except SystemExit:
+        if chunk:
+            yield chunk
+        raise
+    if chunk:
+        yield chunk
+
+def find_misses(words, chunk, suggester=None):
+    # Look a chunk of (line_number, word) pairs up in one batch. Returns the
+    # misses as (line_number, word, suggestions) triples; suggestions is None
+    # without a suggester.
+    found = words.find_many([word for line_number, word in chunk])
+    return [(line_number, word, suggester.suggest(word) if suggester else None)
+            for (line_number, word), in_set in zip(chunk, found) if not in_set]
+
+def print_miss(line_number, word, suggestions, prefix=""):
+    # prefix names the file in batch mode
+    if (suggestions):
+        print("%s%d: %s -> %s\n" % (prefix, line_number, word, ", ".join(suggestions)));
     else:
+        print("%s%d: %s\n" % (prefix, line_number, word));
+
+def check_chunk(words, chunk, suggester=None, prefix=""):
+    # Report the misses of a chunk, followed by their closest dictionary
+    # words if a suggester is given. Returns the number of misses.
+    misses = find_misses(words, chunk, suggester)
+    for miss in misses:
+        print_miss(*miss, prefix=prefix)
+    return len(misses)
+
+def check_text(words, source, suggester=None, prefix=""):
+    # Check every word of source in chunks. Returns the number of words
+    # checked and the number of misses.
+    number_of_words = 0
+    number_of_misses = 0
+    for chunk in read_chunks(tokenize(source)):
+        number_of_words += len(chunk)
+        number_of_misses += check_chunk(words, chunk, suggester, prefix)
+    return number_of_words, number_of_misses
+
+def estimate_word_count(file_name, sample_size=65536):
+    # Estimate how many words a file holds from the words in its first block,
+    # so the set can be sized once instead of growing through repeated rehashes
+    file_size = os.path.getsize(file_name)
+    with open(file_name) as sample_file:
+        sample = sample_file.read(sample_size)
+    if not sample:
+        return 0
+    sample_words = len(WORD_PATTERN.findall(sample))
+    sample_bytes = len(sample.encode())
+    return int(sample_words * file_size / sample_bytes) + 1
+
+def is_sorted(words):
+    # True if every word is no smaller than the one before it
+    return all(previous <= word for previous, word in zip(words, islice(words, 1, None)))
+
+def line_aligned_ranges(file_name, number_of_ranges):
+    # Split a file into at most number_of_ranges (start, end) byte ranges of
+    # about equal size, each starting at the beginning of a line
+    file_size = os.path.getsize(file_name)
+    boundaries = [0]
+    with open(file_name, 'rb') as split_file:
+        for i in range(1, number_of_ranges):
+            # Move to the start of the line after the one holding byte position - 1
+            split_file.seek(max(file_size * i // number_of_ranges, boundaries[-1] + 1) - 1)
+            split_file.readline()
+            position = split_file.tell()
+            if (position >= file_size):
+                break
+            boundaries.append(position)
+    boundaries.append(file_size)
+    return list(zip(boundaries, boundaries[1:]))
+
+def counters(stats_object):
+    # The statistics counters of a set or suggester, by attribute name
+    if hasattr(stats_object, 'merged_counters'):
+        return stats_object.merged_counters()
+    return {name: value for name, value in vars(stats_object).items()
+            if (name.startswith(('number_of_', 'total_')) or name.endswith('_time'))
+            and type(value) in (int, float)}
+
+def set_layers(words):
+    # The set and the front ends wrapped around it, outermost first
+    layers = [words]
+    while (hasattr(layers[-1], 'inner')):
+        layers.append(layers[-1].inner)
+    return layers
+
+def add_counters(stats_object, changes):
+    if hasattr(stats_object, 'add_counters'):
+        return stats_object.add_counters(changes)
+    for name, change in changes.items():
+        setattr(stats_object, name, getattr(stats_object, name) + change)
+
+def init_worker(settings, worker_dict_file_name, worker_cache_file_name, worker_file_name, with_suggester):
+    # Pool initializer for start methods other than fork, where the worker
+    # does not inherit the parent's set: each worker loads the snapshot
+    # named by -c, or builds the set again from the dictionary
+    global worker_words, worker_suggester, file_name
+    for name, value in settings.items():
+        setattr(config, name, value)
+    config.verbose = 0
+    file_name = worker_file_name
+    worker_words = dictionary_set(worker_dict_file_name, worker_cache_file_name, save_cache=False)
+    worker_suggester = suggest.suggester(worker_words) if with_suggester else None
+
+def check_range(byte_range):
+    # Pool task: check one line-aligned byte range of the text file. Returns
+    # its misses with line numbers counted from the start of the range, the
+    # number of lines and words in the range, the counter changes of the set
+    # and suggester, and whether a word that was too long stopped the check.
+    start, end = byte_range
+    with open(file_name, 'rb') as text_file:
+        text_file.seek(start)
+        data = text_file.read(end - start)
+    stats_objects = set_layers(worker_words) + ([worker_suggester] if worker_suggester else [])
+    before = [counters(stats_object) for stats_object in stats_objects]
+    misses = []
+    number_of_words = 0
+    too_long = False
+    try:
+        # Decoded like open(file_name) in the single-process path
+        for chunk in read_chunks(tokenize(io.TextIOWrapper(io.BytesIO(data)))):
+            number_of_words += len(chunk)
+            misses.extend(find_misses(worker_words, chunk, worker_suggester))
+    except SystemExit:
+        # word_too_long() has already reported it
+        too_long = True
+    # A histogram bucket may first appear in this range
+    changes = [{name: value - previous.get(name, 0) for name, value in counters(stats_object).items()}
+               for stats_object, previous in zip(stats_objects, before)]
+    return misses, data.count(b'\n'), number_of_words, changes, too_long
+
+def check_parallel(words, suggester, jobs, prefix=""):
+    # Check the text file in a pool of jobs processes, printing the misses in
+    # their original order, and return the number of words checked and the
+    # number of misses. With fork the workers share the parent's set and
+    # suggester copy-on-write; otherwise init_worker() recreates them.
+    global worker_words, worker_suggester
+    number_of_ranges = max(4 * jobs, os.path.getsize(file_name) // PARALLEL_CHUNK_BYTES + 1)
+    ranges = line_aligned_ranges(file_name, number_of_ranges)
+    start_method = config.parallel_start_method
+    if (start_method == None):
+        start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+    context = multiprocessing.get_context(start_method)
+
+    if (context.get_start_method() == 'fork'):
+        worker_words = words
+        worker_suggester = suggester
+        pool = context.Pool(jobs)
+    else:
+        settings = {name: value for name, value in vars(config).items()
+                    if not name.startswith('__') and not callable(value) and type(value) != type(config)}
+        pool = context.Pool(jobs, init_worker,
+                            (settings, dict_file_name, cache_file_name, file_name, suggester != None))
+
+    stats_objects = set_layers(words) + ([suggester] if suggester else [])
+    number_of_words = 0
+    number_of_misses = 0
+    with pool:
+        line_offset = 0
+        for misses, number_of_lines, range_words, changes, too_long in pool.imap(check_range, ranges):
+            for line_number, word, suggestions in misses:
+                print_miss(line_offset + line_number, word, suggestions, prefix)
+            number_of_words += range_words
+            number_of_misses += len(misses)
+            for stats_object, change in zip(stats_objects, changes):
+                add_counters(stats_object, change)
+            if (too_long):
+                sys.stdout.flush()
+                pool.terminate()
+                sys.exit(4)
+            line_offset += number_of_lines
+    worker_words = None
+    worker_suggester = None
+    return number_of_words, number_of_misses
+
+def directory_files(name):
+    # Every file below directory name, in sorted order
+    file_names = []
+    for root, dirs, files in os.walk(name):
+        dirs.sort()
+        file_names.extend(os.path.join(root, file) for file in sorted(files))
+    return file_names
+
+def expand_text_files(names):
+    # Text files to check for the file, directory and glob pattern arguments.
+    # Directories give every file below them and patterns every matching
+    # path, both in sorted order; other names are kept as they are.
+    # A directory or pattern that gives no files is an error, like a
+    # missing file.
+    file_names = []
+    for name in names:
+        if (os.path.isdir(name)):
+            matches = directory_files(name)
+        elif (not os.path.exists(name) and any(c in name for c in '*?[')):
+            matches = []
+            for path in sorted(glob.glob(name, recursive=True)):
+                if (os.path.isdir(path)):
+                    matches.extend(directory_files(path))
+                else:
+                    matches.append(path)
+        else:
+            matches = [name]
+        if (not matches):
+            sys.stderr.write("No text files match `%s'\n" % name)
+            exit(1)
+        file_names.extend(matches)
+    return file_names
+
+def read_text(name):
+    with open(name) as text_file:
+        return text_file.read()
+
+def text_sources(file_names, threads=0):
+    # Yields (file_name, source) for each file in order. With threads, a
+    # thread pool reads up to that many files ahead into memory while the
+    # current one is being checked.
+    if (threads == 0):
+        for name in file_names:
+            with open(name) as text_file:
+                yield name, text_file
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        names = iter(file_names)
+        pending = deque((name, executor.submit(read_text, name)) for name in islice(names, threads))
+        while pending:
+            name, text = pending.popleft()
+            for next_name in islice(names, 1):
+                pending.append((next_name, executor.submit(read_text, next_name)))
+            yield name, io.StringIO(text.result())
+
+
+def dictionary_source(dict_file_name):
+    # Identifies the dictionary a snapshot was built from
+    dict_stat = os.stat(dict_file_name)
+    return (dict_stat.st_size, dict_stat.st_mtime_ns)
+
+def load_cached_set(cache_file_name, dict_file_name):
+    # Returns the set saved in cache_file_name if it was built from the current
+    # dictionary with the current hash settings, otherwise None
+    if (not os.path.exists(cache_file_name)):
+        return None
+    try:
+        words = set_factory.load_set(cache_file_name)
+    except (OSError, ValueError) as err:
+        sys.stderr.write("Ignoring cache file `%s': %s\n" % (cache_file_name, err))
+        return None
+    if (words == None or words.source != dictionary_source(dict_file_name)
+            or words.hash_function_name != config.hash_function
+            or words.probing_name != config.probing):
         return None
+    return words
+
+def save_cached_set(words, cache_file_name, dict_file_name):
+    if (not hasattr(words, 'save')):
+        sys.stderr.write("Cache files are not supported for %s\n" % type(words).__name__)
+        return
+    try:
+        words.save(cache_file_name, dictionary_source(dict_file_name))
+    except (OSError, ValueError) as err:
+        sys.stderr.write("Could not write cache file `%s': %s\n" % (cache_file_name, err))
 
 
 def usage():
     # reports the usage of the program
     sys.stderr.write(
-          "Usage: %s [-d dictionary] [-s dict_init_size] [-m mode] [-v] [-h] text_file\n" % prog_name)
+          "Usage: %s [-d dictionary] [-s dict_init_size] [-H hash_function] [-P probing] [-c cache_file] [-m mode] [-b] [-L capacity] [-S] [-j jobs] [-t threads] [-q] [-v] [-h] text_file ...\n" % prog_name)
     sys.stderr.write("\ts: set initial dictionary size to arg\n")
+    sys.stderr.write("\tH: hash function for the hash set: %s (default %s)\n"
+                     % (", ".join(hash_functions.HASH_FUNCTIONS), config.hash_function))
+    sys.stderr.write("\tP: probing strategy for the hash set: %s (default %s)\n"
+                     % (", ".join(probing.PROBING_STRATEGIES), config.probing))
     sys.stderr.write("\td: dictionary name (default %s)\n" % DEFAULT_DICT_FILE)
-    sys.stderr.write("\tv: verbose - extra v's increase reporting level\n")
+    sys.stderr.write("\tc: cache file holding a snapshot of the dictionary set,\n"
+                     "\t   reused while the dictionary is unchanged\n")
+    sys.stderr.write("\tb: front the dictionary set with a Bloom filter that rejects most misspellings\n")
+    sys.stderr.write("\tL: cache the lookups of this many recent words (%s replacement)\n"
+                     % config.lookup_cache_policy)
+    sys.stderr.write("\tS: suggest up to %d dictionary words within %d edits of each misspelling\n"
+                     % (config.suggestion_count, config.suggestion_distance))
+    sys.stderr.write("\tj: check the text with this many processes (default 1)\n")
+    sys.stderr.write("\tt: read up to this many text files ahead in a thread pool\n")
+    sys.stderr.write("\tq: quiet - collect and print no usage statistics\n")
+    sys.stderr.write("\tv: verbose - extra v's increase reporting level;\n"
+                     "\t   -vv adds histograms and rehash timings to the usage statistics\n")
     sys.stderr.write("\th: help - output this message\n")
-    sys.stderr.write("\ttext_file: file to spell-check\n")
+    sys.stderr.write("\ttext_file: file to spell-check; with several files, directories\n"
+                     "\t   or glob patterns each miss is prefixed with its file name\n")
     exit(1);
 
 def process_args(args):
     if (len(args) < 1):
         usage ()
     try:
-        opts, other_args = getopt.getopt(args, "s:d:m:vh")
+        opts, other_args = getopt.getopt(args, "s:d:H:P:c:m:bL:Sj:t:qvh")
     except getopt.GetoptError as err:
         print(err)
         usage()
@@ -99,6 +420,43 @@ def process_args(args):
         elif (o == '-d'):
             global dict_file_name
             dict_file_name = a
+        elif (o == '-H'):
+            if a not in hash_functions.HASH_FUNCTIONS:
+                sys.stderr.write("Unknown hash function `%s'\n" % a)
+                usage()
+            config.hash_function = a
+        elif (o == '-P'):
+            if a not in probing.PROBING_STRATEGIES:
+                sys.stderr.write("Unknown probing strategy `%s'\n" % a)
+                usage()
+            config.probing = a
+        elif (o == '-c'):
+            global cache_file_name
+            cache_file_name = a
+        elif (o == '-b'):
+            config.bloom_filter = True
+        elif (o == '-L'):
+            if (not a.isdigit()):
+                sys.stderr.write("The lookup cache capacity must be a non-negative integer\n")
+                usage()
+            config.lookup_cache_capacity = int(a)
+        elif (o == '-S'):
+            global suggest_corrections
+            suggest_corrections = True
+        elif (o == '-j'):
+            global jobs
+            if (not a.isdigit() or int(a) < 1):
+                sys.stderr.write("The number of jobs must be a positive integer\n")
+                usage()
+            jobs = int(a)
+        elif (o == '-t'):
+            global read_threads
+            if (not a.isdigit()):
+                sys.stderr.write("The number of threads must be a non-negative integer\n")
+                usage()
+            read_threads = int(a)
+        elif (o == '-q'):
+            config.stats_collector = "null"
         elif (o == '-v'):
             config.verbose+=1
         elif (o == '-h'):
@@ -111,45 +469,91 @@ def process_args(args):
  
  
     if (len(other_args) > 0):
-        global file_name
-        file_name= other_args[0]
+        global file_names, batch_mode
+        file_names = expand_text_files(other_args)
+        # Name each file in the output unless exactly one plain file was given
+        batch_mode = file_names != other_args[:1]
     else:
         # no file  name given
         usage()
 
-def spelling(args):
+def build_set(dict_file_name):
+    # A new set of the configured type holding the words of dict_file_name
     word_count = 0
+    words = set_factory.initialise_set()
+
+    if (config.verbose > 0):
+        sys.stderr.write("Reading dictionary\n")
+
+    def dictionary_words():
+        nonlocal word_count
+        for word in read_dictionary_words(dict_file_name, getattr(words, 'supports_bytes_keys', False)):
+            word_count = word_count + 1
+            if ((config.verbose > 0) and (word_count % 100 == 0)):
+               sys.stderr.write(".")
+            yield word
+
+    if (hasattr(words, 'from_sorted')):
+        # Inserting a sorted dictionary word by word is a tree's worst
+        # case, so sorted dictionaries are built balanced in one pass
+        dictionary = list(dictionary_words())
+        if (is_sorted(dictionary)):
+            if (config.verbose > 0):
+                sys.stderr.write("\nDictionary is sorted, building a balanced tree")
+            words = type(words).from_sorted(dictionary)
+            new_words = words.size()
+        else:
+            new_words = words.insert_many(dictionary)
+    else:
+        new_words = words.insert_many(dictionary_words(), estimate_word_count(dict_file_name))
+
+    if (config.verbose > 0):
+        sys.stderr.write("\nDictionary read: %d words, %d new\n" % (word_count, new_words))
+    return words
 
+def dictionary_set(dict_file_name, cache_file_name, save_cache=True):
+    # The dictionary set, loaded from cache_file_name while that snapshot is
+    # current, otherwise built (and saved there if save_cache is set), then
+    # wrapped in the front ends switched on in config
+    words = None
+    if (cache_file_name):
+        words = load_cached_set(cache_file_name, dict_file_name)
+        if (words != None and config.verbose > 0):
+            sys.stderr.write("Loaded dictionary from cache file `%s'\n" % cache_file_name)
+
+    if (words == None):
+        words = build_set(dict_file_name)
+        if (cache_file_name and save_cache):
+            save_cached_set(words, cache_file_name, dict_file_name)
+    return set_factory.add_front_ends(words)
+
+
+def spelling(args):
     prog_name = args[0]
     args.pop(0)
     global dict_file_name 
     dict_file_name = DEFAULT_DICT_FILE
+    global cache_file_name
+    cache_file_name = None
+    global suggest_corrections
+    suggest_corrections = False
+    global jobs
+    jobs = 1
+    global read_threads
+    read_threads = 0
     process_args(args)
+    # Fixed here so that -j workers, which run with verbose 0, collect the same
+    config.stats_collector = stats_collectors.collector_name()
     
     if (config.verbose > 0):
         sys.stderr.write("Using dictionary `%s'\n" % dict_file_name)
-        sys.stderr.write("Checking text file `%s'\n" % file_name)
-        
-    dict_file = open(dict_file_name)
-    text_file = open(file_name)
-    
-    words = set_factory.initialise_set()
+
+    for name in file_names:
+        if (not os.path.isfile(name)):
+            sys.stderr.write("Cannot open text file `%s'\n" % name)
+            exit(1)
     
-    if (config.verbose > 0):
-        sys.stderr.write("Reading dictionary\n")
-        
-    init_get_next_lower_word()
-    while True:
-        word = get_next_lower_word (dict_file)
-        if (word == None):
-            break
-        words.insert(word)
-        word_count = word_count + 1
-        if ((config.verbose > 0) and (word_count % 100 == 0)):
-           sys.stderr.write(".")
-           
-    if (config.verbose > 0):
-        sys.stderr.write("\nDictionary read\n")
+    words = dictionary_set(dict_file_name, cache_file_name)
 
     if (config.verbose > 1):
         # call with option -vv to get this
@@ -157,22 +561,34 @@ def spelling(args):
             # call with option -vvv to get this
             words.print_set()
 
-    print("Spellchecking:\n")
+    suggester = None
+    if (suggest_corrections):
+        if (config.verbose > 0):
+            sys.stderr.write("Building suggestion index\n")
+        suggester = suggest.suggester(words)
 
-    init_get_next_lower_word ()
-    while True:
-        word= get_next_lower_word (text_file)
-        if (word == None):
-            break
-        if (not words.find(word)):
-            print("%d: %s\n" % (line_count, word));
+    print("Spellchecking:\n")
 
-    print("Usage statistics:\n");
-    words.print_stats ()
+    global file_name
+    # Processes already read their own part of the file with -j
+    for file_name, source in text_sources(file_names, read_threads if jobs == 1 else 0):
+        if (config.verbose > 0):
+            sys.stderr.write("Checking text file `%s'\n" % file_name)
+        prefix = file_name + ": " if batch_mode else ""
+        start = time.perf_counter()
+        if (jobs > 1):
+            number_of_words, number_of_misses = check_parallel(words, suggester, jobs, prefix)
+        else:
+            number_of_words, number_of_misses = check_text(words, source, suggester, prefix)
+        if (batch_mode):
+            print("%s%d words checked, %d misspelled, %.4f seconds\n"
+                  % (prefix, number_of_words, number_of_misses, time.perf_counter() - start))
 
-    # Now tidy everything up
-    dict_file.close()
-    text_file.close()
+    if (config.stats_collector != "null"):
+        print("Usage statistics:\n");
+        words.print_stats ()
+        if (suggester):
+            suggester.print_stats()
 
 
         
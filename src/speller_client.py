@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import getopt
+import json
+import socket
+import sys
+import speller_server
+
+
+class spell_client:
+    # One connection to a speller_server.py daemon
+    def __init__(self, socket_path=speller_server.DEFAULT_SOCKET):
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(socket_path)
+        self.responses = self.connection.makefile('rb')
+
+    def request(self, request):
+        self.connection.sendall(json.dumps(request).encode() + b"\n")
+        response = json.loads(self.responses.readline())
+        if ("error" in response):
+            raise ValueError(response["error"])
+        return response
+
+    def check_words(self, words):
+        # The misses among words, as {"index", "word"} dictionaries
+        return self.request({"words": list(words)})["misses"]
+
+    def check_text(self, text):
+        # The misses in text, as {"line", "column", "word"} dictionaries
+        return self.request({"text": text})["misses"]
+
+    def stats(self):
+        return self.request({"stats": True})
+
+    def close(self):
+        self.responses.close()
+        self.connection.close()
+
+
+def usage():
+    sys.stderr.write("Usage: speller_client.py [-u socket] [-w word ...] [-s] [-h] [text_file ...]\n")
+    sys.stderr.write("\tu: Unix socket of the server (default %s)\n" % speller_server.DEFAULT_SOCKET)
+    sys.stderr.write("\tw: check the remaining arguments as words instead of files\n")
+    sys.stderr.write("\ts: print the server's request latency percentiles\n")
+    sys.stderr.write("\ttext_file: files to check (standard input if none)\n")
+    exit(1)
+
+def main(args):
+    try:
+        opts, other_args = getopt.getopt(args, "u:wsh")
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+
+    socket_path = speller_server.DEFAULT_SOCKET
+    check_words = False
+    show_stats = False
+    for o, a in opts:
+        if (o == '-u'):
+            socket_path = a
+        elif (o == '-w'):
+            check_words = True
+        elif (o == '-s'):
+            show_stats = True
+        else:
+            usage()
+
+    client = spell_client(socket_path)
+    if (check_words):
+        for miss in client.check_words(other_args):
+            print(miss["word"])
+    elif (other_args or not show_stats):
+        for file_name in other_args or [None]:
+            if (file_name == None):
+                text = sys.stdin.read()
+            else:
+                with open(file_name) as text_file:
+                    text = text_file.read()
+            prefix = file_name + ": " if len(other_args) > 1 else ""
+            for miss in client.check_text(text):
+                print("%s%d: %s\n" % (prefix, miss["line"], miss["word"]))
+    if (show_stats):
+        for name, value in client.stats().items():
+            print("%s: %s" % (name, value))
+    client.close()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
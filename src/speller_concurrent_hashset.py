@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+import speller
+import sys
+import config
+
+config.set_type = config.SetType.CONCURRENT_HASH
+config.prog_name = "speller_concurrent_hashset.py"
+
+if __name__ == "__main__":
+    speller.spelling(sys.argv)
@@ -6,4 +6,5 @@ import config
 config.set_type = config.SetType.HASH
 config.prog_name = "speller_hashset.py"
 
-speller.spelling(sys.argv)
+if __name__ == "__main__":
+    speller.spelling(sys.argv)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+import asyncio
+from collections import deque
+import getopt
+import json
+import os
+import signal
+import sys
+import time
+import config
+import hash_functions
+import probing
+import speller
+
+config.set_type = config.SetType.HASH
+config.prog_name = "speller_server.py"
+
+DEFAULT_SOCKET = "/tmp/speller.sock"
+# Longest request line accepted, in bytes
+MAX_REQUEST_SIZE = 1 << 26
+# Number of recent requests the latency percentiles are taken over
+LATENCY_WINDOW = 100000
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def text_words(text):
+    # Generator of (line_number, column, word) for every word of text, found
+    # and lower-cased as by speller.tokenize(); columns start at 1. Lines
+    # end at universal newlines only, as when tokenize() reads a file:
+    # splitlines() would also split at \f, \v, \x85 and \u2028
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    for line_number, line in enumerate(lines, 1):
+        for start, word in speller.word_matches(line):
+            if (len(word) >= speller.WORD_SIZE):
+                raise ValueError("cannot handle words longer than %d characters" % (speller.WORD_SIZE - 1))
+            yield (line_number, start + 1, word.lower())
+
+
+class spell_server:
+    # Answers check requests against one dictionary set, shared by every
+    # client connection. Requests and responses are JSON objects, one per line:
+    #   {"words": ["teh", "cat"]} -> {"misses": [{"index": 0, "word": "teh"}]}
+    #   {"text": "..."}           -> {"misses": [{"line": 1, "column": 5, "word": "teh"}]}
+    #   {"stats": true}           -> request count and latency percentiles
+    # Malformed requests are answered with {"error": "..."}.
+    def __init__(self, words):
+        self.words = words
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.number_of_requests = 0
+        self.number_of_clients = 0
+        self.loop = None
+        self.stopped = None
+
+    def check_request(self, request):
+        if ("words" in request):
+            batch = [word.lower() for word in request["words"]]
+            found = self.words.find_many(batch)
+            return {"misses": [{"index": index, "word": word}
+                               for index, (word, in_set) in enumerate(zip(batch, found)) if not in_set]}
+        if ("text" in request):
+            positions = list(text_words(request["text"]))
+            found = self.words.find_many([word for line_number, column, word in positions])
+            return {"misses": [{"line": line_number, "column": column, "word": word}
+                               for (line_number, column, word), in_set in zip(positions, found) if not in_set]}
+        raise ValueError("a request needs \"words\", \"text\" or \"stats\"")
+
+    def latency_stats(self):
+        # Latencies of recent check requests, in microseconds
+        stats = {"requests": self.number_of_requests, "clients": self.number_of_clients}
+        if (self.latencies):
+            latencies = sorted(self.latencies)
+            for name, fraction in [("p50", 0.50), ("p95", 0.95), ("p99", 0.99)]:
+                stats[name + "_us"] = percentile(latencies, fraction) / 1000.0
+            stats["max_us"] = latencies[-1] / 1000.0
+        return stats
+
+    def respond(self, line):
+        try:
+            request = json.loads(line)
+            if (not isinstance(request, dict)):
+                raise ValueError("a request must be a JSON object")
+            if (request.get("stats")):
+                return self.latency_stats()
+            start = time.perf_counter_ns()
+            response = self.check_request(request)
+            self.latencies.append(time.perf_counter_ns() - start)
+            self.number_of_requests += 1
+            return response
+        except (ValueError, TypeError, AttributeError) as err:
+            return {"error": str(err)}
+
+    async def handle_client(self, reader, writer):
+        self.number_of_clients += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than MAX_REQUEST_SIZE; the stream cannot recover
+                    writer.write(b'{"error": "request too long"}\n')
+                    break
+                if (not line):
+                    break
+                writer.write(json.dumps(self.respond(line)).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path):
+        # Serve until stop() is called
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        if (os.path.exists(socket_path)):
+            os.remove(socket_path)
+        server = await asyncio.start_unix_server(self.handle_client, socket_path, limit=MAX_REQUEST_SIZE)
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            if (os.path.exists(socket_path)):
+                os.remove(socket_path)
+
+    def stop(self):
+        # Safe to call from any thread or a signal handler
+        if (self.loop != None):
+            self.loop.call_soon_threadsafe(self.stopped.set)
+
+    def print_stats(self):
+        stats = self.latency_stats()
+        print("Requests served: ", stats["requests"])
+        print("Client connections: ", stats["clients"])
+        if ("p50_us" in stats):
+            print("Request latency p50 (us): ", stats["p50_us"])
+            print("Request latency p95 (us): ", stats["p95_us"])
+            print("Request latency p99 (us): ", stats["p99_us"])
+            print("Request latency max (us): ", stats["max_us"])
+
+
+def usage():
+    sys.stderr.write(
+          "Usage: %s [-d dictionary] [-s dict_init_size] [-H hash_function] [-P probing] [-c cache_file] [-u socket] [-v] [-h]\n"
+          % config.prog_name)
+    sys.stderr.write("\td: dictionary name (default %s)\n" % speller.DEFAULT_DICT_FILE)
+    sys.stderr.write("\ts, H, P, c: as for speller_hashset.py\n")
+    sys.stderr.write("\tu: Unix socket to listen on (default %s)\n" % DEFAULT_SOCKET)
+    sys.stderr.write("\tv: verbose\n")
+    sys.stderr.write("\th: help - output this message\n")
+    exit(1)
+
+def main(args):
+    try:
+        opts, other_args = getopt.getopt(args, "s:d:H:P:c:u:vh")
+    except getopt.GetoptError as err:
+        print(err)
+        usage()
+    if (other_args):
+        usage()
+
+    dict_file_name = speller.DEFAULT_DICT_FILE
+    cache_file_name = None
+    socket_path = DEFAULT_SOCKET
+    for o, a in opts:
+        if (o == '-s'):
+            config.init_size = int(a)
+        elif (o == '-d'):
+            dict_file_name = a
+        elif (o == '-H'):
+            if a not in hash_functions.HASH_FUNCTIONS:
+                sys.stderr.write("Unknown hash function `%s'\n" % a)
+                usage()
+            config.hash_function = a
+        elif (o == '-P'):
+            if a not in probing.PROBING_STRATEGIES:
+                sys.stderr.write("Unknown probing strategy `%s'\n" % a)
+                usage()
+            config.probing = a
+        elif (o == '-c'):
+            cache_file_name = a
+        elif (o == '-u'):
+            socket_path = a
+        elif (o == '-v'):
+            config.verbose += 1
+        else:
+            usage()
+
+    # Built once; every connection shares this one set
+    server = spell_server(speller.dictionary_set(dict_file_name, cache_file_name))
+
+    async def run():
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            asyncio.get_running_loop().add_signal_handler(signal_number, server.stop)
+        sys.stderr.write("Listening on `%s'\n" % socket_path)
+        await server.serve(socket_path)
+
+    asyncio.run(run())
+    print("Usage statistics:\n")
+    server.words.print_stats()
+    server.print_stats()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
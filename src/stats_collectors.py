@@ -0,0 +1,178 @@
+import config
+
+# Each set hands its collector one summary per operation (a probe length, a
+# comparison depth, a rehash) instead of bumping counters inside its probe
+# loops. The collector decides what, if anything, to keep.
+
+
+class null_stats:
+    # Keeps nothing, for production runs: the counters read as 0
+    name = "null"
+    counting = False
+    detailed = False
+    number_of_accesses = 0
+    number_of_finds = 0
+    number_of_collisions = 0
+    total_probe_length = 0
+    number_of_executions = 0
+    number_of_comparisons = 0
+
+    def access(self, count, finds=0):
+        pass
+
+    def probe(self, probe_length):
+        pass
+
+    def collisions(self, count):
+        pass
+
+    def descend(self, depth):
+        pass
+
+    def rehash(self, old_size, new_size, number_of_values, seconds):
+        pass
+
+    def counters(self):
+        return {}
+
+    def add_counters(self, changes):
+        pass
+
+    def print_stats(self):
+        pass
+
+
+class basic_stats:
+    # The running totals behind the averages of print_stats()
+    name = "basic"
+    counting = True
+    detailed = False
+    COUNTERS = ('number_of_accesses', 'number_of_finds', 'number_of_collisions', 'total_probe_length',
+                'number_of_executions', 'number_of_comparisons')
+
+    def __init__(self):
+        # Hash set operations, and how many of them were finds
+        self.number_of_accesses = 0
+        self.number_of_finds = 0
+        # Occupied slots probed past, over all hash set operations
+        self.number_of_collisions = 0
+        # Slots looked at by hash set searches
+        self.total_probe_length = 0
+        # Tree operations, and the nodes they compared against
+        self.number_of_executions = 0
+        self.number_of_comparisons = 0
+
+    def access(self, count, finds=0):
+        self.number_of_accesses += count
+        self.number_of_finds += finds
+
+    def probe(self, probe_length):
+        # One hash set search that looked at probe_length slots
+        self.total_probe_length += probe_length
+        self.number_of_collisions += probe_length - 1
+
+    def collisions(self, count):
+        self.number_of_collisions += count
+
+    def descend(self, depth):
+        # One tree find or insert that compared against depth nodes
+        self.number_of_executions += 1
+        self.number_of_comparisons += depth
+
+    def rehash(self, old_size, new_size, number_of_values, seconds):
+        pass
+
+    def counters(self):
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def add_counters(self, changes):
+        # Add counts made elsewhere, such as by -j worker processes
+        for name, change in changes.items():
+            setattr(self, name, getattr(self, name) + change)
+
+    def print_stats(self):
+        # The sets print the averages themselves
+        pass
+
+
+class detailed_stats(basic_stats):
+    # The totals, plus histograms of probe lengths and comparison depths and
+    # the size, load factor and duration of every rehash
+    name = "detailed"
+    detailed = True
+
+    def __init__(self):
+        basic_stats.__init__(self)
+        self.probe_lengths = {}
+        self.depths = {}
+        # (old size, new size, values, seconds) per rehash, in order
+        self.rehashes = []
+
+    def probe(self, probe_length):
+        basic_stats.probe(self, probe_length)
+        self.probe_lengths[probe_length] = self.probe_lengths.get(probe_length, 0) + 1
+
+    def descend(self, depth):
+        basic_stats.descend(self, depth)
+        self.depths[depth] = self.depths.get(depth, 0) + 1
+
+    def rehash(self, old_size, new_size, number_of_values, seconds):
+        self.rehashes.append((old_size, new_size, number_of_values, seconds))
+
+    def counters(self):
+        # Histogram buckets are counters too, named (histogram, bucket)
+        counters = basic_stats.counters(self)
+        for length, count in self.probe_lengths.items():
+            counters[('probe_lengths', length)] = count
+        for depth, count in self.depths.items():
+            counters[('depths', depth)] = count
+        return counters
+
+    def add_counters(self, changes):
+        for name, change in changes.items():
+            if isinstance(name, tuple):
+                if change == 0:
+                    continue
+                histogram = getattr(self, name[0])
+                histogram[name[1]] = histogram.get(name[1], 0) + change
+            else:
+                setattr(self, name, getattr(self, name) + change)
+
+    def print_histogram(self, title, histogram):
+        total = sum(histogram.values())
+        print(title)
+        for bucket in sorted(histogram):
+            print("  %4d: %10d  %6.2f%%" % (bucket, histogram[bucket], 100.0 * histogram[bucket] / total))
+
+    def print_stats(self):
+        if self.probe_lengths:
+            self.print_histogram("Probe length histogram (slots per search):", self.probe_lengths)
+        if self.depths:
+            self.print_histogram("Comparison depth histogram (nodes per find or insert):", self.depths)
+        if self.rehashes:
+            print("Rehashes (size, load factor before -> after, seconds):")
+            for old_size, new_size, number_of_values, seconds in self.rehashes:
+                print("  %d -> %d slots, load %.3f -> %.3f, %.6f s"
+                      % (old_size, new_size, number_of_values / old_size, number_of_values / new_size, seconds))
+
+
+COLLECTORS = {
+    "null": null_stats,
+    "basic": basic_stats,
+    "detailed": detailed_stats,
+}
+
+
+def collector_name():
+    # config.stats_collector, or else the one the verbosity level asks for
+    if config.stats_collector is not None:
+        return config.stats_collector
+    return "detailed" if config.verbose > 1 else "basic"
+
+
+def new_collector(name=None):
+    name = name or collector_name()
+    if name not in COLLECTORS:
+        raise ValueError("Unknown stats collector '%s' (choose from %s)"
+                         % (name, ", ".join(COLLECTORS)))
+    return COLLECTORS[name]()
@@ -0,0 +1,138 @@
+import time
+import config
+
+
+def deletes(word, distance):
+    # Every string made by deleting up to distance characters from word,
+    # including word itself
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+
+def edit_distance(a, b, max_distance):
+    # Optimal string alignment distance (insertions, deletions, substitutions
+    # and adjacent transpositions all cost 1). Gives up as soon as the
+    # distance must exceed max_distance and returns max_distance + 1.
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_minimum = i
+        for j in range(1, len(b) + 1):
+            cost = previous[j - 1] + (a[i - 1] != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+                    and before_previous[j - 2] + 1 < cost):
+                cost = before_previous[j - 2] + 1
+            current[j] = cost
+            if cost < row_minimum:
+                row_minimum = cost
+        if row_minimum > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+class suggester:
+    # Spelling suggestions through a symmetric-delete index. Every word of
+    # the set is filed under each string obtained by deleting up to
+    # max_distance characters from its first prefix_length characters. Two
+    # words within max_distance edits of each other share such a string, so
+    # a query only looks up its own deletes and checks the words found there
+    # with edit_distance(), instead of comparing against every word.
+    def __init__(self, words, max_distance=None, prefix_length=None):
+        self.max_distance = config.suggestion_distance if max_distance is None else max_distance
+        self.prefix_length = prefix_length or config.suggestion_prefix_length
+        # words may be a bstree, hashset or compact_hashset; hash sets hold bytes
+        self.words = [word.decode() if isinstance(word, bytes) else word for word in words]
+        # Delete string -> word number, or a list of word numbers once shared
+        self.index = {}
+        # Misspellings repeat through a text, so answers are kept per word
+        self.cache = {}
+        self.number_of_queries = 0
+        self.number_of_cache_hits = 0
+        self.number_of_candidates = 0
+        self.query_time = 0.0
+
+        prefix_deletes = {}
+        index = self.index
+        for word_number, word in enumerate(self.words):
+            prefix = word[:self.prefix_length]
+            variants = prefix_deletes.get(prefix)
+            if variants is None:
+                variants = prefix_deletes[prefix] = deletes(prefix, self.max_distance)
+            for variant in variants:
+                entry = index.get(variant)
+                if entry is None:
+                    index[variant] = word_number
+                elif type(entry) is int:
+                    index[variant] = [entry, word_number]
+                else:
+                    entry.append(word_number)
+
+    def suggest(self, word, count=None):
+        # Up to count words within max_distance edits of word, closest first
+        if count is None:
+            count = config.suggestion_count
+        start = time.perf_counter()
+        self.number_of_queries += 1
+        suggestions = self.cache.get(word)
+        if suggestions is None:
+            suggestions = self.cache[word] = self.closest(word)
+        else:
+            self.number_of_cache_hits += 1
+        self.query_time += time.perf_counter() - start
+        return [candidate for distance, length_difference, candidate in suggestions[:count]]
+
+    def closest(self, word):
+        # Every indexed word within max_distance edits of word, as sorted
+        # (distance, length difference, word) triples
+        candidates = set()
+        for variant in deletes(word[:self.prefix_length], self.max_distance):
+            entry = self.index.get(variant)
+            if entry is None:
+                continue
+            if type(entry) is int:
+                candidates.add(entry)
+            else:
+                candidates.update(entry)
+
+        suggestions = []
+        max_distance = self.max_distance
+        for word_number in candidates:
+            candidate = self.words[word_number]
+            # Words sharing a prefix can still differ too much in length
+            length_difference = abs(len(candidate) - len(word))
+            if length_difference > max_distance:
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                suggestions.append((distance, length_difference, candidate))
+        suggestions.sort()
+        self.number_of_candidates += len(candidates)
+        return suggestions
+
+    def print_stats(self):
+        print("Suggestion index keys: ", len(self.index))
+        print("Suggestion queries: ", self.number_of_queries)
+        print("Suggestion cache hits: ", self.number_of_cache_hits)
+        index_lookups = self.number_of_queries - self.number_of_cache_hits
+        if index_lookups == 0:
+            average_candidates = 0
+        else:
+            average_candidates = self.number_of_candidates / index_lookups
+        if self.number_of_queries == 0:
+            suggestions_per_second = 0
+        else:
+            suggestions_per_second = self.number_of_queries / self.query_time
+        print("Average candidates per index lookup: ", average_candidates)
+        print("Suggestions per second: ", suggestions_per_second)
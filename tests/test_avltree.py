@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from avltree import avltree
+import config
+
+def check_balanced(node):
+    # Returns the subtree height, or -1 if any node is out of balance or has a stale height
+    if node is None:
+        return 0
+    left = check_balanced(node.left)
+    right = check_balanced(node.right)
+    if left < 0 or right < 0 or abs(left - right) > 1 or node.height != 1 + max(left, right):
+        return -1
+    return 1 + max(left, right)
+
+def test_avltree_insert():
+    config.verbose = 0
+    tree = avltree()
+
+    if not tree.insert("hello"):
+        print("Error: failed to insert hello")
+    if not tree.insert("world"):
+        print("Error: failed to insert world")
+    if tree.insert("hello"):
+        print("Error: duplicate insertion should return False")
+    if not tree.find("hello") or not tree.find("world"):
+        print("Error: hello and world should be found")
+    if tree.find("grape"):
+        print("Error: grape should not be found")
+
+def test_avltree_sorted_insert():
+    config.verbose = 0
+    tree = avltree()
+
+    # Sorted input would give a bstree one level per word
+    words = ["word%06d" % i for i in range(5000)]
+    tree.insert_many(words)
+    if tree.size() != 5000:
+        print("Error: size should be 5000")
+    # A perfectly balanced tree of 5000 nodes has height 13
+    if tree.height() != 13:
+        print("Error: height should be 13 for sorted input, got " + str(tree.height()))
+    if check_balanced(tree.root) != tree.height():
+        print("Error: tree should be balanced with correct node heights")
+    if tree.number_of_rotations == 0:
+        print("Error: sorted input should need rotations")
+    if tree.find_many(["word000000", "word004999", "word005000"]) != [True, True, False]:
+        print("Error: find_many gave wrong results")
+
+def test_avltree_mixed_insert():
+    config.verbose = 0
+    tree = avltree()
+
+    # Both double-rotation cases show up with a zig-zag insertion order
+    words = []
+    for i in range(500):
+        words.append("w%04d" % (i * 7919 % 1000))
+    tree.insert_many(words)
+    if tree.size() != len(set(words)):
+        print("Error: size should match number of distinct words")
+    if check_balanced(tree.root) < 0:
+        print("Error: tree should stay balanced")
+    if not all(tree.find_many(words)):
+        print("Error: every inserted word should be found")
+    if list(tree) != sorted(set(words)):
+        print("Error: iteration should give values in ascending order after rotations")
+
+def test_avltree_from_sorted():
+    config.verbose = 0
+    words = ["word%06d" % i for i in range(1000)]
+    tree = avltree.from_sorted(words)
+
+    if check_balanced(tree.root) != 10:
+        print("Error: from_sorted should give height 10 with correct node heights")
+    # Inserting into a built tree keeps it balanced
+    tree.insert_many(["word%06dx" % i for i in range(0, 1000, 3)])
+    if check_balanced(tree.root) < 0:
+        print("Error: tree should stay balanced after inserts")
+
+if __name__ == "__main__":
+    test_avltree_insert()
+    test_avltree_sorted_insert()
+    test_avltree_mixed_insert()
+    test_avltree_from_sorted()
+    print("All avltree tests passed!")
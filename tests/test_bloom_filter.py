@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bloom_filter import bloom_filter, bloom_set
+from hashset import hashset
+from bstree import bstree
+import config
+
+def test_bloom_filter_no_false_negatives():
+    config.verbose = 0
+    bloom = bloom_filter(1000, 10)
+    words = ["word" + str(i) for i in range(1000)]
+    for word in words:
+        bloom.add(word)
+
+    for word in words:
+        if not bloom.might_contain(word) or not bloom.might_contain(word.encode()):
+            print("Error: " + word + " should be in the filter")
+    false_positives = sum(bloom.might_contain("other" + str(i)) for i in range(10000))
+    if false_positives > 300:
+        print("Error: 10 bits per key should give about 1% false positives, not " + str(false_positives / 100) + "%")
+    if bloom.number_of_hashes != 7:
+        print("Error: 10 bits per key should use 7 hashes")
+
+def test_bloom_set_hashset():
+    config.verbose = 0
+    config.init_size = 509
+    words = bloom_set(hashset.from_iterable(["apple", "banana", "cherry"]))
+
+    if not words.find("banana") or words.find("grape"):
+        print("Error: find should give the inner set's answer")
+    if words.find_many(["cherry", "grape", "apple", "kiwi"]) != [True, False, True, False]:
+        print("Error: find_many should give the inner set's answers in order")
+    if words.number_of_lookups != 6:
+        print("Error: should count 6 lookups")
+    if words.number_of_rejections + words.number_of_false_positives != 3:
+        print("Error: each miss should be a rejection or a false positive")
+    if words.inner.number_of_finds != 3 + words.number_of_false_positives:
+        print("Error: rejected lookups should not reach the set")
+    if not words.discard("banana") or words.discard("banana") or words.find("banana"):
+        print("Error: discard should remove from the inner set once")
+
+def test_bloom_set_bstree_and_growth():
+    config.verbose = 0
+    tree = bstree()
+    tree.insert("pear")
+    words = bloom_set(tree)
+
+    for i in range(100):
+        if not words.insert("fruit" + str(i)):
+            print("Error: fruit" + str(i) + " should be new")
+    if words.insert("pear"):
+        print("Error: duplicate insertion should return False")
+    if words.number_of_rebuilds == 0:
+        print("Error: the filter should have been rebuilt as it filled")
+    for i in range(100):
+        if not words.find("fruit" + str(i)):
+            print("Error: fruit" + str(i) + " should be found after rebuilds")
+    if not words.find("pear"):
+        print("Error: pear should be found")
+    for remove in [words.remove, words.discard]:
+        try:
+            remove("pear")
+            print("Error: removing from a tree should raise TypeError")
+        except TypeError:
+            pass
+
+if __name__ == "__main__":
+    test_bloom_filter_no_false_negatives()
+    test_bloom_set_hashset()
+    test_bloom_set_bstree_and_growth()
+    print("All bloom filter tests passed!")
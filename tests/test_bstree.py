@@ -57,9 +57,80 @@ def test_bstree_empty():
     if tree.find("anything"):
         print("Error: should not find anything in empty tree")
 
+def test_bstree_find_many():
+    config.verbose = 0
+    tree = bstree()
+
+    if tree.insert_many(["apple", "banana", "apple"]) != 2:
+        print("Error: insert_many should report 2 new values")
+    if tree.find_many(["banana", "grape", "apple"]) != [True, False, True]:
+        print("Error: find_many should return one boolean per value")
+
+def test_bstree_sorted_insert():
+    config.verbose = 0
+    tree = bstree()
+
+    # Sorted input builds one level per word, deeper than the recursion limit
+    words = ["word%06d" % i for i in range(5000)]
+    tree.insert_many(words)
+    if tree.size() != 5000:
+        print("Error: size should be 5000")
+    if tree.height() != 5000:
+        print("Error: height should be 5000 for sorted input")
+    if not tree.find("word004999"):
+        print("Error: last word should be found")
+    if tree.find("word005000"):
+        print("Error: word005000 should not be found")
+
+def test_bstree_from_sorted():
+    config.verbose = 0
+    words = ["word%06d" % i for i in range(1000)]
+    tree = bstree.from_sorted(words + ["word000999"])
+
+    if tree.size() != 1000:
+        print("Error: from_sorted should drop the repeated word")
+    # 1000 values fit in a perfectly balanced tree of height 10
+    if tree.height() != 10:
+        print("Error: from_sorted should build a balanced tree")
+    if tree.number_of_executions != 0:
+        print("Error: from_sorted should not call insert")
+    if tree.find_many(["word000000", "word000500", "word000999", "word001000"]) != [True, True, True, False]:
+        print("Error: find_many gave wrong results after from_sorted")
+    if bstree.from_sorted([]).height() != 0:
+        print("Error: from_sorted of nothing should be empty")
+    try:
+        bstree.from_sorted(["b", "a"])
+        print("Error: from_sorted should reject unsorted values")
+    except ValueError:
+        pass
+
+def test_bstree_ordered_queries():
+    config.verbose = 0
+    tree = bstree()
+    tree.insert_many(["mango", "apple", "banana", "band", "cherry", "bandit", "ban", "zebra"])
+
+    if list(tree) != ["apple", "ban", "banana", "band", "bandit", "cherry", "mango", "zebra"]:
+        print("Error: iteration should give values in ascending order")
+    if list(tree.range("b", "c")) != ["ban", "banana", "band", "bandit"]:
+        print("Error: range should include lo and exclude hi")
+    if list(tree.range("banana")) != ["banana", "band", "bandit", "cherry", "mango", "zebra"]:
+        print("Error: range without hi should run to the end")
+    if list(tree.range(hi="band")) != ["apple", "ban", "banana"]:
+        print("Error: range without lo should start at the smallest value")
+    if list(tree.prefix("band")) != ["band", "bandit"]:
+        print("Error: prefix should give band and bandit")
+    if list(tree.prefix("ban")) != ["ban", "banana", "band", "bandit"]:
+        print("Error: prefix should include the prefix itself")
+    if list(tree.prefix("x")) != [] or list(bstree().prefix("a")) != []:
+        print("Error: prefix with no matches should be empty")
+
 if __name__ == "__main__":
     test_bstree_insert()
     test_bstree_find()
     test_bstree_size()
     test_bstree_empty()
+    test_bstree_find_many()
+    test_bstree_sorted_insert()
+    test_bstree_from_sorted()
+    test_bstree_ordered_queries()
     print("All bstree tests passed!")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from compact_hashset import compact_hashset
+import config
+
+def test_compact_hashset_insert():
+    config.verbose = 0
+    config.init_size = 509
+    hs = compact_hashset()
+
+    if not hs.insert("hello"):
+        print("Error: failed to insert hello")
+    if not hs.insert(b"world"):
+        print("Error: failed to insert world")
+    if hs.insert("hello") or hs.insert("world"):
+        print("Error: duplicate insertion should return False")
+    if hs.number_of_values != 2:
+        print("Error: should have 2 values")
+    if bytes(hs.arena) != b"helloworld":
+        print("Error: values should be stored back to back in the arena")
+
+def test_compact_hashset_find():
+    config.verbose = 0
+    config.init_size = 509
+    hs = compact_hashset.from_iterable(["apple", "banana", "cherry"])
+
+    if not hs.find("banana"):
+        print("Error: banana should be found")
+    if hs.find("grape"):
+        print("Error: grape should not be found")
+    if hs.find_many(["cherry", "grape", b"apple"]) != [True, False, True]:
+        print("Error: find_many should return one boolean per value")
+    # Only the finds count towards the probe length, not the inserts
+    if hs.number_of_finds != 5 or hs.total_probe_length != 5:
+        print("Error: probe length should only count the 5 finds, not " + str(hs.total_probe_length))
+
+def test_compact_hashset_rehash():
+    config.verbose = 0
+    config.init_size = 11
+    hs = compact_hashset()
+
+    for i in range(200):
+        hs.insert("item" + str(i))
+    if hs.number_of_rehashes <= 0:
+        print("Error: should have triggered rehash")
+    for i in range(200):
+        if not hs.find("item" + str(i)):
+            print("Error: item" + str(i) + " should be found after rehash")
+    if hs.find("item200"):
+        print("Error: item200 should not be found")
+
+def test_compact_hashset_empty():
+    config.verbose = 0
+    config.init_size = 509
+    hs = compact_hashset()
+
+    if hs.find("anything"):
+        print("Error: should not find anything in empty set")
+    if hs.number_of_values != 0:
+        print("Error: empty set should have 0 values")
+
+def test_compact_hashset_iteration():
+    config.verbose = 0
+    config.init_size = 7
+    hs = compact_hashset.from_iterable(["pear", "fig", "pear", "kiwi"])
+
+    if list(hs) != [b"pear", b"fig", b"kiwi"]:
+        print("Error: iteration should give each value once in insertion order")
+
+if __name__ == "__main__":
+    test_compact_hashset_insert()
+    test_compact_hashset_find()
+    test_compact_hashset_rehash()
+    test_compact_hashset_empty()
+    test_compact_hashset_iteration()
+    print("All compact hashset tests passed!")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import threading
+from concurrent_hashset import concurrent_hashset
+import config
+
+def test_concurrent_hashset_insert_find():
+    config.verbose = 0
+    config.init_size = 509
+    hs = concurrent_hashset()
+
+    if not hs.insert("hello"):
+        print("Error: failed to insert hello")
+    if hs.insert(b"hello"):
+        print("Error: duplicate insertion should return False")
+    if not hs.find("hello"):
+        print("Error: hello should be found")
+    if hs.find("world"):
+        print("Error: world should not be found")
+    if hs.find_many(["hello", "world"]) != [True, False]:
+        print("Error: find_many should return one boolean per value")
+    if hs.number_of_values != 1:
+        print("Error: should have 1 value")
+    hs.add_counters({'number_of_finds': 10})
+    if hs.merged_counters()['number_of_finds'] != 14:
+        print("Error: added counters should be merged with the thread's own")
+
+def test_concurrent_hashset_rehash():
+    config.verbose = 0
+    config.init_size = 11
+    hs = concurrent_hashset(stripes=4)
+
+    for i in range(200):
+        hs.insert("item" + str(i))
+    if hs.number_of_rehashes <= 0:
+        print("Error: should have triggered rehash")
+    for i in range(200):
+        if not hs.find("item" + str(i)):
+            print("Error: item" + str(i) + " should be found after rehash")
+    if sorted(hs) != sorted(("item" + str(i)).encode() for i in range(200)):
+        print("Error: iteration should give every value once")
+
+def test_concurrent_hashset_threaded_inserts():
+    # Threads insert overlapping ranges; each value must be added exactly once
+    config.verbose = 0
+    config.init_size = 11
+    hs = concurrent_hashset(stripes=4)
+    inserted = []
+
+    def writer(start):
+        count = 0
+        for i in range(start, start + 2000):
+            if hs.insert("word" + str(i)):
+                count += 1
+        inserted.append(count)
+
+    threads = [threading.Thread(target=writer, args=(start,)) for start in (0, 500, 1000, 1500)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if sum(inserted) != 3500:
+        print("Error: 3500 distinct values should have been inserted, not " + str(sum(inserted)))
+    if hs.number_of_values != 3500 or len(list(hs)) != 3500:
+        print("Error: set should hold 3500 values")
+    if hs.number_of_accesses != 8000:
+        print("Error: per-thread access counts should add up to 8000")
+    if len(hs.all_counters) != 4:
+        print("Error: each thread should have its own counters")
+
+def test_concurrent_hashset_reads_during_writes():
+    # Values inserted before the readers start are always found, across resizes
+    config.verbose = 0
+    config.init_size = 11
+    hs = concurrent_hashset.from_iterable(["base" + str(i) for i in range(100)])
+    misses = []
+
+    def writer():
+        for i in range(5000):
+            hs.insert("new" + str(i))
+
+    def reader():
+        for _ in range(20):
+            for i in range(100):
+                if not hs.find("base" + str(i)):
+                    misses.append(i)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if misses:
+        print("Error: readers missed " + str(len(misses)) + " values during resizes")
+    if hs.number_of_rehashes <= 0:
+        print("Error: writer should have triggered rehashes")
+    if hs.number_of_finds != 6000:
+        print("Error: per-thread find counts should add up to 6000")
+
+if __name__ == "__main__":
+    test_concurrent_hashset_insert_find()
+    test_concurrent_hashset_rehash()
+    test_concurrent_hashset_threaded_inserts()
+    test_concurrent_hashset_reads_during_writes()
+    print("All concurrent hashset tests passed!")
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 import sys
 import os
+import tempfile
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from hashset import hashset
 import config
+import hash_functions
+import probing
 
 def test_hashset_insert():
     config.verbose = 0
@@ -78,10 +81,321 @@ def test_hashset_empty():
     if hs.number_of_values != 0:
         print("Error: empty hashset should have 0 values")
 
+def test_hashset_insert_many():
+    config.verbose = 0
+    config.init_size = 7
+    hs = hashset()
+
+    words = ["word" + str(i) for i in range(1000)]
+    inserted = hs.insert_many(words + ["word1", "word2"])
+    if inserted != 1000:
+        print("Error: insert_many should report 1000 new values")
+    if hs.number_of_rehashes != 1:
+        print("Error: insert_many should resize the table only once")
+    if not hs.find("word999"):
+        print("Error: word999 should be found")
+
+def test_hashset_from_iterable():
+    config.verbose = 0
+    config.init_size = 7
+    hs = hashset.from_iterable(iter(["apple", "banana", "apple"]), expected=100)
+
+    if hs.number_of_values != 2:
+        print("Error: from_iterable should have 2 values")
+    if hs.hash_table_size < 100 / config.max_load_factor:
+        print("Error: from_iterable should presize from expected")
+    if not hs.find("banana"):
+        print("Error: banana should be found")
+
+def test_hashset_cached_hashes():
+    config.verbose = 0
+    config.init_size = 11
+    hs = hashset()
+
+    for i in range(20):
+        hs.insert("item" + str(i))
+    for index in range(hs.hash_table_size):
+        value = hs.hash_table[index]
+        if value is not None and hs.hash_codes[index] != hs.hash(value):
+            print("Error: cached hash should match hash() of the stored value")
+
+    # Rehashing should reuse the cached hashes rather than calling hash()
+    calls = []
+    original_hash = hs.hash
+    hs.hash = lambda string: calls.append(string) or original_hash(string)
+    hs.rehash()
+    if calls:
+        print("Error: rehash should not recompute hashes")
+    if not hs.find("item7"):
+        print("Error: item7 should be found after rehash")
+
+def test_hashset_hash_functions():
+    config.verbose = 0
+    config.init_size = 11
+
+    # Reference value for 64-bit FNV-1a
+    if hash_functions.fnv1a("a") != 0xaf63dc4c8601ec8c:
+        print("Error: fnv1a should match the FNV-1a 64-bit reference value")
+
+    for name, function in hash_functions.HASH_FUNCTIONS.items():
+        if not 0 <= function("antidisestablishmentarianism") <= hash_functions.HASH_MASK:
+            print("Error: " + name + " should return a 64-bit value")
+        hs = hashset(hash_function=name)
+        for i in range(50):
+            hs.insert("item" + str(i))
+        if not hs.find("item42") or hs.find("item50"):
+            print("Error: hashset should work with the " + name + " hash function")
+
+def test_hashset_probing_strategies():
+    config.verbose = 0
+    config.init_size = 7
+
+    for name in probing.PROBING_STRATEGIES:
+        hs = hashset(probing=name)
+        for i in range(500):
+            hs.insert("item" + str(i))
+        if hs.insert("item7"):
+            print("Error: " + name + " should reject duplicates")
+        if hs.number_of_values != 500:
+            print("Error: " + name + " should have 500 values")
+        for i in range(500):
+            if not hs.find("item" + str(i)):
+                print("Error: " + name + " should find item" + str(i))
+        if hs.find("item500"):
+            print("Error: " + name + " should not find item500")
+
+def test_hashset_robin_hood_ordering():
+    config.verbose = 0
+    config.init_size = 509
+    hs = hashset(probing="robin_hood")
+
+    for i in range(300):
+        hs.insert("word" + str(i))
+    for i in range(0, 300, 3):
+        hs.remove("word" + str(i))
+    # Along a run, displacement never grows by more than one per slot
+    for index in range(hs.hash_table_size):
+        next_index = (index + 1) % hs.hash_table_size
+        if hs.hash_table[index] is None or hs.hash_table[next_index] is None:
+            continue
+        here = hs.displacement(index, hs.hash_codes[index])
+        after = hs.displacement(next_index, hs.hash_codes[next_index])
+        if after > here + 1:
+            print("Error: robin hood run should be ordered by displacement")
+
+def test_hashset_find_many():
+    config.verbose = 0
+    config.init_size = 509
+
+    if hash_functions.fnv1a_many(["", "a", "apple"]) != [hash_functions.fnv1a(w) for w in ["", "a", "apple"]]:
+        print("Error: fnv1a_many should agree with fnv1a")
+
+    for name in hash_functions.HASH_FUNCTIONS:
+        hs = hashset(hash_function=name)
+        hs.insert_many(["apple", "banana", "cherry"])
+        found = hs.find_many(["banana", "grape", "apple", ""])
+        if found != [True, False, True, False]:
+            print("Error: find_many should return one boolean per value with " + name)
+        if hs.number_of_finds != 4:
+            print("Error: find_many should count every lookup")
+
+def test_hashset_bytes_keys():
+    config.verbose = 0
+    config.init_size = 509
+    hs = hashset()
+
+    hs.insert(b"apple")
+    hs.insert("banana")
+    if hs.insert("apple"):
+        print("Error: str and bytes forms of a word should be the same value")
+    if not hs.find("apple") or not hs.find(b"banana"):
+        print("Error: values should be found as str or bytes")
+    if hs.find_many(["apple", b"banana", "cherry"]) != [True, True, False]:
+        print("Error: find_many should accept str and bytes")
+
+def test_hashset_snapshot():
+    config.verbose = 0
+    config.init_size = 7
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "words.snap")
+
+    for name in ["linear", "robin_hood"]:
+        hs = hashset.from_iterable(["word" + str(i) for i in range(200)], probing=name)
+        hs.save(snapshot_path, source=(1234, 5678))
+        loaded = hashset.load(snapshot_path)
+
+        if loaded.hash_table != hs.hash_table or loaded.hash_codes != hs.hash_codes:
+            print("Error: a loaded snapshot should keep the saved slot layout")
+        if loaded.number_of_values != 200 or loaded.probing_name != name:
+            print("Error: a loaded snapshot should keep the set's settings")
+        if loaded.source != (1234, 5678):
+            print("Error: a loaded snapshot should keep its source")
+        if not loaded.find("word150") or loaded.find("word200"):
+            print("Error: a loaded snapshot should answer finds")
+        if not loaded.insert("word200") or not loaded.find("word200"):
+            print("Error: a loaded snapshot should accept inserts")
+
+    with open(snapshot_path, 'wb') as snapshot:
+        snapshot.write(b"not a snapshot at all, just some text")
+    try:
+        hashset.load(snapshot_path)
+        print("Error: loading a file that is not a snapshot should fail")
+    except ValueError:
+        pass
+    os.remove(snapshot_path)
+
+def test_hashset_incremental_rehash():
+    config.verbose = 0
+    config.init_size = 11
+    config.migration_step = 4
+
+    for name in probing.PROBING_STRATEGIES:
+        hs = hashset(probing=name, incremental=True)
+        migrating = False
+        for i in range(300):
+            hs.insert("item" + str(i))
+            migrating = migrating or hs.old_table is not None
+            # Every value must stay visible while the old table is migrated
+            if not hs.find("item" + str(i // 2)) or not hs.find("item" + str(i)):
+                print("Error: " + name + " should find values during migration")
+            # Checking the old table for duplicates is not a find
+            probe_length = hs.total_probe_length
+            if hs.insert("item" + str(i // 3)):
+                print("Error: " + name + " should reject duplicates during migration")
+            if hs.total_probe_length != probe_length:
+                print("Error: " + name + " inserts should not add to the probe length of finds")
+        if not migrating:
+            print("Error: " + name + " should have resized incrementally")
+        if hs.number_of_values != 300:
+            print("Error: " + name + " should have 300 values")
+        hs.finish_migration()
+        if hs.old_table is not None:
+            print("Error: finish_migration should drop the old table")
+        if hs.find("item300"):
+            print("Error: " + name + " should not find item300")
+    config.migration_step = 64
+
+def test_hashset_remove():
+    config.verbose = 0
+    config.init_size = 7
+
+    for name, deletion in [("linear", "tombstone"), ("linear", "backward_shift"),
+                           ("quadratic", "tombstone"), ("double", "tombstone"),
+                           ("robin_hood", "backward_shift")]:
+        hs = hashset(probing=name, deletion=deletion)
+        hs.insert_many(["item" + str(i) for i in range(300)])
+        for i in range(0, 300, 2):
+            if not hs.discard("item" + str(i)):
+                print("Error: " + deletion + " should discard item" + str(i))
+        if hs.discard("item0"):
+            print("Error: discarding a missing value should return False")
+        if hs.number_of_values != 150:
+            print("Error: " + deletion + " should have 150 values left")
+        for i in range(300):
+            if hs.find("item" + str(i)) != (i % 2 == 1):
+                print("Error: " + name + "/" + deletion + " finds wrong value for item" + str(i))
+        if deletion == "tombstone" and hs.number_of_tombstones != 150:
+            print("Error: tombstone deletion should leave 150 tombstones")
+        if deletion == "backward_shift" and hs.number_of_tombstones != 0:
+            print("Error: backward_shift deletion should leave no tombstones")
+        # Tombstone slots can be reused
+        if not hs.insert("item0") or not hs.find("item0"):
+            print("Error: a removed value should be insertable again")
+
+        try:
+            hs.remove("missing")
+            print("Error: removing a missing value should raise KeyError")
+        except KeyError:
+            pass
+
+    try:
+        hashset(probing="double", deletion="backward_shift")
+        print("Error: backward_shift should need linear or robin_hood probing")
+    except ValueError:
+        pass
+
+def test_hashset_incremental_remove():
+    config.verbose = 0
+    config.init_size = 11
+    config.migration_step = 4
+
+    for name in ["linear", "quadratic", "robin_hood"]:
+        hs = hashset(probing=name, incremental=True)
+        removed = set()
+        for i in range(300):
+            hs.insert("item" + str(i))
+            # Remove values both already migrated and still in the old table
+            if i % 3 == 0 and hs.old_table is not None:
+                old_table = hs.old_table
+                victim = "item" + str(i // 2)
+                if hs.discard(victim) == (victim in removed):
+                    print("Error: " + name + " should discard a value once during migration")
+                removed.add(victim)
+                if hs.old_table is not old_table and len(old_table) > 100:
+                    print("Error: " + name + " discard should not finish the migration at once")
+        if hs.number_of_values != 300 - len(removed):
+            print("Error: " + name + " should count the values discarded during migration")
+        hs.finish_migration()
+        for i in range(300):
+            if hs.find("item" + str(i)) == ("item" + str(i) in removed):
+                print("Error: " + name + " finds wrong value for item" + str(i) + " after migration")
+        if sorted(hs) != sorted(key.encode() for key in ("item" + str(i) for i in range(300)) if key not in removed):
+            print("Error: " + name + " iteration should skip discarded values")
+    config.migration_step = 64
+
+def test_hashset_tombstone_purge():
+    config.verbose = 0
+    config.init_size = 101
+    hs = hashset(deletion="tombstone")
+
+    # Churn a small set so tombstones pile up and force a purge
+    for i in range(500):
+        hs.insert("item" + str(i))
+        if i >= 10:
+            hs.remove("item" + str(i - 10))
+    if hs.number_of_values != 10:
+        print("Error: churned set should hold 10 values")
+    if hs.hash_table_size != 101:
+        print("Error: purging tombstones should not grow the table")
+    if hs.number_of_rehashes == 0:
+        print("Error: tombstones should have been purged by a rehash")
+
+def test_hashset_iteration():
+    config.verbose = 0
+    config.init_size = 11
+    config.migration_step = 4
+
+    hs = hashset(incremental=True)
+    expected = set()
+    for i in range(100):
+        hs.insert("item" + str(i))
+        expected.add(("item" + str(i)).encode())
+        if i % 7 == 0:
+            hs.remove("item" + str(i // 2))
+            expected.discard(("item" + str(i // 2)).encode())
+        # Values still in the old table must be included too
+        if sorted(hs) != sorted(expected):
+            print("Error: iteration should give every stored key once")
+            break
+    config.migration_step = 64
+
 if __name__ == "__main__":
     test_hashset_insert()
     test_hashset_find()
     test_hashset_collision()
     test_hashset_rehash()
     test_hashset_empty()
+    test_hashset_insert_many()
+    test_hashset_from_iterable()
+    test_hashset_cached_hashes()
+    test_hashset_hash_functions()
+    test_hashset_probing_strategies()
+    test_hashset_robin_hood_ordering()
+    test_hashset_find_many()
+    test_hashset_bytes_keys()
+    test_hashset_snapshot()
+    test_hashset_incremental_rehash()
+    test_hashset_incremental_remove()
+    test_hashset_remove()
+    test_hashset_tombstone_purge()
+    test_hashset_iteration()
     print("All hashset tests passed!")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from lookup_cache import lookup_cache, lru_table, clock_table
+from hashset import hashset
+from bstree import bstree
+import config
+
+def test_lru_table():
+    table = lru_table(2)
+    table.put("a", True)
+    table.put("b", False)
+    table.get("a")
+    if not table.put("c", True):
+        print("Error: a third entry should evict one")
+    if table.get("b") is not None:
+        print("Error: b was least recently used and should be evicted")
+    if table.get("a") is not True or table.get("c") is not True:
+        print("Error: a and c should still be cached")
+
+def test_clock_table():
+    table = clock_table(2)
+    table.put("a", True)
+    table.put("b", False)
+    table.get("a")
+    table.get("b")
+    table.put("c", True)
+    if len(table) != 2:
+        print("Error: clock table should stay at capacity")
+    table.get("c")
+    if not table.put("d", False):
+        print("Error: a full table should evict for a new entry")
+    if table.get("c") is not True:
+        print("Error: c was referenced and should survive the sweep")
+    table.forget("c")
+    if table.get("c") is not None or table.put("e", True):
+        print("Error: a forgotten entry's slot should be reused without an eviction")
+
+def test_lookup_cache_hashset():
+    config.verbose = 0
+    config.init_size = 509
+    for policy in ["lru", "clock"]:
+        words = lookup_cache(hashset.from_iterable(["apple", "banana", "cherry"]), 2, policy)
+
+        if words.find_many(["apple", "grape", "apple", "cherry"]) != [True, False, True, True]:
+            print("Error: find_many should give the inner set's answers in order")
+        if words.number_of_misses != 3 or words.number_of_hits != 1:
+            print("Error: a repeat within a batch should be looked up once")
+        if words.number_of_evictions != 1:
+            print("Error: three distinct words in a cache of 2 should evict once")
+        if not words.find("cherry") or words.find("grape"):
+            print("Error: find should give the inner set's answers")
+        words.insert("grape")
+        if not words.find("grape") or not words.find(b"grape"):
+            print("Error: inserting should replace a cached miss")
+        words.remove("grape")
+        if words.find("grape"):
+            print("Error: removing should replace a cached hit")
+        if not words.find("apple") or not words.discard("apple") or words.find("apple"):
+            print("Error: discarding should replace a cached hit")
+
+def test_lookup_cache_bstree():
+    config.verbose = 0
+    tree = bstree()
+    tree.insert("pear")
+    words = lookup_cache(tree, 16, "clock")
+    for _ in range(5):
+        if not words.find("pear") or words.find("plum"):
+            print("Error: cached answers should match the tree")
+    if words.number_of_hits != 8 or words.number_of_misses != 2:
+        print("Error: repeated finds should hit the cache")
+    if tree.number_of_executions != 3:
+        print("Error: only the insert and the first find of each word should reach the tree")
+    for remove in [words.remove, words.discard]:
+        try:
+            remove("pear")
+            print("Error: removing from a tree should raise TypeError")
+        except TypeError:
+            pass
+    if not words.find("pear"):
+        print("Error: a failed removal should keep the cached answer")
+
+def test_lookup_cache_capacity():
+    # An explicit capacity of 0 is not replaced by the configured default
+    config.lookup_cache_capacity = 4096
+    for policy in ["lru", "clock"]:
+        for capacity in [0, -1]:
+            try:
+                lookup_cache(hashset(), capacity, policy)
+                print("Error: a cache capacity of %d should raise ValueError" % capacity)
+            except ValueError:
+                pass
+    config.lookup_cache_capacity = 0
+    try:
+        lookup_cache(hashset())
+        print("Error: a configured cache capacity of 0 should raise ValueError")
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_lru_table()
+    test_clock_table()
+    test_lookup_cache_hashset()
+    test_lookup_cache_bstree()
+    test_lookup_cache_capacity()
+    print("All lookup cache tests passed!")
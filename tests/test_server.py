@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import asyncio
+import tempfile
+import threading
+import time
+from hashset import hashset
+from speller_client import spell_client
+from speller_server import spell_server, text_words
+import config
+
+def make_server():
+    config.verbose = 0
+    config.init_size = 7
+    return spell_server(hashset.from_iterable(["the", "cat", "sat", "on", "mat"]))
+
+def test_text_words():
+    if list(text_words("The cat\n\n  sat, on!")) != [(1, 1, "the"), (1, 5, "cat"), (3, 3, "sat"), (3, 8, "on")]:
+        print("Error: text_words should give line, column and lower-cased word")
+    if list(text_words("x\u00b2y \u2167")) != [(1, 1, "x"), (1, 3, "y")]:
+        print("Error: text_words should split words at characters that are not alphabetic")
+    # Line numbers follow tokenize()'s universal newlines, not splitlines()
+    if list(text_words("one\r\ntwo\rthree\fthree\u2028four\nfive")) != \
+            [(1, 1, "one"), (2, 1, "two"), (3, 1, "three"), (3, 7, "three"), (3, 13, "four"), (4, 1, "five")]:
+        print("Error: text_words should number lines like tokenize()")
+
+def test_check_request():
+    server = make_server()
+    response = server.check_request({"words": ["The", "dog", "sat", "mta"]})
+    if response != {"misses": [{"index": 1, "word": "dog"}, {"index": 3, "word": "mta"}]}:
+        print("Error: word requests should return the misses with their index")
+    response = server.check_request({"text": "the cat\nsat on teh mat"})
+    if response != {"misses": [{"line": 2, "column": 8, "word": "teh"}]}:
+        print("Error: text requests should return the misses with line and column")
+    if "error" not in server.respond(b'{"nothing": 1}\n') or "error" not in server.respond(b'not json\n'):
+        print("Error: malformed requests should be answered with an error")
+    if server.respond(b'{"words": ["cat"]}\n') != {"misses": []}:
+        print("Error: respond should answer a word request")
+    if server.respond(b'{"stats": true}\n')["requests"] != 1:
+        print("Error: stats should count the answered check requests")
+
+def test_server_clients():
+    server = make_server()
+    socket_path = os.path.join(tempfile.mkdtemp(), "speller.sock")
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(socket_path),))
+    thread.start()
+    try:
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.05)
+        # Two clients at once share the one set
+        first = spell_client(socket_path)
+        second = spell_client(socket_path)
+        if first.check_words(["cat", "dgo"]) != [{"index": 1, "word": "dgo"}]:
+            print("Error: first client should get its miss")
+        if second.check_text("on the mta") != [{"line": 1, "column": 8, "word": "mta"}]:
+            print("Error: second client should get its miss")
+        try:
+            first.request({"words": 5})
+            print("Error: a bad request should raise ValueError in the client")
+        except ValueError:
+            pass
+        stats = second.stats()
+        if stats["requests"] != 2 or stats["clients"] != 2 or "p99_us" not in stats:
+            print("Error: stats should report requests, clients and latency percentiles")
+        first.close()
+        second.close()
+    finally:
+        server.stop()
+        thread.join()
+    if os.path.exists(socket_path):
+        print("Error: the socket should be removed when the server stops")
+
+if __name__ == "__main__":
+    test_text_words()
+    test_check_request()
+    test_server_clients()
+    print("All server tests passed!")
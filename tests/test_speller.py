@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import contextlib
+import io
+import shutil
+import tempfile
+from hashset import hashset
+import config
+import speller
+
+def test_tokenize_words():
+    source = io.StringIO("Hello, World!\n")
+    words = list(speller.tokenize(source))
+    if words != [(1, "hello"), (1, "world")]:
+        print("Error: tokenize should yield lower-case words with line numbers")
+
+def test_tokenize_line_numbers():
+    # Blank lines and lines without letters still count
+    source = io.StringIO("one two\n\n123 ...\nthree\nfour_five6six")
+    words = list(speller.tokenize(source))
+    expected = [(1, "one"), (1, "two"), (4, "three"), (5, "four"), (5, "five"), (5, "six")]
+    if words != expected:
+        print("Error: tokenize should report the line each word is on")
+
+def test_tokenize_non_alphabetic():
+    # Superscripts, fractions and Roman numerals match \w but not isalpha()
+    source = io.StringIO("x\u00b2 \u00bd \u2167 \u00e9\u00df\u00e9\u00b2y caf\u00e9\n")
+    expected = [(1, "x"), (1, "\u00e9\u00df\u00e9"), (1, "y"), (1, "caf\u00e9")]
+    if list(speller.tokenize(source)) != expected:
+        print("Error: tokenize should split words at characters that are not alphabetic")
+
+def test_tokenize_word_size():
+    longest = "a" * (speller.WORD_SIZE - 1)
+    if list(speller.tokenize(io.StringIO(longest))) != [(1, longest)]:
+        print("Error: words shorter than WORD_SIZE should be accepted")
+
+def test_read_chunks_word_too_long():
+    # The words before an over-long word are still checked before the exit
+    source = io.StringIO("xyzzy foo\n" + "a" * speller.WORD_SIZE + "\n")
+    chunks = []
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            for chunk in speller.read_chunks(speller.tokenize(source)):
+                chunks.append(chunk)
+        print("Error: a word of WORD_SIZE characters should stop the check")
+    except SystemExit as error:
+        if error.code != 4:
+            print("Error: a word that is too long should exit with status 4")
+    if chunks != [[(1, "xyzzy"), (1, "foo")]]:
+        print("Error: read_chunks should give out the words read before a word that is too long")
+
+def write_dictionary(contents):
+    dict_file = tempfile.NamedTemporaryFile(mode='wb', suffix='.dict', delete=False)
+    dict_file.write(contents)
+    dict_file.close()
+    return dict_file.name
+
+def test_read_dictionary_words():
+    dict_file_name = write_dictionary(b"Apple\nbanana cherry\n\nit's\n")
+    try:
+        words = list(speller.read_dictionary_words(dict_file_name, True))
+        if words != [b"apple", b"banana", b"cherry", b"it", b"s"]:
+            print("Error: read_dictionary_words should yield lower-case bytes")
+        words = list(speller.read_dictionary_words(dict_file_name, False))
+        if words != ["apple", "banana", "cherry", "it", "s"]:
+            print("Error: read_dictionary_words should yield str without bytes keys")
+    finally:
+        os.remove(dict_file_name)
+
+def test_read_dictionary_words_non_ascii():
+    # Non-ASCII dictionaries fall back to tokenize() so letters stay words
+    dict_file_name = write_dictionary("café\nnaïve\n".encode())
+    try:
+        words = list(speller.read_dictionary_words(dict_file_name, True))
+        if words != ["café", "naïve"]:
+            print("Error: non-ASCII dictionaries should be read as text")
+    finally:
+        os.remove(dict_file_name)
+
+def test_read_dictionary_words_empty():
+    dict_file_name = write_dictionary(b"")
+    try:
+        if list(speller.read_dictionary_words(dict_file_name, True)) != []:
+            print("Error: an empty dictionary has no words")
+    finally:
+        os.remove(dict_file_name)
+
+def test_is_sorted():
+    if not speller.is_sorted(["apple", "banana", "banana", "cherry"]):
+        print("Error: ascending words should count as sorted")
+    if speller.is_sorted(["banana", "apple"]):
+        print("Error: descending words should not count as sorted")
+    if not speller.is_sorted([]):
+        print("Error: no words should count as sorted")
+
+def test_line_aligned_ranges():
+    text = b"".join(b"line %d has some words\n" % i for i in range(100))
+    file_name = write_dictionary(text)
+    try:
+        ranges = speller.line_aligned_ranges(file_name, 7)
+        if len(ranges) != 7 or ranges[0][0] != 0 or ranges[-1][1] != len(text):
+            print("Error: ranges should cover the whole file")
+        for (start, end), (next_start, next_end) in zip(ranges, ranges[1:]):
+            if end != next_start or text[start - 1:start] not in (b"", b"\n"):
+                print("Error: ranges should be contiguous and start at line starts")
+        if speller.line_aligned_ranges(file_name, 1000)[-1][1] != len(text):
+            print("Error: asking for more ranges than lines should still cover the file")
+    finally:
+        os.remove(file_name)
+
+def test_check_parallel():
+    config.verbose = 0
+    words = hashset.from_iterable(["the", "cat", "sat", "on", "mat"])
+    text = "".join("The cat sat on the mat\nthe dog sat line %s\n" % ("x" * (i % 3 + 1)) for i in range(300))
+    speller.file_name = write_dictionary(text.encode())
+    try:
+        serial = io.StringIO()
+        with contextlib.redirect_stdout(serial):
+            with open(speller.file_name) as text_file:
+                for chunk in speller.read_chunks(speller.tokenize(text_file)):
+                    speller.check_chunk(words, chunk)
+        finds = words.number_of_finds
+        parallel = io.StringIO()
+        with contextlib.redirect_stdout(parallel):
+            speller.check_parallel(words, None, 3)
+        if parallel.getvalue() != serial.getvalue():
+            print("Error: parallel checking should print the same misses in the same order")
+        if words.number_of_finds != 2 * finds:
+            print("Error: parallel checking should merge the workers' find counts")
+    finally:
+        os.remove(speller.file_name)
+
+def test_batch_files():
+    directory = tempfile.mkdtemp()
+    try:
+        os.mkdir(os.path.join(directory, "sub"))
+        names = [os.path.join(directory, "b.txt"), os.path.join(directory, "a.txt"),
+                 os.path.join(directory, "sub", "c.txt")]
+        for number, name in enumerate(names):
+            with open(name, "w") as text_file:
+                text_file.write("file %d\n" % number)
+        expected = sorted(names[:2]) + names[2:]
+
+        if speller.expand_text_files([directory]) != expected:
+            print("Error: a directory should give every file below it in sorted order")
+        if speller.expand_text_files([os.path.join(directory, "*.txt")]) != sorted(names[:2]):
+            print("Error: a glob pattern should give the matching files in sorted order")
+        if speller.expand_text_files(["missing.txt"]) != ["missing.txt"]:
+            print("Error: plain names should be kept as they are")
+        os.mkdir(os.path.join(directory, "empty"))
+        for name in [os.path.join(directory, "*.missing"), os.path.join(directory, "empty")]:
+            try:
+                with contextlib.redirect_stderr(io.StringIO()):
+                    speller.expand_text_files([os.path.join(directory, "a.txt"), name])
+                print("Error: %s gives no files and should be rejected" % name)
+            except SystemExit as error:
+                if error.code != 1:
+                    print("Error: a name that gives no files should exit with status 1")
+
+        for threads in [0, 2]:
+            read = [(name, source.read()) for name, source in speller.text_sources(expected, threads)]
+            if read != [(name, "file %d\n" % names.index(name)) for name in expected]:
+                print("Error: text_sources should give every file in order with %d threads" % threads)
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    test_tokenize_words()
+    test_tokenize_line_numbers()
+    test_tokenize_non_alphabetic()
+    test_tokenize_word_size()
+    test_read_chunks_word_too_long()
+    test_read_dictionary_words()
+    test_read_dictionary_words_non_ascii()
+    test_read_dictionary_words_empty()
+    test_is_sorted()
+    test_line_aligned_ranges()
+    test_check_parallel()
+    test_batch_files()
+    print("All speller tests passed!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hashset import hashset
+from bstree import bstree
+from avltree import avltree
+import stats_collectors
+import config
+
+def test_null_collector():
+    config.verbose = 0
+    config.init_size = 11
+    hs = hashset(stats=stats_collectors.new_collector("null"))
+    for i in range(100):
+        hs.insert("item" + str(i))
+    if hs.find_many(["item5", "item500"]) != [True, False]:
+        print("Error: a set without statistics should still work")
+    if hs.number_of_collisions != 0 or hs.number_of_finds != 0 or hs.merged_counters() != {}:
+        print("Error: the null collector should count nothing")
+    if hs.number_of_rehashes == 0:
+        print("Error: rehashes are part of the set, not the collector")
+
+def test_detailed_hashset():
+    config.verbose = 0
+    config.init_size = 11
+    hs = hashset(stats=stats_collectors.new_collector("detailed"))
+    for i in range(100):
+        hs.insert("item" + str(i))
+    hs.find_many(["item" + str(i) for i in range(200)])
+
+    histogram = hs.stats.probe_lengths
+    if sum(histogram.values()) != 200:
+        print("Error: every find should land in the probe length histogram")
+    if sum(length * count for length, count in histogram.items()) != hs.total_probe_length:
+        print("Error: the histogram should add up to the total probe length")
+    if len(hs.stats.rehashes) != hs.number_of_rehashes:
+        print("Error: every rehash should be timed")
+    for old_size, new_size, number_of_values, seconds in hs.stats.rehashes:
+        if new_size <= old_size or number_of_values / old_size < 0.6 or seconds < 0:
+            print("Error: rehash records should show growth at the load factor")
+    if not 1 <= hs.longest_cluster() <= hs.number_of_values:
+        print("Error: longest cluster should be between 1 and the number of values")
+
+def test_longest_cluster():
+    config.verbose = 0
+    config.init_size = 7
+    hs = hashset()
+    hs.hash_table = [b"a", None, b"b", b"c", None, b"d", b"e"]
+    if hs.longest_cluster() != 3:
+        print("Error: the cluster wrapping round the end of the table should count")
+
+def test_merge_counters():
+    config.verbose = 0
+    tree = avltree(stats_collectors.new_collector("detailed"))
+    for word in ["m", "f", "t", "a"]:
+        tree.insert(word)
+    before = tree.merged_counters()
+    tree.find("a")
+    tree.find("z")
+    changes = {name: value - before.get(name, 0) for name, value in tree.merged_counters().items()}
+
+    merged = bstree(stats_collectors.new_collector("detailed"))
+    merged.add_counters(changes)
+    if merged.number_of_executions != 2 or merged.number_of_comparisons != 5:
+        print("Error: merged counters should hold the two finds")
+    if merged.stats.depths != {3: 1, 2: 1}:
+        print("Error: histogram buckets should merge too, not " + str(merged.stats.depths))
+
+def test_collector_name():
+    config.stats_collector = None
+    config.verbose = 2
+    if stats_collectors.collector_name() != "detailed":
+        print("Error: -vv should pick the detailed collector")
+    config.verbose = 0
+    if stats_collectors.collector_name() != "basic":
+        print("Error: the default should be the basic collector")
+    config.stats_collector = "null"
+    if type(bstree().stats) is not stats_collectors.null_stats:
+        print("Error: config.stats_collector should override the verbosity")
+    config.stats_collector = None
+
+if __name__ == "__main__":
+    test_null_collector()
+    test_detailed_hashset()
+    test_longest_cluster()
+    test_merge_counters()
+    test_collector_name()
+    print("All stats collector tests passed!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hashset import hashset
+from suggest import suggester, deletes, edit_distance
+import config
+
+def test_edit_distance():
+    if edit_distance("spell", "spell", 2) != 0:
+        print("Error: equal words should have distance 0")
+    if edit_distance("spell", "spel", 2) != 1 or edit_distance("spel", "spell", 2) != 1:
+        print("Error: one insertion or deletion should have distance 1")
+    if edit_distance("spell", "smell", 2) != 1:
+        print("Error: one substitution should have distance 1")
+    if edit_distance("recieve", "receive", 2) != 1:
+        print("Error: an adjacent transposition should have distance 1")
+    if edit_distance("kitten", "sitting", 2) != 3:
+        print("Error: kitten and sitting are more than 2 edits apart")
+    if edit_distance("a", "abcd", 2) != 3:
+        print("Error: words far apart in length should give max_distance + 1")
+
+def test_deletes():
+    if deletes("abc", 1) != {"abc", "ab", "ac", "bc"}:
+        print("Error: deletes at distance 1 should drop one character at a time")
+    if "a" not in deletes("abc", 2) or "" in deletes("abc", 2):
+        print("Error: deletes at distance 2 should drop up to two characters")
+
+def test_suggester():
+    config.verbose = 0
+    words = ["spell", "spelling", "smell", "shell", "spill", "speller", "apple", "receive", "character"]
+    index = suggester(words, max_distance=2)
+
+    suggestions = index.suggest("spel")
+    if suggestions[0] != "spell":
+        print("Error: spell should be the closest suggestion for spel")
+    if "apple" in suggestions:
+        print("Error: apple is too far from spel")
+    if index.suggest("recieve") != ["receive"]:
+        print("Error: receive should be suggested for recieve")
+    # Misspellings beyond the indexed prefix are still found
+    if index.suggest("charactre") != ["character"]:
+        print("Error: character should be suggested for charactre")
+    if index.suggest("zzzzzz") != []:
+        print("Error: nothing should be suggested for zzzzzz")
+    if len(index.suggest("spel", count=2)) != 2:
+        print("Error: count should limit the suggestions")
+    if index.number_of_cache_hits != 1:
+        print("Error: the repeated query should be answered from the cache")
+
+def test_suggester_from_set():
+    config.verbose = 0
+    config.init_size = 7
+    # Hash sets hold bytes; suggestions come back as str
+    hs = hashset.from_iterable(["spell", "smell", "apple"])
+    index = suggester(hs, max_distance=1)
+    if index.suggest("spel") != ["spell"]:
+        print("Error: spell should be suggested from a hashset")
+
+if __name__ == "__main__":
+    test_edit_distance()
+    test_deletes()
+    test_suggester()
+    test_suggester_from_set()
+    print("All suggest tests passed!")